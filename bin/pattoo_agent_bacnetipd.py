@@ -7,7 +7,6 @@ Posts system data to remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
 import sys
 import os
 
@@ -29,6 +28,7 @@ else:
 from pattoo_shared import log
 from pattoo_shared.phttp import PostAgent
 from pattoo_shared.agent import Agent, AgentCLI
+from pattoo_agents.scheduler import Scheduler
 from pattoo_agents.bacnet.ip.constants import PATTOO_AGENT_BACNETIPD
 from pattoo_agents.bacnet.ip.configuration import ConfigBACnetIP as Config
 from pattoo_agents.bacnet.ip import collector
@@ -94,10 +94,9 @@ other daemons that could be using BACnet'''.format(agent_ip_address))
             log.log2die(51010, log_message)
 
         # Post data to the remote server
+        scheduler = Scheduler(
+            interval, policy=config.overrun_policy(), name=self.name())
         while True:
-            # Get start time
-            ts_start = time()
-
             # Get system data
             agentdata = collector.poll(bacnet)
 
@@ -111,9 +110,8 @@ other daemons that could be using BACnet'''.format(agent_ip_address))
             if success is True:
                 server.purge()
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(interval - duration))
+            # Sleep until the next cycle
+            scheduler.wait()
 
 
 def main():
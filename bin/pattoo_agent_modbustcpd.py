@@ -7,7 +7,7 @@ Posts system data to remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
+import signal
 import sys
 import os
 
@@ -26,8 +26,9 @@ else:
 from pattoo_shared import log
 from pattoo_shared.phttp import PostAgent
 from pattoo_shared.agent import Agent, AgentCLI
+from pattoo_agents.scheduler import Scheduler
 from pattoo_agents.modbus.tcp.constants import PATTOO_AGENT_MODBUSTCPD
-from pattoo_agents.modbus.tcp import collector
+from pattoo_agents.modbus.tcp import collector, connections, engine
 from pattoo_agents.modbus.tcp.configuration import ConfigModbusTCP as Config
 
 
@@ -78,27 +79,47 @@ class PollingAgent(Agent):
         config = Config()
         _pi = config.polling_interval()
 
+        # Close connections to the targets cleanly when stopped
+        signal.signal(signal.SIGTERM, _shutdown)
+
         # Post data to the remote server
-        while True:
-            # Get start time
-            ts_start = time()
+        scheduler = Scheduler(
+            _pi, policy=config.overrun_policy(), name=self.name())
+        try:
+            while True:
+                # Get system data
+                agentdata = collector.poll()
+
+                # Post to remote server
+                server = PostAgent(agentdata)
+
+                # Post data
+                success = server.post()
 
-            # Get system data
-            agentdata = collector.poll()
+                # Purge cache if success is True
+                if success is True:
+                    server.purge()
 
-            # Post to remote server
-            server = PostAgent(agentdata)
+                # Sleep until the next cycle
+                scheduler.wait()
+        finally:
+            connections.close()
+            engine.close()
 
-            # Post data
-            success = server.post()
 
-            # Purge cache if success is True
-            if success is True:
-                server.purge()
+def _shutdown(signum, frame):
+    """Exit so that connections are closed when the daemon is stopped.
+
+    Args:
+        signum: Signal number
+        frame: Current stack frame
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(_pi - duration))
+    Returns:
+        None
+
+    """
+    # Exit
+    sys.exit(0)
 
 
 def main():
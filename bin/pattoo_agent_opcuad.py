@@ -7,7 +7,6 @@ Posts system data to remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
 import sys
 import os
 
@@ -26,6 +25,7 @@ else:
 from pattoo_shared import log
 from pattoo_shared.phttp import PostAgent
 from pattoo_shared.agent import Agent, AgentCLI
+from pattoo_agents.scheduler import Scheduler
 from pattoo_agents.opcua.constants import PATTOO_AGENT_OPCUAD
 from pattoo_agents.opcua import collector
 from pattoo_agents.opcua.configuration import ConfigOPCUA as Config
@@ -79,10 +79,9 @@ class PollingAgent(Agent):
         _pi = config.polling_interval()
 
         # Post data to the remote server
+        scheduler = Scheduler(
+            _pi, policy=config.overrun_policy(), name=self.name())
         while True:
-            # Get start time
-            ts_start = time()
-
             # Get system data
             agentdata = collector.poll()
 
@@ -96,9 +95,8 @@ class PollingAgent(Agent):
             if success is True:
                 server.purge()
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(_pi - duration))
+            # Sleep until the next cycle
+            scheduler.wait()
 
 
 def main():
@@ -7,7 +7,6 @@ Posts system data to remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
 import sys
 import os
 
@@ -26,6 +25,7 @@ else:
 from pattoo_shared import log
 from pattoo_shared.agent import Agent, AgentCLI
 from pattoo_shared.phttp import PostAgent
+from pattoo_agents.scheduler import Scheduler
 from pattoo_agents.os.constants import PATTOO_AGENT_OS_AUTONOMOUSD
 from pattoo_agents.os import collector
 from pattoo_agents.os.configuration import ConfigAutonomousd as Config
@@ -63,13 +63,24 @@ class PollingAgent(Agent):
         config = Config()
         _pi = config.polling_interval()
 
+        # Sample data between polls
+        sampler = collector.sampling(
+            config.sampling_interval(), config.sampling_size(),
+            procfs=config.procfs())
+
+        # Track the processes and cgroups using the most resources
+        tracker = collector.tracking(
+            config.top_processes(), cgroups=config.cgroups(),
+            limit=config.max_series())
+
         # Post data to the remote server
+        scheduler = Scheduler(
+            _pi, policy=config.overrun_policy(), name=self.name())
         while True:
-            # Get start time
-            ts_start = time()
-
             # Get system data
-            agentdata = collector.poll(self._parent, _pi)
+            agentdata = collector.poll(
+                self._parent, _pi, procfs=config.procfs(), sampler=sampler,
+                rates=config.rates(), tracker=tracker)
 
             # Post to remote server
             server = PostAgent(agentdata)
@@ -81,9 +92,8 @@ class PollingAgent(Agent):
             if success is True:
                 server.purge()
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(_pi - duration))
+            # Sleep until the next cycle
+            scheduler.wait()
 
 
 def main():
@@ -7,10 +7,8 @@ Retrieve's system data from remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
 import sys
 import os
-import multiprocessing
 
 # Try to create a working PYTHONPATH
 _BIN_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
@@ -25,13 +23,15 @@ else:
 
 # Pattoo libraries
 from pattoo_shared import log
-from pattoo_shared.configuration import Config
 from pattoo_shared.agent import Agent, AgentCLI
-from pattoo_shared import files
-from pattoo_shared.phttp import PassiveAgent
-from pattoo_agents.os.constants import (
-    PATTOO_AGENT_OS_HUBD, PATTOO_AGENT_OS_SPOKED_API_PREFIX)
+from pattoo_agents.scheduler import Scheduler
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_HUBD
 from pattoo_agents.os import configuration
+from pattoo_agents.os.batcher import Batcher
+from pattoo_agents.os.fanout import FanOut
+from pattoo_agents.os.health import Health
+from pattoo_agents.os.ingest import Ingest
+from pattoo_agents.configuration import get_config
 
 
 class PollingAgent(Agent):
@@ -61,103 +61,79 @@ class PollingAgent(Agent):
 
         """
         # Initialize key variables
-        config = configuration.ConfigHubd()
+        config = get_config(configuration.ConfigHubd)
         interval = config.polling_interval()
 
+        # Post spoke data in batches
+        batcher = None
+        if bool(config.batch_size()) is True:
+            batcher = Batcher(
+                config.agent_id(),
+                size=config.batch_size(), wait=config.batch_wait())
+
+        # Poll spokes concurrently, adapting to the health of each spoke
+        health = Health(config.timeout(), max_backoff=config.max_backoff())
+        fanout = FanOut(
+            PATTOO_AGENT_OS_HUBD, concurrency=config.concurrency(),
+            timeout=config.timeout(), batcher=batcher, health=health)
+        filepath = os.path.join(
+            config.daemon_directory(),
+            '{}.health.json'.format(PATTOO_AGENT_OS_HUBD))
+
+        # Relay data pushed by spokes
+        if bool(config.ingest_ip_bind_port()) is True:
+            ingest = Ingest(
+                _receiver(fanout),
+                ip_listen_address=config.ingest_ip_listen_address(),
+                ip_bind_port=config.ingest_ip_bind_port())
+            ingest.start()
+
         # Post data to the remote server
+        scheduler = Scheduler(
+            interval, policy=config.overrun_policy(), name=self.name())
         while True:
-            # Get start time
-            ts_start = time()
-
-            _parallel_poll()
+            _parallel_poll(fanout)
+            health.save(
+                filepath, acks=None if batcher is None else batcher.acks())
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(interval - duration))
+            # Sleep until the next cycle
+            scheduler.wait()
 
 
-def _parallel_poll():
+def _parallel_poll(fanout):
     """Poll each spoke in parallel.
 
     Args:
-        None
+        fanout: FanOut object used to poll the spokes
 
     Returns:
         none: result
 
     """
-    # Initialize key variables
-    sub_processes_in_pool = max(1, multiprocessing.cpu_count())
-    config = configuration.ConfigHubd()
-    ip_targets = config.ip_targets()
-    argument_list = []
-
-    # Create tuple list of parameters
-    for ip_target in ip_targets:
-        # Test
-        if isinstance(ip_target, dict) is False:
-            continue
-        if 'ip_address' not in ip_target:
-            continue
-        if 'ip_bind_port' not in ip_target:
-            continue
+    # The agent ID and spoke URLs are only computed again when the
+    # configuration changes
+    config = get_config(configuration.ConfigHubd)
 
-        # Append argument
-        url = _spoked_url(ip_target['ip_address'], ip_target['ip_bind_port'])
-        argument_list.append((url,))
+    # Poll the spokes and relay their data
+    fanout.poll(
+        config.spoke_urls(), config.agent_id(), msgpack=config.msgpack())
 
-    # Create a pool of sub process resources
-    with multiprocessing.Pool(processes=sub_processes_in_pool) as pool:
 
-        # Create sub processes from the pool
-        pool.starmap(_relay, argument_list)
-
-    # Wait for all the processes to end
-    pool.join()
-
-
-def _relay(url):
-    """Relay data to pattoo server.
+def _receiver(fanout):
+    """Create the function relaying data pushed by spokes.
 
     Args:
-        url: Pattoo spoked agent URL
+        fanout: FanOut object used to relay the data
 
     Returns:
-        None
+        result: Function
 
     """
-    # Initialize key variables
-    config = Config()
-    agent_id = files.get_agent_id(PATTOO_AGENT_OS_HUBD, config)
+    def result(source, data):
+        config = get_config(configuration.ConfigHubd)
+        return fanout.receive(source, data, config.agent_id())
 
-    # Initialize key variables
-    passive = PassiveAgent(PATTOO_AGENT_OS_HUBD, agent_id, url)
-    passive.relay()
-
-
-def _spoked_url(ip_target, ip_bind_port):
-    """Poll a spoke.
-
-    Args:
-        ip_target: IP target to poll for data
-        ip_bind_port: TCP listening port
-
-    Returns:
-        url: URL of spoke
-
-    """
-    # Initialize key variables
-    config = configuration.ConfigHubd()
-    _pi = config.polling_interval()
-
-    hostname = ip_target
-    if ':' in ip_target:
-        hostname = '[{}]'.format(hostname)
-
-    # Return
-    url = ('http://{}:{}{}/{}'.format(
-        ip_target, ip_bind_port, PATTOO_AGENT_OS_SPOKED_API_PREFIX, _pi))
-    return url
+    return result
 
 
 def main():
@@ -10,6 +10,7 @@ Uses a Gunicorn WSGI entry point to serve data.
 
 # Standard libraries
 from __future__ import print_function
+import multiprocessing
 import sys
 import os
 
@@ -30,7 +31,52 @@ from pattoo_shared.agent import Agent, AgentAPI, AgentCLI
 from pattoo_agents.os.constants import (
     PATTOO_AGENT_OS_SPOKED, PATTOO_AGENT_OS_SPOKED_PROXY)
 from pattoo_agents.os import configuration
-from pattoo_agents.os.api import API
+from pattoo_agents.os.api import API, snapshot
+from pattoo_agents.os.push import Pusher
+
+
+class SpokeAPI(AgentAPI):
+    """AgentAPI that can also push data to a hub."""
+
+    def query(self):
+        """Serve the API, pushing data to a hub if configured.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Push data from a dedicated process so that it is only pushed once,
+        # whatever the number of workers. Collecting data in a thread of the
+        # Gunicorn master could leave locks held in the workers it forks.
+        # The API remains available for hubs to fall back to polling.
+        config = self.config
+        if bool(config.push_url()) is True:
+            process = multiprocessing.Process(
+                target=_push,
+                args=(config.push_url(), config.push_interval()),
+                name='pattoo-pusher', daemon=True)
+            process.start()
+
+        # Serve the API
+        AgentAPI.query(self)
+
+
+def _push(url, interval):
+    """Push data to a hub until the process is terminated.
+
+    Args:
+        url: URL of the ingest endpoint of the hub
+        interval: Seconds between pushes
+
+    Returns:
+        None
+
+    """
+    # Push
+    Pusher(url, interval, snapshot).run()
 
 
 def main():
@@ -40,7 +86,7 @@ def main():
 
     # Create Flask object to daemonize
     config = configuration.ConfigSpoked()
-    agent_gunicorn = AgentAPI(
+    agent_gunicorn = SpokeAPI(
         PATTOO_AGENT_OS_SPOKED,
         PATTOO_AGENT_OS_SPOKED_PROXY,
         API,
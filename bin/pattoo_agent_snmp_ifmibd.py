@@ -7,7 +7,6 @@ Posts system data to remote host over HTTP.
 
 # Standard libraries
 from __future__ import print_function
-from time import sleep, time
 import sys
 import os
 
@@ -26,6 +25,7 @@ else:
 from pattoo_shared import log
 from pattoo_shared.phttp import PostAgent
 from pattoo_shared.agent import Agent, AgentCLI
+from pattoo_agents.scheduler import Scheduler
 from pattoo_agents.snmp.constants import PATTOO_AGENT_SNMP_IFMIBD
 from pattoo_agents.snmp.ifmib import collector
 from pattoo_agents.snmp.configuration import ConfigSNMPIfMIB as Config
@@ -79,10 +79,9 @@ class PollingAgent(Agent):
         interval = config.polling_interval()
 
         # Post data to the remote server
+        scheduler = Scheduler(
+            interval, policy=config.overrun_policy(), name=self.name())
         while True:
-            # Get start time
-            ts_start = time()
-
             # Get system data
             agentdata = collector.poll()
 
@@ -96,9 +95,8 @@ class PollingAgent(Agent):
             if success is True:
                 server.purge()
 
-            # Sleep
-            duration = time() - ts_start
-            sleep(abs(interval - duration))
+            # Sleep until the next cycle
+            scheduler.wait()
 
 
 def main():
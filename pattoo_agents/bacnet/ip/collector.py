@@ -10,6 +10,7 @@ from BAC0.core.io.IOExceptions import (
 
 # Pattoo libraries
 from pattoo_agents.bacnet.ip import configuration
+from pattoo_agents.configuration import get_config
 from pattoo_shared import network
 from pattoo_shared import data
 from pattoo_shared import log
@@ -32,7 +33,7 @@ def poll(bacnet):
 
     """
     # Initialize key variables.
-    config = configuration.ConfigBACnetIP()
+    config = get_config(configuration.ConfigBACnetIP)
     _pi = config.polling_interval()
 
     # Initialize AgentPolledData
@@ -64,7 +65,7 @@ class _PollBACnetIP():
         # Initialize key variables.
         self._bacnet = bacnet
 
-        config = configuration.ConfigBACnetIP()
+        config = get_config(configuration.ConfigBACnetIP)
 
         # Get points to be polled (Along with authorizations and ip_targets)
         self._target_poll_targets = config.target_polling_points()
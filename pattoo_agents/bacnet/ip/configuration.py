@@ -2,13 +2,13 @@
 """Classe to manage SNMP agent configurations."""
 
 # Import project libraries
-from pattoo_shared import configuration, files
-from pattoo_shared.configuration import Config
+from pattoo_shared import configuration
+from pattoo_agents.configuration import AgentConfig
 from pattoo_shared.variables import IPTargetPollingPoints
 from .constants import PATTOO_AGENT_BACNETIPD
 
 
-class ConfigBACnetIP(Config):
+class ConfigBACnetIP(AgentConfig):
     """Class gathers all configuration information."""
 
     def __init__(self):
@@ -22,12 +22,7 @@ class ConfigBACnetIP(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration directory
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_BACNETIPD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_BACNETIPD)
 
     def agent_ip_address(self):
         """Get list polling target information in configuration file..
@@ -50,6 +45,21 @@ class ConfigBACnetIP(Config):
         return result
 
     def target_polling_points(self):
+        """Get cached list polling target information in configuration file.
+
+        Args:
+            None
+
+        Returns:
+            result: List of IPTargetPollingPoints objects
+
+        """
+        # Get result
+        result = self._cached(
+            'target_polling_points', self._target_polling_points)
+        return result
+
+    def _target_polling_points(self):
         """Get list polling target information in configuration file.
 
         Args:
@@ -0,0 +1,208 @@
+"""Module for compact, columnar storage of polled datapoints."""
+
+# Standard imports
+from array import array
+from time import time
+
+# Pattoo libraries
+from pattoo_shared.constants import (
+    DATA_INT, DATA_FLOAT, DATA_COUNT64, DATA_COUNT, DATA_STRING, DATA_NONE)
+from pattoo_shared.variables import DataPoint, TargetDataPoints
+from pattoo_agents.metadata import intern
+
+# Data types stored by index in DataPointBatch.data_types
+_DATA_TYPES = (
+    DATA_INT, DATA_FLOAT, DATA_COUNT64, DATA_COUNT, DATA_STRING, DATA_NONE)
+_DATA_TYPE_INDEX = {
+    data_type: index for index, data_type in enumerate(_DATA_TYPES)}
+
+
+class DataPointBatch():
+    """Columnar store of the datapoints polled from a single target.
+
+    Collectors append values to parallel arrays instead of creating a
+    DataPoint and several DataPointMetadata objects per value. Identical
+    metadata is stored once. The batch is converted to a TargetDataPoints
+    object only when the data is about to be posted. Batches are cheap to
+    pickle, which makes them suitable for returning from pool workers.
+
+    """
+
+    __slots__ = (
+        'target', 'timestamp', 'keys', 'values', 'data_types',
+        'metadata_ids', '_metadata', '_metadata_lookup')
+
+    def __init__(self, target, timestamp=None):
+        """Initialize the class.
+
+        Args:
+            target: Target polled to get the data
+            timestamp: Integer EPOCH timestamp in milliseconds for all data
+                in the batch. The current time is used if None.
+
+        Returns:
+            None
+
+        Variables:
+            self.keys: List of datapoint keys
+            self.values: List of datapoint values
+            self.data_types: Array of indexes of datapoint data types
+            self.metadata_ids: Array of indexes of datapoint metadata sets
+
+        """
+        # Initialize key variables
+        self.target = target
+        if timestamp is None:
+            self.timestamp = int(round(time(), 3) * 1000)
+        else:
+            self.timestamp = int(timestamp)
+        self.keys = []
+        self.values = []
+        self.data_types = array('B')
+        self.metadata_ids = array('I')
+        self._metadata = []
+        self._metadata_lookup = {}
+
+    def __repr__(self):
+        """Return a representation of the attributes of the class.
+
+        Args:
+            None
+
+        Returns:
+            result: String representation.
+
+        """
+        # Return
+        result = ('''\
+<{} target={}, datapoints={}, metadata_sets={}>\
+'''.format(self.__class__.__name__, repr(self.target), len(self.keys),
+           len(self._metadata)))
+        return result
+
+    def __len__(self):
+        """Get the number of datapoints in the batch."""
+        return len(self.keys)
+
+    def __getstate__(self):
+        """Get the state of the object for pickling."""
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        """Set the state of the object when unpickling."""
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def append(self, key, value, data_type=DATA_INT, metadata=()):
+        """Append a datapoint to the batch.
+
+        Args:
+            key: Key related to data value
+            value: Data value
+            data_type: This MUST be one of the types listed in constants.py
+            metadata: Tuple of (key, value) or (key, value, update_checksum)
+                metadata tuples
+
+        Returns:
+            None
+
+        """
+        # Ignore unsupported data types
+        index = _DATA_TYPE_INDEX.get(data_type)
+        if index is None:
+            return
+
+        # Append
+        self.keys.append(key)
+        self.values.append(value)
+        self.data_types.append(index)
+        self.metadata_ids.append(self._metadata_id(metadata))
+
+    def datapoints(self):
+        """Convert the batch to a list of DataPoint objects.
+
+        Args:
+            None
+
+        Returns:
+            result: List of DataPoint objects
+
+        """
+        # Get the shared MetadataSet of each unique metadata tuple
+        result = []
+        metadata = [intern(items) for items in self._metadata]
+
+        # Create the DataPoint objects
+        for key, value, index, metadata_id in zip(
+                self.keys, self.values, self.data_types, self.metadata_ids):
+            datapoint = DataPoint(
+                key, value, data_type=_DATA_TYPES[index],
+                timestamp=self.timestamp)
+            metadata[metadata_id].add_to(datapoint)
+            result.append(datapoint)
+        return result
+
+    def target_datapoints(self):
+        """Convert the batch to a TargetDataPoints object.
+
+        Args:
+            None
+
+        Returns:
+            result: TargetDataPoints object
+
+        """
+        # Return
+        result = TargetDataPoints(self.target)
+        result.add(self.datapoints())
+        return result
+
+    def _metadata_id(self, metadata):
+        """Get the index of an interned metadata tuple.
+
+        Args:
+            metadata: Tuple of metadata tuples
+
+        Returns:
+            result: Index of the metadata in self._metadata
+
+        """
+        # Return the existing entry
+        metadata = tuple(metadata)
+        result = self._metadata_lookup.get(metadata)
+        if result is not None:
+            return result
+
+        # Create a new one
+        items = []
+        for item in metadata:
+            if len(item) == 2:
+                items.append((item[0], item[1], True))
+            else:
+                items.append((item[0], item[1], bool(item[2])))
+        result = len(self._metadata)
+        self._metadata.append(tuple(items))
+        self._metadata_lookup[metadata] = result
+        return result
+
+
+def target_datapoints(items):
+    """Convert DataPointBatch objects to TargetDataPoints objects.
+
+    Args:
+        items: List of DataPointBatch or TargetDataPoints objects
+
+    Returns:
+        result: List of TargetDataPoints objects
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Convert
+    for item in items:
+        if isinstance(item, DataPointBatch) is True:
+            result.append(item.target_datapoints())
+        elif isinstance(item, TargetDataPoints) is True:
+            result.append(item)
+    return result
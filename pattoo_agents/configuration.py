@@ -0,0 +1,191 @@
+"""Module used to cache agent configurations between polling cycles."""
+
+# Standard imports
+import os
+import threading
+
+# Import project libraries
+from pattoo_shared import configuration, files, log
+from pattoo_shared.configuration import Config
+from pattoo_agents.scheduler import OVERRUN_POLICIES, OVERRUN_SKIP
+
+# Caches shared by all threads in the process
+_LOCK = threading.RLock()
+_YAML = {}
+_INSTANCES = {}
+
+
+class AgentConfig(Config):
+    """Agent configuration whose YAML file is parsed only when it changes."""
+
+    def __init__(self, agent_program):
+        """Initialize the class.
+
+        Args:
+            agent_program: Name of the agent program. Its configuration file
+                is read from the configuration directory.
+
+        Returns:
+            None
+
+        """
+        # Instantiate inheritance
+        Config.__init__(self)
+
+        # Get the configuration
+        self._agent_program = agent_program
+        self._agent_config_file = configuration.agent_config_filename(
+            agent_program)
+        self._agent_config = read_yaml_file(self._agent_config_file)
+        self._objects = {}
+
+    def filenames(self):
+        """Get the configuration files the object was created from.
+
+        Args:
+            None
+
+        Returns:
+            result: List of filenames
+
+        """
+        # Return
+        result = [
+            self._agent_config_file,
+            '{}{}pattoo.yaml'.format(
+                os.path.expanduser(log.check_environment()), os.sep)]
+        return result
+
+    def overrun_policy(self):
+        """Get overrun_policy.
+
+        Args:
+            None
+
+        Returns:
+            result: Scheduler overrun policy applied when a polling cycle
+                takes longer than the polling interval
+
+        """
+        # Get result
+        key = self._agent_program
+        sub_key = 'overrun_policy'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to OVERRUN_SKIP
+        result = str(intermediate).strip().lower()
+        if result not in OVERRUN_POLICIES:
+            result = OVERRUN_SKIP
+        return result
+
+    def _cached(self, name, builder):
+        """Build an object from the configuration only once.
+
+        Args:
+            name: Name of the object
+            builder: Function that creates the object
+
+        Returns:
+            result: Object created by builder
+
+        """
+        # Build only once per configuration object
+        with _LOCK:
+            if name not in self._objects:
+                self._objects[name] = builder()
+            result = self._objects[name]
+        return result
+
+
+def get_config(config_class):
+    """Get a cached configuration object.
+
+    The object is recreated only if any of the files it was created from has
+    changed since it was last created.
+
+    Args:
+        config_class: AgentConfig class
+
+    Returns:
+        result: config_class object
+
+    """
+    # Return the cached object if the files haven't changed
+    with _LOCK:
+        cached = _INSTANCES.get(config_class)
+        if cached is not None:
+            (signatures, result) = cached
+            if signatures == _signatures(result.filenames()):
+                return result
+
+        # Create a new object
+        result = config_class()
+        _INSTANCES[config_class] = (_signatures(result.filenames()), result)
+    return result
+
+
+def read_yaml_file(filepath, die=True):
+    """Read a YAML file only if it has changed since it was last read.
+
+    Args:
+        filepath: Path to file to be read
+        die: Die if there is an error
+
+    Returns:
+        result: Dict of yaml read. This is shared between callers and must
+            not be modified.
+
+    """
+    # Return cached data if the file hasn't changed
+    _signature = signature(filepath)
+    with _LOCK:
+        cached = _YAML.get(filepath)
+        if cached is not None and _signature is not None:
+            if cached[0] == _signature:
+                return cached[1]
+
+    # Read the file
+    result = files.read_yaml_file(filepath, die=die)
+    if _signature is not None:
+        with _LOCK:
+            _YAML[filepath] = (_signature, result)
+    return result
+
+
+def signature(filepath):
+    """Get a value that changes whenever a file is replaced or modified.
+
+    Args:
+        filepath: Path to file
+
+    Returns:
+        result: Tuple of device, inode, modification time and size. None if
+            the file doesn't exist.
+
+    """
+    # Get status
+    try:
+        status = os.stat(filepath)
+    except OSError:
+        return None
+
+    # Return
+    result = (
+        status.st_dev, status.st_ino, status.st_mtime_ns, status.st_size)
+    return result
+
+
+def _signatures(filepaths):
+    """Get the signatures of a list of files.
+
+    Args:
+        filepaths: List of file paths
+
+    Returns:
+        result: List of signatures
+
+    """
+    # Return
+    result = [signature(filepath) for filepath in filepaths]
+    return result
@@ -0,0 +1,172 @@
+"""Module for interned sets of datapoint metadata."""
+
+# Standard imports
+import threading
+
+# Pattoo libraries
+from pattoo_shared import data
+from pattoo_shared.constants import DATAPOINT_KEYS
+from pattoo_shared.variables import Metadata, DataPointMetadata
+
+# Limits on the sizes of the caches
+_MAX_SETS = 65536
+_MAX_CHECKSUMS = 65536
+
+# Interned MetadataSet objects
+_LOCK = threading.Lock()
+_SETS = {}
+
+
+class MetadataSet():
+    """Immutable, validated set of metadata shared by many datapoints.
+
+    DataPoint.add() validates every metadata object and rehashes the
+    datapoint checksum once per metadata item for every value polled. A
+    MetadataSet does the validation once and remembers the checksum that
+    results from adding the set to a datapoint with a given initial
+    checksum. Datapoint keys repeat every polling cycle, so after the first
+    cycle adding metadata costs a dict lookup.
+
+    """
+
+    __slots__ = ('metadata', '_keys', '_checksums')
+
+    def __init__(self, items):
+        """Initialize the class.
+
+        Args:
+            items: List of Metadata objects or (key, value) and
+                (key, value, update_checksum) tuples
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        metadata = []
+        keys = []
+
+        # Keep only what DataPoint.add() would keep
+        for item in items:
+            if isinstance(item, (tuple, list)) is True:
+                item = DataPointMetadata(*item)
+            if isinstance(item, Metadata) is False:
+                continue
+            if item.valid is False or item.key in DATAPOINT_KEYS:
+                continue
+            if item.key in keys:
+                continue
+            metadata.append(item)
+            keys.append(item.key)
+
+        # Assign values
+        self.metadata = tuple(metadata)
+        self._keys = frozenset(keys)
+        self._checksums = {}
+
+    def __repr__(self):
+        """Return a representation of the attributes of the class.
+
+        Args:
+            None
+
+        Returns:
+            result: String representation.
+
+        """
+        # Return
+        result = '<{} metadata={}>'.format(
+            self.__class__.__name__, repr(list(self.metadata)))
+        return result
+
+    def __len__(self):
+        """Get the number of metadata items in the set."""
+        return len(self.metadata)
+
+    def add_to(self, datapoint):
+        """Add the metadata to a DataPoint.
+
+        The result is identical to calling datapoint.add() with the metadata
+        objects of the set.
+
+        Args:
+            datapoint: DataPoint object
+
+        Returns:
+            datapoint: The updated DataPoint object
+
+        """
+        # Use the slow path if the datapoint already has any of the keys
+        if self._keys.isdisjoint(datapoint.metadata) is False:
+            datapoint.add(list(self.metadata))
+            return datapoint
+
+        # Get the checksum
+        initial = datapoint.checksum
+        checksum = self._checksums.get(initial)
+        if checksum is None:
+            checksum = initial
+            for item in self.metadata:
+                if bool(item.update_checksum) is True:
+                    checksum = data.hashstring('''\
+{}{}{}'''.format(checksum, item.key, item.value))
+            if len(self._checksums) >= _MAX_CHECKSUMS:
+                self._checksums.clear()
+            self._checksums[initial] = checksum
+
+        # Update the datapoint the same way DataPoint.add() does
+        for item in self.metadata:
+            datapoint.metadata[item.key] = item.value
+            datapoint._metakeys.append(item.key)
+        datapoint.checksum = checksum
+        return datapoint
+
+
+def intern(items):
+    """Get the shared MetadataSet for a list of metadata.
+
+    Args:
+        items: List of Metadata objects or (key, value) and
+            (key, value, update_checksum) tuples
+
+    Returns:
+        result: MetadataSet
+
+    """
+    # Create a hashable key for the metadata
+    key = tuple(_normalize(item) for item in items)
+
+    # Return the existing set
+    result = _SETS.get(key)
+    if result is not None:
+        return result
+
+    # Create a new one
+    result = MetadataSet(items)
+    with _LOCK:
+        if len(_SETS) >= _MAX_SETS:
+            _SETS.clear()
+        result = _SETS.setdefault(key, result)
+    return result
+
+
+def _normalize(item):
+    """Convert metadata to a hashable tuple.
+
+    Args:
+        item: Metadata object or tuple
+
+    Returns:
+        result: Tuple of (key, value, update_checksum)
+
+    """
+    # Convert tuples the same way MetadataSet does
+    if isinstance(item, (tuple, list)) is True:
+        item = DataPointMetadata(*item)
+
+    # Process
+    if isinstance(item, Metadata) is True:
+        result = (item.key, item.value, bool(item.update_checksum))
+    else:
+        result = (None, None, None)
+    return result
@@ -0,0 +1,203 @@
+"""Module used to decode values stored in Modbus registers.
+
+Modbus registers are 16 bits wide, so larger values span several
+registers. Devices disagree on the order of the bytes in each register and
+of the registers in each value. Values are decoded with struct from a
+buffer holding all the registers of a response. Coils and discrete inputs
+are single bits, unpacked by pymodbus.
+
+"""
+
+# Standard imports
+import collections
+import struct
+
+# Pattoo libraries
+from pattoo_shared.constants import DATA_INT, DATA_FLOAT
+
+# Encoding of a value. byte_order is the order of the bytes in each register
+# and word_order the order of the registers in the value, either 'big' or
+# 'little'
+Encoding = collections.namedtuple(
+    'Encoding', 'data_type byte_order word_order')
+
+# Number of registers, struct format character and pattoo data type of
+# each data type
+DATA_TYPES = {
+    'int16': (1, 'h', DATA_INT),
+    'uint16': (1, 'H', DATA_INT),
+    'int32': (2, 'i', DATA_INT),
+    'uint32': (2, 'I', DATA_INT),
+    'float32': (2, 'f', DATA_FLOAT),
+    'int64': (4, 'q', DATA_INT),
+    'uint64': (4, 'Q', DATA_INT),
+    'float64': (4, 'd', DATA_FLOAT)}
+
+# Valid byte and word orders
+ORDERS = ('big', 'little')
+
+# Encoding of values that aren't configured otherwise. Registers are
+# unsigned 16 bit values.
+DEFAULT = Encoding(data_type='uint16', byte_order='big', word_order='big')
+
+# struct.Struct objects used to decode each Encoding
+_STRUCTS = {}
+
+
+def encoding(data_type=None, byte_order=None, word_order=None):
+    """Create an Encoding.
+
+    Args:
+        data_type: Data type. One of the keys of DATA_TYPES
+        byte_order: Order of the bytes in each register
+        word_order: Order of the registers in the value
+
+    Returns:
+        result: Encoding. None if invalid
+
+    """
+    # Initialize key variables
+    data_type = _value(data_type, DEFAULT.data_type)
+    byte_order = _value(byte_order, DEFAULT.byte_order)
+    word_order = _value(word_order, DEFAULT.word_order)
+
+    # Return
+    if data_type not in DATA_TYPES:
+        return None
+    if byte_order not in ORDERS or word_order not in ORDERS:
+        return None
+    result = Encoding(
+        data_type=data_type, byte_order=byte_order, word_order=word_order)
+    return result
+
+
+def size(_encoding):
+    """Get the number of registers a value spans.
+
+    Args:
+        _encoding: Encoding
+
+    Returns:
+        result: Number of registers
+
+    """
+    # Return
+    result = DATA_TYPES[_encoding.data_type][0]
+    return result
+
+
+def data_type(_encoding):
+    """Get the pattoo data type of a value.
+
+    Args:
+        _encoding: Encoding
+
+    Returns:
+        result: Pattoo data type
+
+    """
+    # Return
+    result = DATA_TYPES[_encoding.data_type][2]
+    return result
+
+
+def decode(registers, points):
+    """Decode values from the registers of a response.
+
+    Values that extend beyond the registers are decoded as None.
+
+    Args:
+        registers: List of register values
+        points: List of planner.Point objects to decode. Their offset is
+            the position of their first register
+
+    Returns:
+        result: List of values in the order of the points
+
+    """
+    # Initialize key variables
+    result = []
+    count = len(registers)
+    buffers = {}
+
+    # Decode
+    for point in points:
+        _encoding = point.encoding
+        _struct = _STRUCTS.get(_encoding)
+        if _struct is None:
+            _struct = _create_struct(_encoding)
+            _STRUCTS[_encoding] = _struct
+        if point.offset + size(_encoding) > count:
+            result.append(None)
+            continue
+
+        # Registers are packed once for each byte order
+        swapped = _encoding.byte_order != _encoding.word_order
+        buffer = buffers.get(swapped)
+        if buffer is None:
+            buffer = struct.pack(
+                '{}{}H'.format('<' if swapped is True else '>', count),
+                *registers)
+            buffers[swapped] = buffer
+        result.append(_struct.unpack_from(buffer, point.offset * 2)[0])
+    return result
+
+
+def decode_bits(bits, points):
+    """Get the values of coils or discrete inputs from a response.
+
+    Values beyond the bits of the response are decoded as None.
+
+    Args:
+        bits: List of booleans
+        points: List of planner.Point objects to decode
+
+    Returns:
+        result: List of 0 or 1 values in the order of the points
+
+    """
+    # Return
+    count = len(bits)
+    result = [
+        (1 if bits[point.offset] else 0) if point.offset < count else None
+        for point in points]
+    return result
+
+
+def _create_struct(_encoding):
+    """Create the struct.Struct used to decode an Encoding.
+
+    Registers are packed big endian, or byte swapped when the byte and word
+    orders differ. Unpacking the whole value little endian then reverses the
+    order of the registers.
+
+    Args:
+        _encoding: Encoding
+
+    Returns:
+        result: struct.Struct
+
+    """
+    # Return
+    result = struct.Struct('{}{}'.format(
+        '>' if _encoding.word_order == 'big' else '<',
+        DATA_TYPES[_encoding.data_type][1]))
+    return result
+
+
+def _value(value, default):
+    """Normalize a configuration value.
+
+    Args:
+        value: Value
+        default: Value to use if None
+
+    Returns:
+        result: Lowercase string
+
+    """
+    # Return
+    if value is None:
+        return default
+    result = str(value).strip().lower()
+    return result
@@ -0,0 +1,192 @@
+"""Module used to plan the Modbus requests that read registers.
+
+Registers are configured individually and grouped by multiplier, so reading
+each group separately can read the same registers more than once and makes a
+request for each small gap between registers. The planner merges all the
+registers of the same type and unit into as few requests as possible, each
+reading as many registers as fit in a Modbus PDU. The registers of values
+that span several registers are always read by the same request. Values are
+decoded and multiplied afterwards. Coils and discrete inputs are planned the
+same way.
+
+"""
+
+# Standard imports
+import collections
+
+# Pattoo libraries
+from pattoo_agents.modbus import decoding
+from pattoo_agents.modbus.variables import (
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable, RegisterVariable)
+
+# Maximum number of registers read by a request. This is the limit of a
+# Modbus PDU
+MAX_COUNT = 125
+
+# Maximum number of coils or discrete inputs read by a request. Bits are
+# packed eight to a byte, so more fit in a PDU
+MAX_BITS = 2000
+
+# Value read in a request. offset is the position of its first register in
+# the response. Values are unsigned 16 bit registers unless encoded
+# otherwise
+Point = collections.namedtuple(
+    'Point', 'register offset multiplier encoding')
+Point.__new__.__defaults__ = (decoding.DEFAULT,)
+
+# Register numbers of the first address of each register type. The five
+# digit numbering is used for addresses it can represent.
+_BASES = {
+    CoilVariable: ((1, 65536), 1),
+    DiscreteInputVariable: ((10001, 19999), 100001),
+    InputRegisterVariable: ((30001, 39999), 300001),
+    HoldingRegisterVariable: ((40001, 49999), 400001)}
+
+# Maximum number of addresses read by a request for each type
+_MAX_COUNTS = {
+    CoilVariable: MAX_BITS,
+    DiscreteInputVariable: MAX_BITS}
+
+
+class RegisterRead():
+    """Registers read with a single Modbus request."""
+
+    def __init__(self, variable, points):
+        """Initialize the class.
+
+        Args:
+            variable: RegisterVariable covering all the registers read
+            points: List of Point objects to create from the response
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.variable = variable
+        self.points = tuple(points)
+
+    def __repr__(self):
+        """Return a representation of the attributes of the class.
+
+        Args:
+            None
+
+        Returns:
+            result: String representation.
+
+        """
+        # Return repr
+        return ('''\
+<{} variable={}, points={}>\
+'''.format(self.__class__.__name__, repr(self.variable), len(self.points)))
+
+
+def plan(registervariables, max_gap=0, max_count=None):
+    """Plan the requests needed to read RegisterVariables.
+
+    Args:
+        registervariables: List of RegisterVariable objects
+        max_gap: Maximum number of unneeded registers read to avoid making
+            another request
+        max_count: Maximum number of registers read by each request. The
+            limit of a Modbus PDU is used if None, or if it is lower
+
+    Returns:
+        result: List of RegisterRead objects
+
+    """
+    # Initialize key variables
+    result = []
+    groups = {}
+    max_gap = max(0, int(max_gap))
+
+    # Get the values to read at each address, by register type and unit
+    for _rv in registervariables:
+        if isinstance(_rv, RegisterVariable) is False:
+            continue
+        if _rv.valid is False or type(_rv) not in _BASES:
+            continue
+        addresses = groups.setdefault((type(_rv), _rv.unit), {})
+        step = decoding.size(_rv.encoding)
+        for index in range(0, _rv.count - step + 1, step):
+            points = addresses.setdefault(_rv.address + index, [])
+            point = (_rv.register + index, _rv.multiplier, _rv.encoding)
+            if point not in points:
+                points.append(point)
+
+    # Merge addresses into requests. Requests are ordered by unit, so that
+    # gateways poll the units behind them one after the other
+    for (variable_class, unit), addresses in sorted(
+            groups.items(), key=lambda _: (_[0][1], _[0][0].__name__)):
+        extents = [
+            (address, address + max(
+                decoding.size(_[2]) for _ in addresses[address]) - 1)
+            for address in sorted(addresses)]
+        limit = _MAX_COUNTS.get(variable_class, MAX_COUNT)
+        if max_count is not None:
+            limit = max(1, min(int(max_count), limit))
+        for (first, last) in _spans(extents, max_gap, limit):
+            points = []
+            for address in range(first, last + 1):
+                for (register, multiplier, encoding) in addresses.get(
+                        address, []):
+                    points.append(Point(
+                        register=register, offset=address - first,
+                        multiplier=multiplier, encoding=encoding))
+            variable = variable_class(
+                register=_register(variable_class, first),
+                count=last - first + 1, unit=unit)
+            result.append(RegisterRead(variable, points))
+    return result
+
+
+def _spans(extents, max_gap, max_count):
+    """Group the addresses of values into spans read by one request.
+
+    Values are never split between spans, so a value larger than max_count
+    is read by a span of its own.
+
+    Args:
+        extents: List of (first, last) addresses of each value, sorted by
+            first address
+        max_gap: Maximum number of unneeded addresses in a span
+        max_count: Maximum number of addresses in a span
+
+    Yields:
+        Tuples of (first, last) addresses of each span
+
+    """
+    # Nothing to do
+    if bool(extents) is False:
+        return
+
+    # Group
+    (first, last) = extents[0]
+    for (start, end) in extents[1:]:
+        if start - last - 1 <= max_gap and (
+                max(last, end) - first < max_count):
+            last = max(last, end)
+            continue
+        yield (first, last)
+        (first, last) = (start, end)
+    yield (first, last)
+
+
+def _register(variable_class, address):
+    """Get the register number of an address.
+
+    Args:
+        variable_class: RegisterVariable class
+        address: Modbus address
+
+    Returns:
+        result: Register number
+
+    """
+    # Return
+    ((low, high), base) = _BASES[variable_class]
+    if low + address <= high:
+        return low + address
+    return base + address
@@ -2,22 +2,27 @@
 """Pattoo library for collecting Modbus data."""
 
 # Standard libraries
-import multiprocessing
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # PIP libraries
-from pymodbus.client.sync import ModbusTcpClient
 from pymodbus.pdu import ExceptionResponse
 from pymodbus.exceptions import ModbusIOException, ConnectionException
 
 # Pattoo libraries
 from pattoo_agents.modbus.tcp.configuration import ConfigModbusTCP as Config
+from pattoo_agents.configuration import get_config
+from pattoo_agents import plan
+from pattoo_agents.batch import DataPointBatch, target_datapoints
+from pattoo_agents.modbus.tcp import connections, engine
+from pattoo_agents.modbus import decoding
+from pattoo_agents.modbus.planner import RegisterRead
 from pattoo_agents.modbus.variables import (
-    InputRegisterVariable, HoldingRegisterVariable, RegisterVariable)
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable)
 from pattoo_shared import log
-from pattoo_shared.constants import DATA_INT
-from pattoo_shared.variables import (
-    DataPoint, DataPointMetadata, TargetDataPoints, AgentPolledData)
+from pattoo_shared.variables import AgentPolledData
 from .constants import PATTOO_AGENT_MODBUSTCPD
 
 
@@ -34,24 +39,34 @@ def poll():
 
     """
     # Initialize key variables.
-    config = Config()
+    config = get_config(Config)
     _pi = config.polling_interval()
-    arguments = []
 
     # Initialize AgentPolledData
     agent_program = PATTOO_AGENT_MODBUSTCPD
     agentdata = AgentPolledData(agent_program, _pi)
 
-    # Get registers to be polled
-    drvs = config.registervariables()
-
-    # Create a dict of register lists keyed by ip_target
-    for drv in drvs:
-        arguments.append((drv,))
-
-    # Poll registers for all targets and update the TargetDataPoints
-    ddv_list = _parallel_poller(arguments)
-    agentdata.add(ddv_list)
+    # Get the compiled plan of registers to be polled
+    polling_plan = config.polling_plan()
+    diff = plan.track(agent_program, polling_plan)
+
+    # Poll registers for all targets and update the TargetDataPoints.
+    # Connections to targets are reused between polls
+    if config.engine() == 'asyncio':
+        _engine = engine.get(config.pipeline())
+        _engine.prune(diff.removed)
+        arguments = [
+            (item.target, item.points, item.credentials)
+            for item in polling_plan]
+        batches = _async_poller(_engine, arguments)
+    else:
+        pool = connections.get(config.connections())
+        pool.prune(diff.removed)
+        arguments = [
+            (item.target, item.points, pool, item.credentials)
+            for item in polling_plan]
+        batches = _parallel_poller(arguments)
+    agentdata.add(target_datapoints(batches))
 
     # Return data
     return agentdata
@@ -60,113 +75,295 @@ def poll():
 def _parallel_poller(arguments):
     """Get data.
 
-    Update the TargetDataPoints with DataPoints
+    Update the TargetDataPoints with DataPoints. Targets are polled in
+    threads so that their connections are kept between polls.
 
     Args:
         arguments: List of arguments for _serial_poller
 
     Returns:
-        ddv_list: List of type TargetDataPoints
+        batches: List of type DataPointBatch
 
     """
-    # Initialize key variables
-    sub_processes_in_pool = max(1, multiprocessing.cpu_count())
+    # Poll
+    with ThreadPoolExecutor(
+            thread_name_prefix='pattoo-modbus') as executor:
+        batches = list(executor.map(lambda _: _serial_poller(*_), arguments))
+
+    # Return
+    return batches
 
-    # Create a pool of sub process resources
-    with multiprocessing.Pool(processes=sub_processes_in_pool) as pool:
 
-        # Create sub processes from the pool
-        ddv_list = pool.starmap(_serial_poller, arguments)
+def _async_poller(_engine, arguments):
+    """Get data with the asyncio engine.
 
-    # Wait for all the processes to end and get results
-    pool.join()
+    Update the TargetDataPoints with DataPoints. All targets are polled
+    concurrently in the current thread.
+
+    Args:
+        _engine: engine.Engine used to poll
+        arguments: List of (ip_target, registerreads, gateway) tuples. The
+            gateway is the configuration.Gateway of the ip_target, or None
+
+    Returns:
+        batches: List of type DataPointBatch
+
+    """
+    # Initialize key variables
+    batches = []
+    arguments = [
+        (ip_target, _registerreads(registerreads), gateway)
+        for (ip_target, registerreads, gateway) in arguments]
+
+    # Poll
+    results = _engine.poll([
+        (ip_target, [_.variable for _ in registerreads], gateway)
+        for (ip_target, registerreads, gateway) in arguments])
+
+    # Add the polled data to the batches
+    for (ip_target, registerreads, _), responses in zip(arguments, results):
+        batch = DataPointBatch(ip_target)
+        for registerread, response in zip(registerreads, responses):
+            _add(batch, ip_target, registerread, response)
+        batches.append(batch)
 
     # Return
-    return ddv_list
+    return batches
+
 
+def _serial_poller(ip_target, registerreads, pool=None, gateway=None):
+    """Poll the registers of a target.
 
-def _serial_poller(drv):
-    """Poll each spoke in parallel.
+    Registers are read concurrently over up to the number of connections
+    the pool keeps to each target. Gateways are read one request at a time
+    so that they are never sent concurrent requests.
 
     Args:
-        drv: Target to poll
-        input_registers: Input registers to poll
-        holding_registers: Holding registers to poll
+        ip_target: Target to poll
+        registerreads: planner.RegisterRead objects to poll
+        pool: connections.Connections to the targets
+        gateway: configuration.Gateway of the ip_target. None if the
+            ip_target isn't a gateway
 
     Returns:
-        ddv: TargetDataPoints for the ip_target
+        batch: DataPointBatch for the ip_target
 
     """
     # Intialize data gathering
-    ip_target = drv.target
-    ddv = TargetDataPoints(ip_target)
-
-    # Get list of type DataPoint
-    datapoints = []
-    for _rv in drv.data:
-        # Ignore invalid data
-        if isinstance(_rv, RegisterVariable) is False:
-            continue
-        if _rv.valid is False:
+    batch = DataPointBatch(ip_target)
+    if pool is None:
+        pool = connections.get()
+    registerreads = _registerreads(registerreads)
+    workers = min(pool.size, len(registerreads))
+
+    # Poll
+    if gateway is None and workers > 1:
+        with ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix='pattoo-modbus-reads') as executor:
+            responses = list(executor.map(
+                lambda _: _lease_read(pool, ip_target, _.variable),
+                registerreads))
+    else:
+        responses = []
+        delay = 0 if gateway is None else gateway.inter_frame_delay
+        ready = 0
+        for registerread in registerreads:
+            # Leave the gateway time between frames
+            if bool(delay) is True:
+                time.sleep(max(0, ready - time.monotonic()))
+            responses.append(
+                _lease_read(pool, ip_target, registerread.variable))
+            ready = time.monotonic() + delay
+
+    # Add the polled data to the batch
+    for registerread, response in zip(registerreads, responses):
+        _add(batch, ip_target, registerread, response)
+
+    # Return
+    return batch
+
+
+def _lease_read(pool, ip_target, _rv):
+    """Read a RegisterVariable over a connection borrowed from a pool.
+
+    Args:
+        pool: connections.Connections to the targets
+        ip_target: Target to poll
+        _rv: RegisterVariable to read
+
+    Returns:
+        response: Pymodbus response object. None if the read failed
+
+    """
+    # Read
+    with pool.lease(ip_target) as lease:
+        (_, response) = _read(lease, ip_target, _rv)
+    return response
+
+
+def _registerreads(registerreads):
+    """Get the valid RegisterRead objects to poll.
+
+    Args:
+        registerreads: planner.RegisterRead objects
+
+    Returns:
+        result: List of valid RegisterRead objects
+
+    """
+    # Return
+    result = [
+        _ for _ in registerreads
+        if isinstance(_, RegisterRead) is True and _.variable.valid is True]
+    return result
+
+
+def _add(batch, ip_target, registerread, response):
+    """Add the registers read by a request to a batch.
+
+    Args:
+        batch: DataPointBatch for the ip_target
+        ip_target: Target polled
+        registerread: planner.RegisterRead that was read
+        response: Pymodbus response object. None if the read failed
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _rv = registerread.variable
+    if response is None:
+        return
+
+    # Process data
+    if response.isError() is True:
+        _log_modbus(ip_target, _rv, response)
+        return
+    key = _key(_rv)
+    if isinstance(_rv, (CoilVariable, DiscreteInputVariable)):
+        values = decoding.decode_bits(response.bits, registerread.points)
+    else:
+        values = decoding.decode(response.registers, registerread.points)
+    metadata = (('unit', str(_rv.unit).zfill(3)),)
+    for point, value in zip(registerread.points, values):
+        # Ignore short responses
+        if value is None:
             continue
 
-        # Poll
-        client = ModbusTcpClient(ip_target)
-        if isinstance(_rv, InputRegisterVariable):
-            try:
-                response = client.read_input_registers(
-                    _rv.address, count=_rv.count, unit=_rv.unit)
-                key = 'input_register'
-            except ConnectionException as _err:
-                log_message = ('''\
+        # Do multiplication
+        value = value * point.multiplier
+
+        # Create datapoint and append
+        new_key = '{}_{}'.format(key, point.register)
+        batch.append(
+            new_key, value, data_type=decoding.data_type(point.encoding),
+            metadata=metadata)
+
+
+def _key(_rv):
+    """Get the key prefix of the DataPoints of a RegisterVariable.
+
+    Args:
+        _rv: RegisterVariable
+
+    Returns:
+        result: Key prefix
+
+    """
+    # Return
+    if isinstance(_rv, InputRegisterVariable):
+        result = 'input_register'
+    elif isinstance(_rv, HoldingRegisterVariable):
+        result = 'holding_register'
+    elif isinstance(_rv, CoilVariable):
+        result = 'coil'
+    elif isinstance(_rv, DiscreteInputVariable):
+        result = 'discrete_input'
+    else:
+        result = None
+    return result
+
+
+def _read(lease, ip_target, _rv):
+    """Read the registers, coils or discrete inputs of a RegisterVariable.
+
+    The connection is discarded if the target can't be read, so that the
+    next read reconnects.
+
+    Args:
+        lease: connections.Lease to the target
+        ip_target: Target to poll
+        _rv: RegisterVariable to read
+
+    Returns:
+        result: Tuple of (key, response). The response is None if the read
+            failed.
+
+    """
+    # Initialize key variables
+    client = lease.client
+    response = None
+    key = _key(_rv)
+
+    # Read
+    if isinstance(_rv, InputRegisterVariable):
+        try:
+            response = client.read_input_registers(
+                _rv.address, count=_rv.count, unit=_rv.unit)
+        except ConnectionException as _err:
+            log_message = ('''\
 Cannot connect to target {} to retrieve input register {}, count {}, \
 unit {}: {}'''.format(ip_target, _rv.register, _rv.count, _rv.unit, str(_err)))
-                log.log2warning(51028, log_message)
-                continue
-            except:
-                log_message = ('''\
+            log.log2warning(51028, log_message)
+        except:
+            log_message = ('''\
 Cause unknown failure with target {} getting input register {}, count {}, \
 unit {}'''.format(ip_target, _rv.register, _rv.count, _rv.unit))
-                log.log2warning(51030, log_message)
-                continue
-        elif isinstance(_rv, HoldingRegisterVariable):
-            try:
-                response = client.read_holding_registers(_rv.address)
-                key = 'holding_register'
-            except ConnectionException:
-                log_message = ('''\
+            log.log2warning(51030, log_message)
+    elif isinstance(_rv, HoldingRegisterVariable):
+        try:
+            response = client.read_holding_registers(
+                _rv.address, count=_rv.count, unit=_rv.unit)
+        except ConnectionException:
+            log_message = ('''\
 Cannot connect to target {} to retrieve input register {}, count {}, \
 unit {}'''.format(ip_target, _rv.register, _rv.count, _rv.unit))
-                log.log2warning(51032, log_message)
-                continue
-            except:
-                log_message = ('''\
+            log.log2warning(51032, log_message)
+        except:
+            log_message = ('''\
 Cause unknown failure with target {} getting holding register {}, count {}, \
 unit {}. [{}, {}, {}]\
 '''.format(ip_target, _rv.register, _rv.count, _rv.unit, sys.exc_info()[0],
            sys.exc_info()[1], sys.exc_info()[2]))
-                log.log2warning(51031, log_message)
-                continue
-
-        # Process data
-        if response.isError() is True:
-            _log_modbus(ip_target, _rv, response)
+            log.log2warning(51031, log_message)
+    elif isinstance(_rv, (CoilVariable, DiscreteInputVariable)):
+        if isinstance(_rv, CoilVariable):
+            function = client.read_coils
         else:
-            values = response.registers
-            for data_index, _value in enumerate(values):
-                # Do multiplication
-                value = _value * _rv.multiplier
-
-                # Create DataPoint and append
-                new_key = ('{}_{}'.format(key, _rv.register + data_index))
-                datapoint = DataPoint(new_key, value, data_type=DATA_INT)
-                datapoint.add(
-                    DataPointMetadata('unit', str(_rv.unit).zfill(3)))
-                datapoints.append(datapoint)
-    ddv.add(datapoints)
-
-    # Return
-    return ddv
+            function = client.read_discrete_inputs
+        try:
+            response = function(_rv.address, count=_rv.count, unit=_rv.unit)
+        except ConnectionException as _err:
+            log_message = ('''\
+Cannot connect to target {} to retrieve {} {}, count {}, unit {}: {}\
+'''.format(ip_target, key.replace('_', ' '), _rv.register, _rv.count,
+           _rv.unit, str(_err)))
+            log.log2warning(51595, log_message)
+        except:
+            log_message = ('''\
+Cause unknown failure with target {} getting {} {}, count {}, unit {}. \
+[{}, {}, {}]'''.format(ip_target, key.replace('_', ' '), _rv.register,
+                       _rv.count, _rv.unit, sys.exc_info()[0],
+                       sys.exc_info()[1], sys.exc_info()[2]))
+            log.log2warning(51596, log_message)
+
+    # Reconnect next time if the connection failed or is out of step
+    if response is None or isinstance(response, ModbusIOException):
+        lease.discard()
+    result = (key, response)
+    return result
 
 
 def _log_modbus(ip_target, registervariable, response):
@@ -2,19 +2,37 @@
 """Classe to manage ModbusTCP agent configurations."""
 
 # Standard imports
+import collections
 import itertools
 
 # Import project libraries
-from pattoo_shared import configuration, files
-from pattoo_shared.configuration import Config
+from pattoo_shared import configuration
+from pattoo_shared import log
+from pattoo_agents.configuration import AgentConfig
+from pattoo_agents import plan
+from pattoo_agents.modbus import decoding, planner
 from pattoo_shared import data as lib_data
 from pattoo_shared.variables import IPTargetPollingPoints
 from pattoo_agents.modbus.variables import (
-    InputRegisterVariable, HoldingRegisterVariable, TargetRegisterVariables)
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable, TargetRegisterVariables)
 from .constants import PATTOO_AGENT_MODBUSTCPD
 
+# RegisterVariable classes of each type of register in polling groups
+REGISTER_TYPES = {
+    'input_registers': InputRegisterVariable,
+    'holding_registers': HoldingRegisterVariable,
+    'coils': CoilVariable,
+    'discrete_inputs': DiscreteInputVariable}
 
-class ConfigModbusTCP(Config):
+# Limits on the requests sent to a gateway serving several units over one
+# serial bus. max_requests is the maximum number of requests awaiting a
+# response and inter_frame_delay the minimum seconds between requests
+Gateway = collections.namedtuple(
+    'Gateway', 'max_requests inter_frame_delay')
+
+
+class ConfigModbusTCP(AgentConfig):
     """Class gathers all configuration information."""
 
     def __init__(self):
@@ -28,12 +46,7 @@ class ConfigModbusTCP(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration directory
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_MODBUSTCPD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_MODBUSTCPD)
 
     def polling_interval(self):
         """Get targets.
@@ -58,7 +71,182 @@ class ConfigModbusTCP(Config):
             result = abs(int(intermediate))
         return result
 
+    def connections(self):
+        """Get connections.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of connections kept open to each target
+
+        """
+        # Get result
+        key = PATTOO_AGENT_MODBUSTCPD
+        sub_key = 'connections'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 1
+        if bool(intermediate) is False:
+            result = 1
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def engine(self):
+        """Get engine.
+
+        Args:
+            None
+
+        Returns:
+            result: Engine used to poll targets. Either 'threads' or
+                'asyncio'
+
+        """
+        # Get result
+        key = PATTOO_AGENT_MODBUSTCPD
+        sub_key = 'engine'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to threads
+        result = str(intermediate).strip().lower()
+        if result not in ['threads', 'asyncio']:
+            result = 'threads'
+        return result
+
+    def pipeline(self):
+        """Get pipeline.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of requests awaiting a response on each
+                connection of the asyncio engine
+
+        """
+        # Get result
+        key = PATTOO_AGENT_MODBUSTCPD
+        sub_key = 'pipeline'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 1
+        if bool(intermediate) is False:
+            result = 1
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def max_register_gap(self):
+        """Get max_register_gap.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of unneeded registers read to avoid
+                making another request
+
+        """
+        # Get result
+        key = PATTOO_AGENT_MODBUSTCPD
+        sub_key = 'max_register_gap'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def gateways(self):
+        """Get the gateways in the configuration file.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of Gateway objects keyed by ip_target
+
+        """
+        # Get result
+        result = self._cached('gateways', self._gateways)
+        return result
+
     def registervariables(self):
+        """Get cached list polling target information in configuration file.
+
+        Args:
+            None
+
+        Returns:
+            result: List of TargetRegisterVariables items
+
+        """
+        # Get result
+        result = self._cached('registervariables', self._registervariables)
+        return result
+
+    def polling_plan(self):
+        """Get the compiled plan of registers to poll for each target.
+
+        Args:
+            None
+
+        Returns:
+            result: PollingPlan object
+
+        """
+        # Get result
+        result = self._cached(
+            'polling_plan', lambda: _polling_plan(
+                self.registervariables(), self.max_register_gap(),
+                self.gateways()))
+        return result
+
+    def _gateways(self):
+        """Get the gateways in the configuration file.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of Gateway objects keyed by ip_target
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Get configuration snippet
+        key = PATTOO_AGENT_MODBUSTCPD
+        sub_key = 'gateways'
+        groups = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+        if isinstance(groups, list) is False:
+            return result
+
+        # Create Gateway objects. Requests are serialized by default
+        for group in groups:
+            if isinstance(group, dict) is False:
+                continue
+            if isinstance(group.get('ip_targets'), list) is False:
+                continue
+            gateway = Gateway(
+                max_requests=max(1, abs(int(
+                    group.get('max_requests') or 1))),
+                inter_frame_delay=abs(float(
+                    group.get('inter_frame_delay') or 0)))
+            for ip_target in group['ip_targets']:
+                result[ip_target] = gateway
+        return result
+
+    def _registervariables(self):
         """Get list polling target information in configuration file..
 
         Args:
@@ -82,7 +270,7 @@ class ConfigModbusTCP(Config):
 
         # Create snmp objects
         for group in groups:
-            for register in ['input_registers', 'holding_registers']:
+            for register in REGISTER_TYPES:
                 if register in group:
                     drvs = self._create_drv(group, register)
                     result.extend(drvs)
@@ -105,14 +293,19 @@ class ConfigModbusTCP(Config):
         # Only return valid value
         if isinstance(data, dict) is True:
             # Screen data for keys and correct type
-            if register_type not in ['input_registers', 'holding_registers']:
+            if register_type not in REGISTER_TYPES:
                 return []
             if isinstance(data['ip_targets'], list) is False and isinstance(
                     data[register_type], list) is False:
                 return []
 
-            # Get the modbus unit value
+            # Get the modbus unit value and the encoding of each address.
+            # Coils and discrete inputs are single bits
             unit = _get_unit(data)
+            if register_type in ['coils', 'discrete_inputs']:
+                encodings = {}
+            else:
+                encodings = _get_encodings(data[register_type])
 
             # Create polling targets
             for ip_target in data['ip_targets']:
@@ -131,21 +324,32 @@ class ConfigModbusTCP(Config):
 
                 # Extract data from IPTargetPollingPoints
                 for item in dpt.data:
-                    multiplier = item.multiplier
-                    if multiplier not in m_dict:
-                        m_dict[multiplier] = [item.address]
+                    encoding = encodings.get(item.address, decoding.DEFAULT)
+                    if encoding is None:
+                        continue
+                    m_key = (item.multiplier, encoding)
+                    if m_key not in m_dict:
+                        m_dict[m_key] = [item.address]
                     else:
-                        m_dict[multiplier].append(item.address)
-
-                # Create RegisterVariable objects
-                for multiplier, registers in sorted(m_dict.items()):
-                    register_counts = _create_register_counts(registers)
+                        m_dict[m_key].append(item.address)
+
+                # Create RegisterVariable objects. Values spanning several
+                # registers are read one by one
+                for (multiplier, encoding), registers in sorted(
+                        m_dict.items()):
+                    size = decoding.size(encoding)
+                    if size == 1:
+                        register_counts = _create_register_counts(registers)
+                    else:
+                        register_counts = [
+                            (register, size) for register in registers]
                     for register, count in register_counts:
                         variables.append(
                             _create_register_variable(
                                 register_type,
                                 register=register, count=count,
-                                unit=unit, multiplier=multiplier))
+                                unit=unit, multiplier=multiplier,
+                                encoding=encoding))
 
                 # Create TargetRegisterVariables object
                 drv = TargetRegisterVariables(ip_target)
@@ -156,8 +360,43 @@ class ConfigModbusTCP(Config):
         return result
 
 
+def _polling_plan(drvs, max_gap=0, gateways=None):
+    """Compile the Modbus polling plan.
+
+    Args:
+        drvs: List of TargetRegisterVariables objects
+        max_gap: Maximum number of unneeded registers read to avoid making
+            another request
+        gateways: Dict of Gateway objects keyed by ip_target
+
+    Returns:
+        result: PollingPlan object whose points are the RegisterRead
+            objects of each target, and whose credentials are the Gateway
+            of each target. The Gateway is None if the target isn't one
+
+    """
+    # Initialize key variables
+    ip_registervariables = {}
+    gateways = gateways or {}
+
+    # Merge the RegisterVariables of each target
+    for drv in drvs:
+        if drv.valid is False:
+            continue
+        ip_registervariables.setdefault(drv.target, []).extend(drv.data)
+
+    # Return
+    result = plan.PollingPlan([
+        plan.plan_item(
+            ip_target, gateways.get(ip_target),
+            planner.plan(registervariables, max_gap=max_gap))
+        for ip_target, registervariables in ip_registervariables.items()])
+    return result
+
+
 def _create_register_variable(
-        register_type, register=None, count=None, unit=None, multiplier=None):
+        register_type, register=None, count=None, unit=None, multiplier=None,
+        encoding=None):
     """Create a Modbus register variable.
 
     Args:
@@ -171,14 +410,51 @@ def _create_register_variable(
     result = None
 
     # Process
-    if register_type == 'holding_registers':
-        result = HoldingRegisterVariable(
+    if register_type in ['coils', 'discrete_inputs']:
+        result = REGISTER_TYPES[register_type](
             register=register, count=count,
             unit=unit, multiplier=multiplier)
+    elif register_type == 'holding_registers':
+        result = HoldingRegisterVariable(
+            register=register, count=count,
+            unit=unit, multiplier=multiplier, encoding=encoding)
     else:
         result = InputRegisterVariable(
             register=register, count=count,
-            unit=unit, multiplier=multiplier)
+            unit=unit, multiplier=multiplier, encoding=encoding)
+    return result
+
+
+def _get_encodings(items):
+    """Get the encoding of the values at each register address.
+
+    Args:
+        items: List of register dicts from the configuration
+
+    Returns:
+        result: Dict of decoding.Encoding keyed by address. The Encoding is
+            None if it is invalid
+
+    """
+    # Initialize key variables
+    result = {}
+    if isinstance(items, list) is False:
+        return result
+
+    # Process
+    for item in items:
+        if isinstance(item, dict) is False or 'address' not in item:
+            continue
+        encoding = decoding.encoding(
+            data_type=item.get('data_type'),
+            byte_order=item.get('byte_order'),
+            word_order=item.get('word_order'))
+        if encoding is None:
+            log_message = ('''\
+Invalid data_type, byte_order or word_order for register {}. It will not be \
+polled'''.format(item['address']))
+            log.log2warning(51594, log_message)
+        result[item['address']] = encoding
     return result
 
 
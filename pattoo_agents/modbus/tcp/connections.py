@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Pattoo library keeping Modbus TCP connections open between reads.
+
+Opening a connection for each read costs a TCP handshake per register
+block, and many PLCs only accept a few connections at a time. Connections
+keeps a small pool of connected clients for each target and port, and
+reuses them across reads and polling cycles. A client that fails is closed
+and replaced by a new connection the next time one is needed.
+
+"""
+
+# Standard libraries
+import contextlib
+import os
+import threading
+
+# PIP libraries
+from pymodbus.client.sync import ModbusTcpClient
+
+# Default Modbus TCP port
+PORT = 502
+
+# Default maximum number of connections to each target
+SIZE = 1
+
+# Default seconds to wait for a target to respond
+TIMEOUT = 3
+
+# Connections used by each process
+_LOCK = threading.Lock()
+_CONNECTIONS = {}
+
+
+class Lease():
+    """Client borrowed from a pool of connections."""
+
+    __slots__ = ('client', 'broken')
+
+    def __init__(self, client):
+        """Initialize the class.
+
+        Args:
+            client: ModbusTcpClient
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.client = client
+        self.broken = False
+
+    def discard(self):
+        """Close the connection instead of reusing it.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Discard
+        self.broken = True
+
+
+class _Pool():
+    """Connections to a single target and port."""
+
+    def __init__(self, factory, size):
+        """Initialize the class.
+
+        Args:
+            factory: Function that creates a new client
+            size: Maximum number of connections
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.size = size
+        self.created = 0
+        self._factory = factory
+        self._idle = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Get a client, waiting if the maximum are in use.
+
+        Args:
+            None
+
+        Returns:
+            result: ModbusTcpClient
+
+        """
+        # Reuse an idle client or create one
+        with self._condition:
+            while bool(self._idle) is False and self.created >= self.size:
+                self._condition.wait()
+            if bool(self._idle) is True:
+                return self._idle.pop()
+            self.created += 1
+        return self._factory()
+
+    def release(self, client, broken=False):
+        """Return a client to the pool.
+
+        Args:
+            client: ModbusTcpClient
+            broken: Close the connection if True
+
+        Returns:
+            None
+
+        """
+        # Release
+        with self._condition:
+            if broken is True or self._closed is True:
+                self.created -= 1
+                client.close()
+            else:
+                self._idle.append(client)
+            self._condition.notify()
+
+    def close(self):
+        """Close idle connections, and the others when they are released.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        with self._condition:
+            self._closed = True
+            for client in self._idle:
+                client.close()
+            self.created -= len(self._idle)
+            self._idle = []
+
+
+class Connections():
+    """Pools of Modbus TCP connections keyed by target and port."""
+
+    def __init__(self, size=SIZE, timeout=TIMEOUT, factory=ModbusTcpClient):
+        """Initialize the class.
+
+        Args:
+            size: Maximum number of connections to each target and port
+            timeout: Seconds to wait for a target to respond
+            factory: Class used to create clients
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def __len__(self):
+        """Get the number of open or borrowed connections."""
+        return sum(_.created for _ in self._pools.values())
+
+    @contextlib.contextmanager
+    def lease(self, target, port=PORT):
+        """Borrow a client connected to a target.
+
+        The connection is closed if the block raises an exception or calls
+        Lease.discard(), so that the next lease reconnects.
+
+        Args:
+            target: Target hostname or IP address
+            port: TCP port
+
+        Yields:
+            Lease
+
+        """
+        # Get the pool of the target
+        key = (target, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _Pool(
+                    lambda: self._factory(
+                        target, port=port, timeout=self.timeout),
+                    self.size)
+                self._pools[key] = pool
+
+        # Lend a client
+        result = Lease(pool.acquire())
+        try:
+            yield result
+        except BaseException:
+            result.broken = True
+            raise
+        finally:
+            pool.release(result.client, broken=result.broken)
+
+    def prune(self, targets):
+        """Close the connections to targets that are no longer polled.
+
+        Args:
+            targets: Targets to close connections to
+
+        Returns:
+            None
+
+        """
+        # Close
+        targets = set(targets)
+        with self._lock:
+            keys = [_ for _ in self._pools if _[0] in targets]
+            pools = [self._pools.pop(_) for _ in keys]
+        for pool in pools:
+            pool.close()
+
+    def close(self):
+        """Close all connections.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            pool.close()
+
+
+def get(size=SIZE):
+    """Get the Connections of the current process.
+
+    New Connections are created if the size changes or if the process was
+    forked.
+
+    Args:
+        size: Maximum number of connections to each target and port
+
+    Returns:
+        result: Connections
+
+    """
+    # Initialize key variables
+    key = os.getpid()
+    size = max(1, int(size))
+
+    # Return
+    with _LOCK:
+        result = _CONNECTIONS.get(key)
+        if result is not None and result.size == size:
+            return result
+        if result is not None:
+            result.close()
+        result = Connections(size=size)
+        _CONNECTIONS.clear()
+        _CONNECTIONS[key] = result
+    return result
+
+
+def close():
+    """Close all connections of the current process.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Close
+    with _LOCK:
+        result = _CONNECTIONS.pop(os.getpid(), None)
+    if result is not None:
+        result.close()
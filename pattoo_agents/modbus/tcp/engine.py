@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""Pattoo library polling Modbus TCP targets with asyncio.
+
+The synchronous client waits for the response to each request before
+sending the next one, so polling many targets needs many threads. Modbus TCP
+identifies each request with a transaction ID, which lets a client send
+several requests over a connection before the first response arrives.
+
+The Engine polls all targets concurrently from one event loop, and sends up
+to a configurable number of requests over each connection at a time.
+Responses are matched to their requests by transaction ID. The event loop is
+kept between polls so that connections stay open.
+
+Gateways serving several units over one serial bus can be overrun by
+concurrent requests. Their requests are capped separately, and spaced by a
+minimum delay.
+
+Requests are encoded and responses decoded with pymodbus, so the responses
+are the same objects the synchronous client returns.
+
+"""
+
+# Standard libraries
+import asyncio
+import itertools
+import os
+import struct
+import sys
+import threading
+
+# PIP libraries
+from pymodbus.exceptions import ConnectionException
+from pymodbus.factory import ClientDecoder
+from pymodbus.bit_read_message import (
+    ReadCoilsRequest, ReadDiscreteInputsRequest)
+from pymodbus.register_read_message import (
+    ReadHoldingRegistersRequest, ReadInputRegistersRequest)
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.modbus.variables import (
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable)
+
+# Default Modbus TCP port
+PORT = 502
+
+# Default maximum number of requests awaiting a response on a connection
+PIPELINE = 1
+
+# Default seconds to wait for a response
+TIMEOUT = 3
+
+# Requests used to read each type of RegisterVariable
+REQUESTS = {
+    InputRegisterVariable: ReadInputRegistersRequest,
+    HoldingRegisterVariable: ReadHoldingRegistersRequest,
+    CoilVariable: ReadCoilsRequest,
+    DiscreteInputVariable: ReadDiscreteInputsRequest}
+
+# Modbus application protocol header: transaction ID, protocol ID, length
+# of the rest of the frame and unit
+_HEADER = struct.Struct('>HHHB')
+
+# Engines used by each process
+_LOCK = threading.Lock()
+_ENGINES = {}
+
+
+class _Connection():
+    """Pipelined connection to a Modbus TCP target."""
+
+    def __init__(self, target, port, pipeline, timeout, delay=0):
+        """Initialize the class.
+
+        Args:
+            target: Target hostname or IP address
+            port: TCP port
+            pipeline: Maximum number of requests awaiting a response
+            timeout: Seconds to wait for a response
+            delay: Minimum seconds between requests, and between a response
+                and the next request
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.target = target
+        self.port = port
+        self.pipeline = pipeline
+        self.timeout = timeout
+        self.delay = delay
+        self._ready = 0
+        self._semaphore = asyncio.Semaphore(pipeline)
+        self._pacing = asyncio.Lock()
+        self._connecting = asyncio.Lock()
+        self._decoder = ClientDecoder()
+        self._transactions = itertools.cycle(range(1, 65536))
+        self._pending = {}
+        self._writer = None
+        self._receiver = None
+
+    async def request(self, pdu, unit):
+        """Send a request and wait for the response.
+
+        Args:
+            pdu: pymodbus ModbusRequest
+            unit: Modbus unit
+
+        Returns:
+            result: pymodbus ModbusResponse. None if the response could not
+                be decoded
+
+        """
+        # Send when there is room in the pipeline
+        async with self._semaphore:
+            await self._connect()
+            await self._pace()
+            transaction = next(self._transactions)
+            while transaction in self._pending:
+                transaction = next(self._transactions)
+            future = asyncio.get_event_loop().create_future()
+            self._pending[transaction] = future
+            body = bytes([pdu.function_code]) + pdu.encode()
+            try:
+                self._writer.write(
+                    _HEADER.pack(transaction, 0, len(body) + 1, unit) + body)
+                result = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                # The target may be unable to answer further requests
+                self.close(ConnectionException('Timed out'))
+                raise
+            finally:
+                self._pending.pop(transaction, None)
+                if bool(self.delay) is True:
+                    self._ready = max(
+                        self._ready,
+                        asyncio.get_event_loop().time() + self.delay)
+        return result
+
+    def close(self, error=None):
+        """Close the connection and fail the requests awaiting a response.
+
+        Args:
+            error: Exception raised by the requests awaiting a response
+
+        Returns:
+            None
+
+        """
+        # Fail pending requests
+        for future in self._pending.values():
+            if future.done() is False:
+                future.set_exception(
+                    error or ConnectionException('Connection closed'))
+        self._pending = {}
+
+        # Close
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _pace(self):
+        """Wait until the delay since the last request or response passed.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Nothing to do
+        if bool(self.delay) is False:
+            return
+
+        # Wait
+        loop = asyncio.get_event_loop()
+        async with self._pacing:
+            wait = self._ready - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._ready = loop.time() + self.delay
+
+    async def _connect(self):
+        """Connect to the target if not already connected.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Connect
+        async with self._connecting:
+            if self._writer is not None:
+                return
+            try:
+                (reader, writer) = await asyncio.wait_for(
+                    asyncio.open_connection(self.target, self.port),
+                    self.timeout)
+            except (OSError, asyncio.TimeoutError) as error:
+                raise ConnectionException(
+                    'Failed to connect to {}:{}: {}'.format(
+                        self.target, self.port, error))
+            self._writer = writer
+            self._receiver = asyncio.ensure_future(self._receive(reader))
+
+    async def _receive(self, reader):
+        """Match responses to the requests awaiting them.
+
+        Args:
+            reader: asyncio.StreamReader
+
+        Returns:
+            None
+
+        """
+        # Receive until the connection fails
+        try:
+            while True:
+                header = await reader.readexactly(_HEADER.size)
+                (transaction, protocol, length, _) = _HEADER.unpack(header)
+                if protocol != 0 or length < 2:
+                    raise ConnectionError(
+                        'Invalid Modbus TCP header {}'.format(header.hex()))
+                body = await reader.readexactly(length - 1)
+                future = self._pending.get(transaction)
+                if future is not None and future.done() is False:
+                    future.set_result(self._decoder.decode(body))
+        except (OSError, asyncio.IncompleteReadError) as error:
+            self._receiver = None
+            self.close(ConnectionException(str(error)))
+
+
+class Engine():
+    """Polls Modbus TCP targets concurrently with asyncio."""
+
+    def __init__(self, pipeline=PIPELINE, timeout=TIMEOUT, port=PORT):
+        """Initialize the class.
+
+        Args:
+            pipeline: Maximum number of requests awaiting a response on each
+                connection
+            timeout: Seconds to wait for a response
+            port: TCP port of the targets
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.pipeline = max(1, int(pipeline))
+        self.timeout = timeout
+        self.port = port
+        self._connections = {}
+
+        # The event loop is kept between polls to keep connections open
+        self._loop = asyncio.new_event_loop()
+
+    def __len__(self):
+        """Get the number of open connections."""
+        return sum(
+            _._writer is not None for _ in self._connections.values())
+
+    def poll(self, arguments):
+        """Read the registers of targets.
+
+        Args:
+            arguments: List of (target, RegisterVariables) or (target,
+                RegisterVariables, Gateway) tuples. The Gateway limits the
+                requests sent to the target
+
+        Returns:
+            result: List with a list of responses for each target, in the
+                order of its RegisterVariables. Responses are None if the
+                read failed.
+
+        """
+        # Poll
+        result = self._loop.run_until_complete(self._poll(arguments))
+        return result
+
+    def prune(self, targets):
+        """Close the connections to targets that are no longer polled.
+
+        Args:
+            targets: Targets to close connections to
+
+        Returns:
+            None
+
+        """
+        # Close
+        targets = set(targets)
+        for key in [_ for _ in self._connections if _[0] in targets]:
+            self._connections.pop(key).close()
+
+    def close(self):
+        """Close all connections and the event loop.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        if self._loop.is_closed() is True:
+            return
+        for connection in self._connections.values():
+            connection.close()
+        self._connections = {}
+        self._loop.run_until_complete(asyncio.sleep(0))
+        self._loop.close()
+
+    async def _poll(self, arguments):
+        """Read the registers of targets concurrently.
+
+        Args:
+            arguments: List of (target, RegisterVariables) or (target,
+                RegisterVariables, Gateway) tuples
+
+        Returns:
+            result: List with a list of responses for each target
+
+        """
+        # Return
+        result = await asyncio.gather(
+            *[self._target(*argument) for argument in arguments])
+        return list(result)
+
+    async def _target(self, ip_target, registervariables, gateway=None):
+        """Read the registers of a target.
+
+        Args:
+            ip_target: Target to poll
+            registervariables: List of RegisterVariable objects
+            gateway: Gateway limiting the requests sent to the target. None
+                if the target isn't a gateway
+
+        Returns:
+            result: List of responses
+
+        """
+        # Initialize key variables
+        key = (ip_target, self.port)
+        pipeline = self.pipeline
+        delay = 0
+        if gateway is not None:
+            pipeline = max(1, min(pipeline, gateway.max_requests))
+            delay = gateway.inter_frame_delay
+
+        # Get the connection. It is replaced if the limits changed
+        connection = self._connections.get(key)
+        if connection is not None and (
+                connection.pipeline, connection.delay) != (pipeline, delay):
+            connection.close()
+            connection = None
+        if connection is None:
+            connection = _Connection(
+                ip_target, self.port, pipeline, self.timeout, delay=delay)
+            self._connections[key] = connection
+
+        # Return
+        result = await asyncio.gather(
+            *[self._read(connection, _rv) for _rv in registervariables])
+        return list(result)
+
+    async def _read(self, connection, _rv):
+        """Read the registers of a RegisterVariable.
+
+        Args:
+            connection: _Connection to the target
+            _rv: RegisterVariable to read
+
+        Returns:
+            result: pymodbus ModbusResponse. None if the read failed
+
+        """
+        # Initialize key variables
+        result = None
+        request = REQUESTS.get(type(_rv))
+        if request is None or _rv.valid is False:
+            return result
+
+        # Read
+        try:
+            result = await connection.request(
+                request(_rv.address, _rv.count, unit=_rv.unit), _rv.unit)
+        except ConnectionException as _err:
+            log_message = ('''\
+Cannot connect to target {} to retrieve register {}, count {}, unit {}: {}\
+'''.format(connection.target, _rv.register, _rv.count, _rv.unit, _err))
+            log.log2warning(51591, log_message)
+        except asyncio.TimeoutError:
+            log_message = ('''\
+Timed out reading register {}, count {}, unit {} from target {}\
+'''.format(_rv.register, _rv.count, _rv.unit, connection.target))
+            log.log2warning(51592, log_message)
+        except:
+            log_message = ('''\
+Cause unknown failure with target {} getting register {}, count {}, \
+unit {}. [{}, {}, {}]\
+'''.format(connection.target, _rv.register, _rv.count, _rv.unit,
+           sys.exc_info()[0], sys.exc_info()[1], sys.exc_info()[2]))
+            log.log2warning(51593, log_message)
+        return result
+
+
+def get(pipeline=PIPELINE):
+    """Get the Engine of the current process.
+
+    A new Engine is created if the pipeline changes or if the process was
+    forked.
+
+    Args:
+        pipeline: Maximum number of requests awaiting a response on each
+            connection
+
+    Returns:
+        result: Engine
+
+    """
+    # Initialize key variables
+    key = os.getpid()
+    pipeline = max(1, int(pipeline))
+
+    # Return
+    with _LOCK:
+        result = _ENGINES.get(key)
+        if result is not None and result.pipeline == pipeline:
+            return result
+        if result is not None:
+            result.close()
+        result = Engine(pipeline=pipeline)
+        _ENGINES.clear()
+        _ENGINES[key] = result
+    return result
+
+
+def close():
+    """Close the Engine of the current process.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Close
+    with _LOCK:
+        result = _ENGINES.pop(os.getpid(), None)
+    if result is not None:
+        result.close()
@@ -1,12 +1,14 @@
 """Module for classes that format variables."""
 
 from pattoo_shared import data
+from pattoo_agents.modbus import decoding
 
 
 class RegisterVariable():
     """Variable representation for Register data for Modbus polling."""
 
-    def __init__(self, register=None, count=1, unit=0, multiplier=1):
+    def __init__(self, register=None, count=1, unit=0, multiplier=1,
+                 encoding=None):
         """Initialize the class.
 
         Args:
@@ -14,6 +16,8 @@ class RegisterVariable():
             count: The number of registers to read
             unit: The slave unit this request is targeting
             multiplier: Value to multiply register results by
+            encoding: decoding.Encoding of the values in the registers.
+                Registers are unsigned 16 bit values if None
 
         Returns:
             None
@@ -21,6 +25,10 @@ class RegisterVariable():
         """
         # Initialize key variables
         self.address = None
+        if encoding is None:
+            self.encoding = decoding.DEFAULT
+        else:
+            self.encoding = encoding
 
         # Apply the multiplier
         if bool(multiplier) is False:
@@ -44,7 +52,8 @@ class RegisterVariable():
             isinstance(unit, int) is True,
             unit is not False,
             unit is not True,
-            unit is not None
+            unit is not None,
+            isinstance(self.encoding, decoding.Encoding)
             ]
         # This part is separate as we need to do some mathematical functions
         # that are based on the validity of the previous tests
@@ -83,7 +92,8 @@ class RegisterVariable():
 class InputRegisterVariable(RegisterVariable):
     """Variable representation for Register data for Modbus polling."""
 
-    def __init__(self, register=None, count=1, unit=0, multiplier=1):
+    def __init__(self, register=None, count=1, unit=0, multiplier=1,
+                 encoding=None):
         """Initialize the class.
 
         Args:
@@ -91,6 +101,7 @@ class InputRegisterVariable(RegisterVariable):
             count: The number of registers to read
             unit: The slave unit this request is targeting
             multiplier: Value to multiply register results by
+            encoding: decoding.Encoding of the values in the registers
 
         Returns:
             None
@@ -99,7 +110,7 @@ class InputRegisterVariable(RegisterVariable):
         # Initialize variables
         RegisterVariable.__init__(
             self, register=register, count=count,
-            unit=unit, multiplier=multiplier)
+            unit=unit, multiplier=multiplier, encoding=encoding)
 
         # Set modbus physical address to contact
         if self.valid is True:
@@ -114,7 +125,8 @@ class InputRegisterVariable(RegisterVariable):
 class HoldingRegisterVariable(RegisterVariable):
     """Variable representation for Register data for Modbus polling."""
 
-    def __init__(self, register=None, count=1, unit=0, multiplier=1):
+    def __init__(self, register=None, count=1, unit=0, multiplier=1,
+                 encoding=None):
         """Initialize the class.
 
         Args:
@@ -122,6 +134,7 @@ class HoldingRegisterVariable(RegisterVariable):
             count: The number of registers to read
             unit: The slave unit this request is targeting
             multiplier: Value to multiply register results by
+            encoding: decoding.Encoding of the values in the registers
 
         Returns:
             None
@@ -130,7 +143,7 @@ class HoldingRegisterVariable(RegisterVariable):
         # Initialize variables
         RegisterVariable.__init__(
             self, register=register, count=count,
-            unit=unit, multiplier=multiplier)
+            unit=unit, multiplier=multiplier, encoding=encoding)
 
         # Set modbus physical address to contact
         if self.valid is True:
@@ -142,6 +155,67 @@ class HoldingRegisterVariable(RegisterVariable):
                 self.valid = False
 
 
+class CoilVariable(RegisterVariable):
+    """Variable representation for Coil data for Modbus polling."""
+
+    def __init__(self, register=None, count=1, unit=0, multiplier=1):
+        """Initialize the class.
+
+        Args:
+            register: Coil number
+            count: The number of coils to read
+            unit: The slave unit this request is targeting
+            multiplier: Value to multiply coil results by
+
+        Returns:
+            None
+
+        """
+        # Initialize variables
+        RegisterVariable.__init__(
+            self, register=register, count=count,
+            unit=unit, multiplier=multiplier)
+
+        # Set modbus physical address to contact. Five and six digit coil
+        # numbers start at the same address
+        if self.valid is True:
+            if 1 <= register <= 65536:
+                self.address = register - 1
+            else:
+                self.valid = False
+
+
+class DiscreteInputVariable(RegisterVariable):
+    """Variable representation for Discrete Input data for Modbus polling."""
+
+    def __init__(self, register=None, count=1, unit=0, multiplier=1):
+        """Initialize the class.
+
+        Args:
+            register: Discrete input number
+            count: The number of discrete inputs to read
+            unit: The slave unit this request is targeting
+            multiplier: Value to multiply discrete input results by
+
+        Returns:
+            None
+
+        """
+        # Initialize variables
+        RegisterVariable.__init__(
+            self, register=register, count=count,
+            unit=unit, multiplier=multiplier)
+
+        # Set modbus physical address to contact
+        if self.valid is True:
+            if 10001 <= register <= 19999:
+                self.address = register - 10001
+            elif 100001 <= register <= 165536:
+                self.address = register - 100001
+            else:
+                self.valid = False
+
+
 class TargetRegisterVariables():
     """Object defining a list of RegisterVariable objects.
 
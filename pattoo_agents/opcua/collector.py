@@ -20,6 +20,7 @@ from pattoo_shared.data import is_numeric
 
 from .constants import PATTOO_AGENT_OPCUAD, OPCUAauth
 from .configuration import ConfigOPCUA as Config
+from pattoo_agents.configuration import get_config
 
 
 def poll():
@@ -35,7 +36,7 @@ def poll():
 
     """
     # Initialize key variables.
-    config = Config()
+    config = get_config(Config)
     _pi = config.polling_interval()
 
     # Initialize AgentPolledData
@@ -3,13 +3,13 @@
 
 
 # Import project libraries
-from pattoo_shared import configuration, files
-from pattoo_shared.configuration import Config
+from pattoo_shared import configuration
+from pattoo_agents.configuration import AgentConfig
 from pattoo_shared.variables import TargetPollingPoints
 from .constants import PATTOO_AGENT_OPCUAD, OPCUAauth
 
 
-class ConfigOPCUA(Config):
+class ConfigOPCUA(AgentConfig):
     """Class gathers all configuration information."""
 
     def __init__(self):
@@ -23,12 +23,7 @@ class ConfigOPCUA(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration directory
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_OPCUAD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_OPCUAD)
 
     def polling_interval(self):
         """Get targets.
@@ -54,6 +49,21 @@ class ConfigOPCUA(Config):
         return result
 
     def target_polling_points(self):
+        """Get cached list polling target information in configuration file.
+
+        Args:
+            None
+
+        Returns:
+            result: List of TargetPollingPoints objects
+
+        """
+        # Get result
+        result = self._cached(
+            'target_polling_points', self._target_polling_points)
+        return result
+
+    def _target_polling_points(self):
         """Get list polling target information in configuration file.
 
         Args:
@@ -2,10 +2,15 @@
 """This is a test of flask."""
 
 # Pip packages
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 
 # Pattoo imports
+from pattoo_agents.os import cache
 from pattoo_agents.os import collector
+from pattoo_agents.os import encoding
+from pattoo_agents.os import precollector
+from pattoo_agents.os.configuration import ConfigSpoked
+from pattoo_agents.configuration import get_config
 from pattoo_shared import converter
 from .constants import (
     PATTOO_AGENT_OS_SPOKED_API_PREFIX, PATTOO_AGENT_OS_SPOKED)
@@ -27,8 +32,78 @@ def home(polling_interval):
         None
 
     """
-    # Process and present
-    agentdata = collector.poll(PATTOO_AGENT_OS_SPOKED, polling_interval)
+    # Initialize key variables
+    config = get_config(ConfigSpoked)
+    result = None
+
+    # Use the latest response collected in the background
+    if config.precollect() is True:
+        result = precollector.get(snapshot).response(
+            polling_interval)
+
+    # Reuse a recent response or wait for the one being created
+    if result is None:
+        result = cache.get(config.cache_ttl()).get(
+            polling_interval, lambda: _body(config, polling_interval))
+    (payload, age) = result
+
+    # Negotiate the representation
+    media_type = encoding.negotiate_media_type(request.headers.get('Accept'))
+    coding = encoding.negotiate_coding(request.headers.get('Accept-Encoding'))
+    etag = payload.etag(media_type, coding)
+
+    # Present
+    if encoding.matches(request.headers.get('If-None-Match'), etag) is True:
+        response = API.response_class(status=304)
+    else:
+        response = API.response_class(
+            payload.body(media_type, coding), mimetype=media_type)
+        if coding is not None:
+            response.headers['Content-Encoding'] = coding
+    response.headers['ETag'] = etag
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    response.headers['Age'] = str(int(age))
+    return response
+
+
+def _body(config, polling_interval):
+    """Get the data of a response.
+
+    Args:
+        config: ConfigSpoked object
+        polling_interval: Polling interval of the requester
+
+    Returns:
+        result: encoding.Payload
+
+    """
+    # Process
+    sampler = collector.sampling(
+        config.sampling_interval(), config.sampling_size(),
+        procfs=config.procfs())
+    tracker = collector.tracking(
+        config.top_processes(), cgroups=config.cgroups(),
+        limit=config.max_series())
+    agentdata = collector.poll(
+        PATTOO_AGENT_OS_SPOKED, polling_interval, procfs=config.procfs(),
+        sampler=sampler, rates=config.rates(), tracker=tracker)
     pdp = converter.agentdata_to_post(agentdata)
-    result = converter.posting_data_points(pdp)
-    return jsonify(result)
+    data = converter.posting_data_points(pdp)
+    result = encoding.Payload(data, jsonify(data).get_data())
+    return result
+
+
+def snapshot(polling_interval):
+    """Get the data of a response outside of a request.
+
+    Args:
+        polling_interval: Polling interval of the requesters
+
+    Returns:
+        result: encoding.Payload
+
+    """
+    # Process
+    with API.app_context():
+        result = _body(get_config(ConfigSpoked), polling_interval)
+    return result
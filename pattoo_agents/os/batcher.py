@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Pattoo library relaying the data of many spokes to the pattoo server.
+
+The pattoo server accepts the data of one agent per request, and each
+request from pattoo_shared uses a new connection. After a successful post,
+pattoo_shared also reads the whole cache directory to post data that
+previously failed. A hub relaying thousands of spokes therefore makes
+thousands of connections and cache directory scans per poll.
+
+A Batcher queues the data of spokes and posts it in batches bounded by
+size and time. Each batch is sent back to back over a single keep-alive
+connection, and the cache is purged at most once per batch. Whether the
+data of each spoke was accepted by the server is tracked.
+
+"""
+
+# Standard libraries
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+# pip3 libraries
+import requests
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_shared.configuration import Config
+
+# Default maximum number of payloads in a batch
+SIZE = 50
+
+# Default maximum seconds a payload waits for its batch to be posted
+WAIT = 1
+
+# Seconds to wait for the pattoo server to respond
+TIMEOUT = 20
+
+
+class Ack():
+    """Acknowledgement of the data of a spoke by the pattoo server."""
+
+    __slots__ = ('source', 'success', '_done')
+
+    def __init__(self, source):
+        """Initialize the class.
+
+        Args:
+            source: Source of the data, such as the URL of a spoke
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.source = source
+        self.success = None
+        self._done = threading.Event()
+
+    def set(self, success):
+        """Record the result of posting the data.
+
+        Args:
+            success: True if the server accepted the data
+
+        Returns:
+            None
+
+        """
+        # Set
+        self.success = bool(success)
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Wait for the data to be posted.
+
+        Args:
+            timeout: Seconds to wait. Wait forever if None
+
+        Returns:
+            result: True if the server accepted the data
+
+        """
+        # Return
+        self._done.wait(timeout)
+        return self.success is True
+
+
+class Batcher():
+    """Posts the data of spokes to the pattoo server in batches."""
+
+    def __init__(self, identifier, size=SIZE, wait=WAIT, timeout=TIMEOUT,
+                 session=None, clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            identifier: Unique identifier to use for posting data
+            size: Maximum number of payloads in a batch
+            wait: Maximum seconds a payload waits for its batch to be
+                posted
+            timeout: Seconds to wait for the pattoo server to respond
+            session: requests.Session used to post data
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        config = Config()
+        self.identifier = identifier
+        self.size = max(1, int(size))
+        self.wait = max(0, float(wait))
+        self.timeout = timeout
+        self.url = config.agent_api_server_url(identifier)
+        self._cache_dir = config.agent_cache_directory(identifier)
+        self._session = session or requests.Session()
+        self._clock = clock
+        self._counter = itertools.count()
+        self._posting = threading.Lock()
+
+        # State shared with the thread posting batches
+        self._condition = threading.Condition()
+        self._queue = []
+        self._oldest = None
+        self._acks = {}
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name='pattoo-batcher', daemon=True)
+        self._thread.start()
+
+    def add(self, source, data):
+        """Queue the data of a spoke for posting.
+
+        Args:
+            source: Source of the data, such as the URL of a spoke
+            data: dict of data to post
+
+        Returns:
+            result: Ack
+
+        """
+        # Queue
+        result = Ack(source)
+        with self._condition:
+            if bool(self._queue) is False:
+                self._oldest = self._clock()
+            self._queue.append((result, data))
+
+            # Start the timer of a new batch or post a full one
+            if len(self._queue) in [1, self.size]:
+                self._condition.notify()
+        return result
+
+    def acks(self):
+        """Get the result of the last post of each source.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of (success, time.time() value) tuples keyed by
+                source
+
+        """
+        # Return
+        with self._condition:
+            result = dict(self._acks)
+        return result
+
+    def flush(self):
+        """Post all queued data now.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Post
+        with self._condition:
+            batch = self._take()
+        self._post(batch)
+
+    def close(self):
+        """Post all queued data and stop.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop the thread, then post what is left
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        self._session.close()
+
+    def _take(self):
+        """Remove all payloads from the queue. The condition is held.
+
+        Args:
+            None
+
+        Returns:
+            result: List of (Ack, data) tuples
+
+        """
+        # Return
+        result = self._queue
+        self._queue = []
+        self._oldest = None
+        return result
+
+    def _run(self):
+        """Post batches until stopped."""
+        while True:
+            with self._condition:
+                while self._stopped is False:
+                    if len(self._queue) >= self.size:
+                        break
+                    if self._oldest is None:
+                        self._condition.wait()
+                        continue
+                    remaining = self._oldest + self.wait - self._clock()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped is True:
+                    return
+                batch = self._take()
+            self._post(batch)
+
+    def _post(self, batch):
+        """Post a batch of payloads.
+
+        Args:
+            batch: List of (Ack, data) tuples
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        posted = 0
+
+        with self._posting:
+            # Post each payload over the same connection
+            for ack, data in batch:
+                success = self._send(data)
+                if success is True:
+                    posted += 1
+                else:
+                    self._save(data)
+                ack.set(success)
+                with self._condition:
+                    self._acks[ack.source] = (success, time.time())
+
+            # Post data that previously failed now that the server is
+            # reachable
+            if bool(posted) is True:
+                self._purge()
+
+    def _send(self, data):
+        """Post a payload to the pattoo server.
+
+        Args:
+            data: dict of data to post
+
+        Returns:
+            success: True if successful
+
+        """
+        # Post
+        try:
+            response = self._session.post(
+                self.url, json=data, timeout=self.timeout)
+        except:
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = ('''\
+Error posting data for identifier "{}" to server {}: [{}, {}, {}]\
+'''.format(self.identifier, self.url, etype, evalue, etraceback))
+            log.log2warning(51580, log_message)
+            return False
+
+        # Return
+        if response.status_code != 200:
+            log_message = ('''\
+HTTP {} error for identifier "{}" posted to server {}\
+'''.format(response.status_code, self.identifier, self.url))
+            log.log2warning(51581, log_message)
+            return False
+        return True
+
+    def _save(self, data):
+        """Save a payload that couldn't be posted to the cache directory.
+
+        The file is named so that pattoo_shared can also purge it.
+
+        Args:
+            data: dict of data to save
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        filepath = os.path.join(self._cache_dir, '{}_{}_{}.json'.format(
+            int(time.time() * 1000), self.identifier, next(self._counter)))
+
+        # Save
+        try:
+            with open(filepath, 'w') as f_handle:
+                json.dump(data, f_handle)
+        except Exception as error:
+            log_message = ('''\
+Cache-file save error for identifier "{}": {}\
+'''.format(self.identifier, error))
+            log.log2warning(51582, log_message)
+            if os.path.isfile(filepath) is True:
+                os.remove(filepath)
+
+    def _purge(self):
+        """Post the payloads saved in the cache directory.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Get the cache files of the identifier
+        try:
+            filenames = sorted(
+                _ for _ in os.listdir(self._cache_dir)
+                if _.endswith('.json') and self.identifier in _)
+        except OSError:
+            return
+
+        # Post
+        for filename in filenames:
+            filepath = os.path.join(self._cache_dir, filename)
+            try:
+                with open(filepath, 'r') as f_handle:
+                    data = json.load(f_handle)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                log_message = ('''\
+Deleting corrupted cache file {} for identifier "{}"\
+'''.format(filepath, self.identifier))
+                log.log2warning(51583, log_message)
+                _remove(filepath)
+                continue
+            if self._send(data) is False:
+                break
+            _remove(filepath)
+
+
+def _remove(filepath):
+    """Delete a cache file that may already have been deleted.
+
+    Args:
+        filepath: Path of the file
+
+    Returns:
+        None
+
+    """
+    # Delete
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Pattoo library caching the responses of the spoked API.
+
+Several hubs, or a hub that retries, can poll the same spoke at almost the
+same time. Responses are kept for a few seconds so that each of them doesn't
+repeat all the collection work. Only one request collects data at a time
+for each key. Concurrent requests for the same key wait for its result
+instead of collecting the same data again.
+
+"""
+
+# Standard libraries
+import os
+import threading
+import time
+
+# Default maximum number of cached responses
+MAX_ENTRIES = 16
+
+# Cache objects used by each process
+_LOCK = threading.Lock()
+_CACHES = {}
+
+
+class _Flight():
+    """Value being created for concurrent callers."""
+
+    __slots__ = ('done', 'value', 'created', 'error')
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.done = threading.Event()
+        self.value = None
+        self.created = None
+        self.error = None
+
+
+class Cache():
+    """Time limited cache that creates each value only once at a time."""
+
+    def __init__(self, ttl, max_entries=MAX_ENTRIES, clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            ttl: Seconds for which values are reused. Values are only shared
+                by concurrent callers if zero.
+            max_entries: Maximum number of values kept
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.ttl = max(0, float(ttl))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values = {}
+        self._flights = {}
+
+    def __len__(self):
+        """Get the number of values cached."""
+        return len(self._values)
+
+    def get(self, key, function):
+        """Get a recent value or create it.
+
+        Args:
+            key: Key of the value
+            function: Function without arguments that creates the value
+
+        Returns:
+            result: Tuple of (value, age). The age is the number of seconds
+                since the value was created.
+
+        """
+        # Use a recent value or join the caller already creating it
+        with self._lock:
+            now = self._clock()
+            entry = self._values.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                return (entry[0], now - entry[1])
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader is True:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        # Wait for the value
+        if leader is False:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return (flight.value, max(0, self._clock() - flight.created))
+
+        # Create the value
+        try:
+            flight.value = function()
+            flight.created = self._clock()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.created is not None and bool(self.ttl) is True:
+                    self._store(key, flight.value, flight.created)
+            flight.done.set()
+        return (flight.value, 0)
+
+    def clear(self):
+        """Discard all cached values.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Clear
+        with self._lock:
+            self._values.clear()
+
+    def _store(self, key, value, created):
+        """Cache a value. The lock must be held.
+
+        Args:
+            key: Key of the value
+            value: Value
+            created: Clock value when the value was created
+
+        Returns:
+            None
+
+        """
+        # Discard expired values, then the oldest if still full
+        self._values.pop(key, None)
+        for item in [
+                _ for _, entry in self._values.items()
+                if created - entry[1] >= self.ttl]:
+            del self._values[item]
+        while len(self._values) >= self.max_entries:
+            oldest = min(self._values, key=lambda _: self._values[_][1])
+            del self._values[oldest]
+        self._values[key] = (value, created)
+
+
+def get(ttl):
+    """Get the Cache of the current process.
+
+    Args:
+        ttl: Seconds for which values are reused
+
+    Returns:
+        result: Cache
+
+    """
+    # Return
+    key = (os.getpid(), ttl)
+    with _LOCK:
+        result = _CACHES.get(key)
+        if result is None:
+            _CACHES.clear()
+            result = Cache(ttl)
+            _CACHES[key] = result
+    return result
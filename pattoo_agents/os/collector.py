@@ -2,10 +2,11 @@
 """Pattoo library collecting Linux data."""
 
 # Standard libraries
+import collections
 import os
-import re
 import platform
 import socket
+import threading
 
 # pip3 libraries
 import psutil
@@ -15,9 +16,24 @@ from pattoo_shared.variables import (
     DataPoint, DataPointMetadata, TargetDataPoints, AgentPolledData)
 from pattoo_shared.constants import (
     DATA_INT, DATA_COUNT64, DATA_FLOAT)
+from pattoo_agents.metadata import intern
+from pattoo_agents.os import mounts
+from pattoo_agents.os import procfs as _procfs
+from pattoo_agents.os import rates as _rates
+from pattoo_agents.os import sampler as _sampler
+from pattoo_agents.os import workloads as _workloads
 
+# Define namedtuple types
+HostFacts = collections.namedtuple('HostFacts', 'hostname metadata')
 
-def poll(agent_program, polling_interval):
+# Values shared by all polls in the process
+_LOCK = threading.Lock()
+_FACTS = {}
+_CPU_TIMES = {}
+
+
+def poll(agent_program, polling_interval, procfs=False, sampler=None,
+         rates=False, tracker=None):
     """Get all agent data.
 
     Performance data on linux server on which this application is installed.
@@ -25,23 +41,31 @@ def poll(agent_program, polling_interval):
     Args:
         agentdata: AgentPolledData object for all data gathered by the agent
         polling_interval: Polling interval in seconds
+        procfs: Read data directly from /proc where possible if True
+        sampler: Sampler whose aggregates over the polling interval are
+            added to the data
+        rates: Add the per-second rates of counters to the data if True
+        tracker: Tracker whose top processes and cgroups are added to the
+            data
 
     Returns:
         None
 
     """
     # Initialize AgentPolledData
-    agent_hostname = socket.getfqdn()
+    facts = host_facts()
     agentdata = AgentPolledData(agent_program, polling_interval)
 
     # Intialize data gathering
-    ddv = TargetDataPoints(agent_hostname)
+    ddv = TargetDataPoints(facts.hostname)
 
     #########################################################################
     # Get timeseries values
     #########################################################################
 
-    performance = Performance()
+    performance = Performance(
+        facts=facts, procfs=procfs,
+        rates=_rates.get() if bool(rates) is True else None)
 
     # Update agent with system data
     ddv.add(performance.stats_system())
@@ -54,6 +78,14 @@ def poll(agent_program, polling_interval):
     # Update agent with network data
     ddv.add(performance.stats_network())
 
+    # Update agent with data sampled since the last poll
+    if sampler is not None:
+        ddv.add(sampler.datapoints(polling_interval))
+
+    # Update agent with the processes and cgroups using the most resources
+    if tracker is not None:
+        ddv.add(tracker.datapoints(metadata=facts.metadata))
+
     # Add results to the AgentPolledData object for posting
     agentdata.add(ddv)
     return agentdata
@@ -62,47 +94,44 @@ def poll(agent_program, polling_interval):
 class Performance():
     """Operating system performance."""
 
-    def __init__(self):
+    def __init__(self, facts=None, procfs=False, excluded_fstypes=None,
+                 rates=None):
         """Initialize the class.
 
         Args:
-            key: Metadata key
-            value: Metadata value
+            facts: HostFacts to use. The cached values are used if None.
+            procfs: Read data directly from /proc instead of using psutil
+                if True and /proc is available
+            excluded_fstypes: Filesystem types of disk partitions that are
+                not reported. mounts.EXCLUDED_FSTYPES is used if None.
+            rates: Rates object used to add the per-second rates of
+                counters. No rates are added if None.
 
         Returns:
             None
 
         """
-        #######################################################################
-        # Set non timeseries values
-        #######################################################################
-        self.metadata = []
-
-        # OS release (kernel)
-        self.metadata.append(
-            DataPointMetadata(
-                'release', platform.release(), update_checksum=False))
-
-        # OS version
-        self.metadata.append(
-            DataPointMetadata(
-                'version', platform.version(), update_checksum=False))
-
-        # Operating sytem type (Linux / Windows)
-        self.metadata.append(
-            DataPointMetadata('processor', platform.processor()))
-
-        # Operating sytem type (Linux / Windows)
-        self.metadata.append(
-            DataPointMetadata('type', platform.system()))
-
-        # CPU count
-        self.metadata.append(
-            DataPointMetadata('cpus', psutil.cpu_count()))
-
-        # System name
-        self.metadata.append(
-            DataPointMetadata('hostname', socket.getfqdn()))
+        # Get the static host facts
+        if facts is None:
+            facts = host_facts()
+        self.hostname = facts.hostname
+        self.metadata = facts.metadata
+
+        # Rates of counters
+        self._rates = rates
+
+        # Disk partitions to skip
+        if excluded_fstypes is None:
+            self._excluded_fstypes = mounts.EXCLUDED_FSTYPES
+        else:
+            self._excluded_fstypes = frozenset(
+                str(_).lower() for _ in excluded_fstypes)
+
+        # Use the /proc fast path if possible
+        if bool(procfs) is True and _procfs_available() is True:
+            self._reader = _procfs.reader()
+        else:
+            self._reader = None
 
     def stats_system(self):
         """Update agent with system data.
@@ -114,76 +143,99 @@ class Performance():
             result: List of DataPoint objects
 
         """
+        # Get the data
+        if self._reader is None:
+            process_count = len(psutil.pids())
+            cpu_times = psutil.cpu_times()
+            cpu_stats = psutil.cpu_stats()
+            virtual_memory = psutil.virtual_memory()
+        else:
+            process_count = self._reader.process_count()
+            (cpu_times, cpu_stats) = self._reader.stat()
+            virtual_memory = self._reader.virtual_memory()
+
         #######################################################################
         # Set timeseries values (Integers)
         #######################################################################
         result = []
 
         result.append(
-            DataPoint(
+            _datapoint(
                 'process_count',
-                len(psutil.pids()),
-                data_type=DATA_INT).add(self.metadata))
+                process_count,
+                data_type=DATA_INT,
+                metadata=[self.metadata]))
 
         # Load averages
         (la_01, la_05, la_15) = os.getloadavg()
 
         result.append(
-            DataPoint(
+            _datapoint(
                 'load_average_01min',
                 la_01,
-                data_type=DATA_INT).add(self.metadata))
+                data_type=DATA_INT,
+                metadata=[self.metadata]))
 
         result.append(
-            DataPoint(
+            _datapoint(
                 'load_average_05min',
                 la_05,
-                data_type=DATA_INT).add(self.metadata))
+                data_type=DATA_INT,
+                metadata=[self.metadata]))
 
         result.append(
-            DataPoint(
+            _datapoint(
                 'load_average_15min',
                 la_15,
-                data_type=DATA_INT).add(self.metadata))
+                data_type=DATA_INT,
+                metadata=[self.metadata]))
 
         #######################################################################
         # Set timeseries values (Floats)
         #######################################################################
 
         result.append(
-            DataPoint(
+            _datapoint(
                 'cpu_frequency',
                 psutil.cpu_freq().current,
-                data_type=DATA_FLOAT).add(self.metadata))
+                data_type=DATA_FLOAT,
+                metadata=[self.metadata]))
 
         #######################################################################
         # Set timeseries values (Named Tuples)
         #######################################################################
 
-        # Percentage CPU utilization
+        # Percentage CPU utilization. Calculated from the same sample as the
+        # CPU runtimes so that /proc/stat is read only once.
         result.extend(_named_tuple_to_dv(
-            psutil.cpu_times_percent(),
+            _cpu_times_percent(cpu_times),
             'cpu_times_percent',
             data_type=DATA_FLOAT,
             metadata=self.metadata))
 
         # Get CPU runtimes
         result.extend(_named_tuple_to_dv(
-            psutil.cpu_times(),
+            cpu_times,
             'cpu_times',
             data_type=DATA_COUNT64,
             metadata=self.metadata))
 
         # Get CPU stats
         result.extend(_named_tuple_to_dv(
-            psutil.cpu_stats(),
+            cpu_stats,
             'cpu_stats',
             data_type=DATA_COUNT64,
             metadata=self.metadata))
 
+        # Get CPU runtime and stats rates
+        for label, counters in [
+                ('cpu_times', cpu_times), ('cpu_stats', cpu_stats)]:
+            result.extend(self._rates_to_dv(
+                label, None, counters, metadata=[self.metadata]))
+
         # Get memory utilization
         result.extend(_named_tuple_to_dv(
-            psutil.virtual_memory(),
+            virtual_memory,
             'memory',
             data_type=DATA_INT,
             metadata=self.metadata))
@@ -215,9 +267,10 @@ class Performance():
 
             # No need to specify a suffix as there is only one swap
             new_key = '{}_{}'.format('swap_memory', key)
-            _dv = DataPoint(new_key, value, data_type=data_type)
-            _dv.add(self.metadata)
-            result.append(_dv)
+            result.append(
+                _datapoint(
+                    new_key, value, data_type=data_type,
+                    metadata=[self.metadata]))
 
         # Add the result to data
         return result
@@ -235,38 +288,26 @@ class Performance():
         # Initialize key variables
         result = []
 
-        # Get filesystem partition utilization
-        items = psutil.disk_partitions()
-        # "items" is a list of named tuples describing partitions
-        for item in items:
-            # "source" is the partition mount point
-            mountpoint = item.mountpoint
-            if "docker" not in str(mountpoint):
-                # Add more metadata
-                meta = []
-                meta.append(DataPointMetadata(
-                    '{}_device'.format('disk_partition'),
-                    item.device))
-                meta.append(DataPointMetadata(
-                    '{}_mountpoint'.format('disk_partition'),
-                    item.mountpoint))
-                meta.append(DataPointMetadata(
-                    '{}_fstype'.format('disk_partition'),
-                    item.fstype))
-                meta.append(DataPointMetadata(
-                    '{}_opts'.format('disk_partition'),
-                    item.opts))
-
-                # Get the partition data
-                partition = psutil.disk_usage(mountpoint)._asdict()
-                for key, value in partition.items():
-                    _dv = DataPoint(
-                        '{}_disk_usage_{}'.format(
-                            'disk_partition', key),
-                        value, data_type=DATA_INT)
-                    _dv.add(meta)
-                    _dv.add(self.metadata)
-                    result.append(_dv)
+        # Get filesystem partition utilization. Hung mounts are skipped.
+        items = mounts.disk_usage(
+            psutil.disk_partitions(), fstypes=self._excluded_fstypes)
+        # "items" is a list of partition and usage named tuples
+        for item, usage in items:
+            # Add more metadata
+            meta = intern([
+                ('{}_device'.format('disk_partition'), item.device),
+                ('{}_mountpoint'.format('disk_partition'), item.mountpoint),
+                ('{}_fstype'.format('disk_partition'), item.fstype),
+                ('{}_opts'.format('disk_partition'), item.opts)])
+
+            # Get the partition data
+            partition = usage._asdict()
+            for key, value in partition.items():
+                result.append(
+                    _datapoint(
+                        '{}_disk_usage_{}'.format('disk_partition', key),
+                        value, data_type=DATA_INT,
+                        metadata=[meta, self.metadata]))
 
         # Add the result to data
         return result
@@ -282,29 +323,38 @@ class Performance():
 
         """
         # Initialize key variables
-        regex = re.compile(r'^ram\d+$')
         result = []
 
         # Get disk I/O usage
-        ioddv = psutil.disk_io_counters(perdisk=True)
+        if self._reader is None:
+            ioddv = psutil.disk_io_counters(perdisk=True)
+        else:
+            ioddv = self._reader.disk_io_counters()
 
         # "source" is disk name
         for disk, disk_named_tuple in ioddv.items():
-            # No RAM pseudo disks. RAM disks OK.
-            if bool(regex.match(disk)) is True:
-                continue
-            # No loopbacks
-            if disk.startswith('loop') is True:
+            # No RAM pseudo disks or loopbacks. RAM disks OK.
+            if mounts.pseudo_disk(disk) is True:
                 continue
 
             # Populate data
+            meta = intern([('disk_partition', disk)])
             disk_dict = disk_named_tuple._asdict()
             for key, value in disk_dict.items():
                 new_key = '{}_{}'.format('disk_io', key)
-                _dv = DataPoint(new_key, value, data_type=DATA_COUNT64)
-                _dv.add(self.metadata)
-                _dv.add(DataPointMetadata('disk_partition', disk))
-                result.append(_dv)
+                result.append(
+                    _datapoint(
+                        new_key, value, data_type=DATA_COUNT64,
+                        metadata=[self.metadata, meta]))
+
+            # Populate rates
+            result.extend(self._rates_to_dv(
+                'disk_io', disk, disk_named_tuple,
+                metadata=[self.metadata, meta]))
+
+        # Forget the counters of removed disks
+        if self._rates is not None:
+            self._rates.purge('disk_io', ioddv)
 
         # Add the result to data
         return result
@@ -323,23 +373,244 @@ class Performance():
         result = []
 
         # Get network utilization
-        nicddv = psutil.net_io_counters(pernic=True)
+        if self._reader is None:
+            nicddv = psutil.net_io_counters(pernic=True)
+        else:
+            nicddv = self._reader.net_io_counters()
         for nic, nic_named_tuple in nicddv.items():
+            meta = intern([('{}_interface'.format('network_io'), nic)])
             nic_dict = nic_named_tuple._asdict()
             for key, value in nic_dict.items():
-                _dv = DataPoint(
-                    '{}_{}'.format('network_io', key),
-                    value,
-                    data_type=DATA_COUNT64)
-                _dv.add(self.metadata)
-                _dv.add(DataPointMetadata(
-                    '{}_interface'.format('network_io'),
-                    nic))
-                result.append(_dv)
+                result.append(
+                    _datapoint(
+                        '{}_{}'.format('network_io', key),
+                        value,
+                        data_type=DATA_COUNT64,
+                        metadata=[self.metadata, meta]))
+
+            # Populate rates
+            result.extend(self._rates_to_dv(
+                'network_io', nic, nic_named_tuple,
+                metadata=[self.metadata, meta]))
+
+        # Forget the counters of removed interfaces
+        if self._rates is not None:
+            self._rates.purge('network_io', nicddv)
 
         # Add the result to data
         return result
 
+    def _rates_to_dv(self, label, name, counters, metadata=None):
+        """Convert the rates of a named tuple of counters to DataPoints.
+
+        Args:
+            label: Label used as the prefix of the DataPoint keys
+            name: Name of the counters within the label, such as a disk
+            counters: Named tuple of counters
+            metadata: List of MetadataSet objects to add to each DataPoint
+
+        Returns:
+            result: List of DataPoint
+
+        """
+        # Initialize key variables
+        result = []
+        if self._rates is None:
+            return result
+
+        # Create DataPoints
+        rates = self._rates.rates(label, name, counters)
+        for key, value in rates.items():
+            result.append(
+                _datapoint(
+                    '{}_{}_per_second'.format(label, key),
+                    value,
+                    data_type=DATA_FLOAT,
+                    metadata=metadata))
+        return result
+
+
+def host_facts():
+    """Get the static facts about the host.
+
+    The facts are gathered only once per process as some, like the fully
+    qualified domain name, can block on DNS lookups. Use
+    refresh_host_facts() to gather them again.
+
+    Args:
+        None
+
+    Returns:
+        result: HostFacts
+
+    """
+    # Return cached facts
+    with _LOCK:
+        result = _FACTS.get('facts')
+        if result is None:
+            result = _host_facts()
+            _FACTS['facts'] = result
+    return result
+
+
+def refresh_host_facts():
+    """Gather the static facts about the host on the next poll.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Discard the cached facts
+    with _LOCK:
+        _FACTS.clear()
+
+
+def sampling(interval, size, procfs=False):
+    """Get the Sampler of the process.
+
+    Args:
+        interval: Seconds between samples. Sampling is disabled if zero
+        size: Number of samples kept for each value
+        procfs: Read data directly from /proc if True and available
+
+    Returns:
+        result: Running Sampler. None if sampling is disabled
+
+    """
+    # Return
+    if bool(interval) is False:
+        return None
+    result = _sampler.get(
+        interval, size, procfs=procfs, metadata=host_facts().metadata)
+    return result
+
+
+def tracking(top, cgroups=False, limit=200):
+    """Get the Tracker of the process.
+
+    Args:
+        top: Number of process names and cgroups reported for each of CPU,
+            memory and I/O usage. Tracking is disabled if zero
+        cgroups: Report cgroup usage if True
+        limit: Maximum number of DataPoints created each poll
+
+    Returns:
+        result: Tracker. None if tracking is disabled
+
+    """
+    # Return
+    if bool(top) is False:
+        return None
+    result = _workloads.get(top, cgroups=cgroups, limit=limit)
+    return result
+
+
+def _host_facts():
+    """Gather the static facts about the host.
+
+    Args:
+        None
+
+    Returns:
+        result: HostFacts
+
+    """
+    #######################################################################
+    # Set non timeseries values
+    #######################################################################
+    metadata = []
+    hostname = socket.getfqdn()
+
+    # OS release (kernel)
+    metadata.append(
+        DataPointMetadata(
+            'release', platform.release(), update_checksum=False))
+
+    # OS version
+    metadata.append(
+        DataPointMetadata(
+            'version', platform.version(), update_checksum=False))
+
+    # Operating sytem type (Linux / Windows)
+    metadata.append(
+        DataPointMetadata('processor', platform.processor()))
+
+    # Operating sytem type (Linux / Windows)
+    metadata.append(
+        DataPointMetadata('type', platform.system()))
+
+    # CPU count
+    metadata.append(
+        DataPointMetadata('cpus', psutil.cpu_count()))
+
+    # System name
+    metadata.append(
+        DataPointMetadata('hostname', hostname))
+
+    # Share the metadata between all datapoints
+    result = HostFacts(hostname=hostname, metadata=intern(metadata))
+    return result
+
+
+def _procfs_available():
+    """Determine whether the /proc fast path can be used.
+
+    Args:
+        None
+
+    Returns:
+        result: True if available
+
+    """
+    # Check only once per process
+    with _LOCK:
+        result = _FACTS.get('procfs')
+        if result is None:
+            result = _procfs.available()
+            _FACTS['procfs'] = result
+    return result
+
+
+def _cpu_times_percent(cpu_times):
+    """Get CPU utilization percentages since the previous CPU times sample.
+
+    This gives the same results as psutil.cpu_times_percent() without
+    reading the CPU times again. The previous sample is shared by all
+    threads.
+
+    Args:
+        cpu_times: Named tuple returned by psutil.cpu_times()
+
+    Returns:
+        result: Named tuple of percentages with the fields of cpu_times
+
+    """
+    # Get the previous sample
+    with _LOCK:
+        previous = _CPU_TIMES.get('cpu_times', cpu_times)
+        _CPU_TIMES['cpu_times'] = cpu_times
+    if previous._fields != cpu_times._fields:
+        previous = cpu_times
+
+    # Guest times are already accounted for in user and nice times on Linux
+    deltas = [
+        max(0, now - then) for now, then in zip(cpu_times, previous)]
+    total = sum(deltas)
+    for field in ['guest', 'guest_nice']:
+        if field in cpu_times._fields:
+            total -= deltas[cpu_times._fields.index(field)]
+
+    # Calculate. There is nothing to report if no time passed
+    if total <= 0:
+        return cpu_times.__class__(*[0.0] * len(deltas))
+    scale = 100.0 / total
+    result = cpu_times.__class__(
+        *[min(max(0.0, round(delta * scale, 1)), 100.0) for delta in deltas])
+    return result
+
 
 def _named_tuple_to_dv(
         values, parameter_label, data_type=DATA_INT, metadata=None):
@@ -349,6 +620,7 @@ def _named_tuple_to_dv(
         values: Named tuple
         parameter_label: parameter_label
         data_type: Data type
+        metadata: MetadataSet to add to each DataPoint
 
     Returns:
         result: List of DataPoint
@@ -360,12 +632,36 @@ def _named_tuple_to_dv(
 
     # Cycle through results
     for key, value in data_dict.items():
-        _dv = DataPoint(
-            '{}_{}'.format(parameter_label, key),
-            value,
-            data_type=data_type)
-        _dv.add(metadata)
-        result.append(_dv)
+        result.append(
+            _datapoint(
+                '{}_{}'.format(parameter_label, key),
+                value,
+                data_type=data_type,
+                metadata=[metadata]))
 
     # Return
     return result
+
+
+def _datapoint(key, value, data_type=DATA_INT, metadata=None):
+    """Create a DataPoint with metadata.
+
+    Args:
+        key: Key related to data value
+        value: Data value
+        data_type: Data type
+        metadata: List of MetadataSet objects to add to the DataPoint
+
+    Returns:
+        result: DataPoint
+
+    """
+    # Create the DataPoint
+    result = DataPoint(key, value, data_type=data_type)
+
+    # Add metadata
+    if bool(metadata) is True:
+        for item in metadata:
+            if item is not None:
+                item.add_to(result)
+    return result
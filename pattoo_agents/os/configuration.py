@@ -2,14 +2,14 @@
 """Pattoo classes that manage various configurations."""
 
 # Import project libraries
-from pattoo_shared import configuration
-from pattoo_shared.configuration import Config
-from pattoo_shared import files
+from pattoo_shared import configuration, files
+from pattoo_agents.configuration import AgentConfig
 from .constants import (
-    PATTOO_AGENT_OS_SPOKED, PATTOO_AGENT_OS_HUBD, PATTOO_AGENT_OS_AUTONOMOUSD)
+    PATTOO_AGENT_OS_SPOKED, PATTOO_AGENT_OS_HUBD, PATTOO_AGENT_OS_AUTONOMOUSD,
+    PATTOO_AGENT_OS_SPOKED_API_PREFIX)
 
 
-class ConfigSpoked(Config):
+class ConfigSpoked(AgentConfig):
     """Class gathers all configuration information.
 
     Only processes the following YAML keys in the configuration file:
@@ -29,12 +29,7 @@ class ConfigSpoked(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_OS_SPOKED)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_OS_SPOKED)
 
     def ip_listen_address(self):
         """Get ip_listen_address.
@@ -80,8 +75,254 @@ class ConfigSpoked(Config):
             result = int(intermediate)
         return result
 
+    def procfs(self):
+        """Get procfs.
+
+        Args:
+            None
+
+        Returns:
+            result: True if data should be read directly from /proc
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'procfs'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def sampling_interval(self):
+        """Get sampling_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds between samples taken between polls. Sampling
+                is disabled if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'sampling_interval'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(float(intermediate))
+        return result
+
+    def sampling_size(self):
+        """Get sampling_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of samples kept for each value
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'sampling_size'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 300
+        if bool(intermediate) is False:
+            result = 300
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def rates(self):
+        """Get rates.
+
+        Args:
+            None
+
+        Returns:
+            result: True if the per-second rates of counters are reported
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'rates'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def cache_ttl(self):
+        """Get cache_ttl.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds for which API responses are reused. Responses
+                are only shared by concurrent requests if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'cache_ttl'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(float(intermediate))
+        return result
+
+    def precollect(self):
+        """Get precollect.
+
+        Args:
+            None
+
+        Returns:
+            result: True if API responses are collected in the background
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'precollect'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def top_processes(self):
+        """Get top_processes.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of process names and cgroups reported for each
+                of CPU, memory and I/O usage. Disabled if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'top_processes'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def cgroups(self):
+        """Get cgroups.
+
+        Args:
+            None
+
+        Returns:
+            result: True if the usage of cgroups is reported
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'cgroups'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def max_series(self):
+        """Get max_series.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of process and cgroup DataPoints reported
+                each poll
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'max_series'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 200
+        if bool(intermediate) is False:
+            result = 200
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def push_url(self):
+        """Get push_url.
+
+        Args:
+            None
+
+        Returns:
+            result: URL of the hub ingest endpoint to push data to. None if
+                data is only polled by hubs
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'push_url'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to None
+        if bool(intermediate) is False:
+            result = None
+        else:
+            result = str(intermediate)
+        return result
+
+    def push_interval(self):
+        """Get push_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds between pushes of data to the hub
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_SPOKED
+        sub_key = 'push_interval'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 300
+        if bool(intermediate) is False:
+            result = 300
+        else:
+            result = abs(int(intermediate))
+        return result
+
 
-class ConfigHubd(Config):
+class ConfigHubd(AgentConfig):
     """Class for PATTOO_AGENT_OS_HUBD configuration information.
 
     Only processes the following YAML keys in the configuration file:
@@ -101,12 +342,7 @@ class ConfigHubd(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_OS_HUBD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_OS_HUBD)
 
     def ip_targets(self):
         """Get targets.
@@ -125,6 +361,65 @@ class ConfigHubd(Config):
             key, sub_key, self._agent_config, die=True)
         return result
 
+    def agent_id(self):
+        """Get the cached agent ID used to post spoke data.
+
+        Args:
+            None
+
+        Returns:
+            result: Agent ID
+
+        """
+        # Get result
+        result = self._cached(
+            'agent_id', lambda: files.get_agent_id(PATTOO_AGENT_OS_HUBD, self))
+        return result
+
+    def spoke_urls(self):
+        """Get the cached URLs of the spokes to poll.
+
+        Args:
+            None
+
+        Returns:
+            result: List of spoke URLs
+
+        """
+        # Get result
+        result = self._cached('spoke_urls', self._spoke_urls)
+        return result
+
+    def _spoke_urls(self):
+        """Get the URLs of the spokes to poll.
+
+        Args:
+            None
+
+        Returns:
+            result: List of spoke URLs
+
+        """
+        # Initialize key variables
+        result = []
+        polling_interval = self.polling_interval()
+
+        # Create list of spoke URLs
+        for ip_target in self.ip_targets():
+            # Test
+            if isinstance(ip_target, dict) is False:
+                continue
+            if 'ip_address' not in ip_target:
+                continue
+            if 'ip_bind_port' not in ip_target:
+                continue
+
+            # Append URL
+            result.append(_spoked_url(
+                ip_target['ip_address'], ip_target['ip_bind_port'],
+                polling_interval))
+        return result
+
     def polling_interval(self):
         """Get targets.
 
@@ -148,8 +443,192 @@ class ConfigHubd(Config):
             result = abs(int(intermediate))
         return result
 
+    def concurrency(self):
+        """Get concurrency.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of spokes polled at the same time
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'concurrency'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 100
+        if bool(intermediate) is False:
+            result = 100
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def timeout(self):
+        """Get timeout.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds to wait for the response of each spoke
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'timeout'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 10
+        if bool(intermediate) is False:
+            result = 10
+        else:
+            result = abs(float(intermediate))
+        return result
+
+    def batch_size(self):
+        """Get batch_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of spoke payloads posted to the pattoo
+                server in each batch. Payloads are posted separately if
+                zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'batch_size'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def batch_wait(self):
+        """Get batch_wait.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum seconds a spoke payload waits for its batch to be
+                posted
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'batch_wait'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 1
+        if intermediate is None:
+            result = 1
+        else:
+            result = abs(float(intermediate))
+        return result
+
+    def msgpack(self):
+        """Get msgpack.
+
+        Args:
+            None
+
+        Returns:
+            result: True if spokes are asked for msgpack instead of JSON
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'msgpack'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def max_backoff(self):
+        """Get max_backoff.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of consecutive polls a failing spoke is
+                skipped. Failing spokes are never skipped if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'max_backoff'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 16
+        if intermediate is None:
+            result = 16
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def ingest_ip_listen_address(self):
+        """Get ingest_ip_listen_address.
+
+        Args:
+            None
+
+        Returns:
+            result: IP address on which to receive data pushed by spokes
 
-class ConfigAutonomousd(Config):
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'ingest_ip_listen_address'
+        result = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0.0.0.0
+        if result is None:
+            result = '0.0.0.0'
+        return result
+
+    def ingest_ip_bind_port(self):
+        """Get ingest_ip_bind_port.
+
+        Args:
+            None
+
+        Returns:
+            result: TCP port on which to receive data pushed by spokes. Data
+                isn't received if zero
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_HUBD
+        sub_key = 'ingest_ip_bind_port'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if intermediate is None:
+            result = 0
+        else:
+            result = int(intermediate)
+        return result
+
+
+class ConfigAutonomousd(AgentConfig):
     """Class for PATTOO_AGENT_OS_AUTONOMOUSD configuration information.
 
     Only processes the following YAML keys in the configuration file:
@@ -169,12 +648,7 @@ class ConfigAutonomousd(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_OS_AUTONOMOUSD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_OS_AUTONOMOUSD)
 
     def polling_interval(self):
         """Get targets.
@@ -198,3 +672,182 @@ class ConfigAutonomousd(Config):
         else:
             result = abs(int(intermediate))
         return result
+
+    def procfs(self):
+        """Get procfs.
+
+        Args:
+            None
+
+        Returns:
+            result: True if data should be read directly from /proc
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'procfs'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def sampling_interval(self):
+        """Get sampling_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds between samples taken between polls. Sampling
+                is disabled if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'sampling_interval'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(float(intermediate))
+        return result
+
+    def sampling_size(self):
+        """Get sampling_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of samples kept for each value
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'sampling_size'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 300
+        if bool(intermediate) is False:
+            result = 300
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def rates(self):
+        """Get rates.
+
+        Args:
+            None
+
+        Returns:
+            result: True if the per-second rates of counters are reported
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'rates'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def top_processes(self):
+        """Get top_processes.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of process names and cgroups reported for each
+                of CPU, memory and I/O usage. Disabled if zero.
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'top_processes'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 0
+        if bool(intermediate) is False:
+            result = 0
+        else:
+            result = abs(int(intermediate))
+        return result
+
+    def cgroups(self):
+        """Get cgroups.
+
+        Args:
+            None
+
+        Returns:
+            result: True if the usage of cgroups is reported
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'cgroups'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to False
+        result = bool(intermediate)
+        return result
+
+    def max_series(self):
+        """Get max_series.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of process and cgroup DataPoints reported
+                each poll
+
+        """
+        # Get result
+        key = PATTOO_AGENT_OS_AUTONOMOUSD
+        sub_key = 'max_series'
+        intermediate = configuration.search(
+            key, sub_key, self._agent_config, die=False)
+
+        # Default to 200
+        if bool(intermediate) is False:
+            result = 200
+        else:
+            result = abs(int(intermediate))
+        return result
+
+
+def _spoked_url(ip_target, ip_bind_port, polling_interval):
+    """Get the URL of a spoke.
+
+    Args:
+        ip_target: IP target to poll for data
+        ip_bind_port: TCP listening port
+        polling_interval: Polling interval of the hub
+
+    Returns:
+        url: URL of spoke
+
+    """
+    # Initialize key variables
+    hostname = ip_target
+    if ':' in ip_target:
+        hostname = '[{}]'.format(hostname)
+
+    # Return
+    url = ('http://{}:{}{}/{}'.format(
+        hostname, ip_bind_port, PATTOO_AGENT_OS_SPOKED_API_PREFIX,
+        polling_interval))
+    return url
@@ -6,3 +6,5 @@ PATTOO_AGENT_OS_SPOKED = 'pattoo_agent_os_spoked'
 PATTOO_AGENT_OS_SPOKED_PROXY = '{}-gunicorn'.format(PATTOO_AGENT_OS_SPOKED)
 PATTOO_AGENT_OS_AUTONOMOUSD = 'pattoo_agent_os_autonomousd'
 PATTOO_AGENT_OS_HUBD = 'pattoo_agent_os_hubd'
+PATTOO_AGENT_OS_HUBD_PUSH_URI = '{}/push'.format(
+    PATTOO_AGENT_OS_SPOKED_API_PREFIX)
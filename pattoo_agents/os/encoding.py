@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Pattoo library encoding the data exchanged by the OS spoke and hub.
+
+Responses of the spoked API can be compressed with gzip or deflate, and
+encoded with msgpack instead of JSON when the optional msgpack package is
+installed. Each representation has its own ETag so that a hub can ask the
+spoke to only send data that has changed.
+
+"""
+
+# Standard libraries
+import gzip
+import hashlib
+import json
+import threading
+import zlib
+
+# pip3 libraries
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Media types
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+
+# Content codings in order of preference
+CODINGS = ('gzip', 'deflate')
+
+# Compression level
+LEVEL = 6
+
+
+class Payload():
+    """Response of the spoked API in all of its representations.
+
+    Representations are only created when they are first requested, then
+    reused for every request that gets the same Payload.
+
+    """
+
+    def __init__(self, data, body):
+        """Initialize the class.
+
+        Args:
+            data: Data as a dict
+            body: Data encoded as JSON bytes
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.data = data
+        self.digest = hashlib.sha1(body).hexdigest()
+        self._lock = threading.RLock()
+        self._bodies = {(JSON, None): body}
+
+    def body(self, media_type=JSON, coding=None):
+        """Get the body of a representation.
+
+        Args:
+            media_type: JSON or MSGPACK
+            coding: Content coding in CODINGS. None if not compressed
+
+        Returns:
+            result: Bytes
+
+        """
+        # Return the representation if it already exists
+        key = (media_type, coding)
+        result = self._bodies.get(key)
+        if result is not None:
+            return result
+
+        # Create
+        with self._lock:
+            result = self._bodies.get(key)
+            if result is None:
+                if coding is None:
+                    result = msgpack.packb(self.data, use_bin_type=True)
+                else:
+                    result = compress(self.body(media_type), coding)
+                self._bodies[key] = result
+        return result
+
+    def etag(self, media_type=JSON, coding=None):
+        """Get the ETag of a representation.
+
+        Args:
+            media_type: JSON or MSGPACK
+            coding: Content coding in CODINGS. None if not compressed
+
+        Returns:
+            result: Quoted ETag
+
+        """
+        # Return
+        suffixes = [
+            _ for _ in [
+                'msgpack' if media_type == MSGPACK else None, coding]
+            if _ is not None]
+        result = '"{}"'.format('-'.join([self.digest] + suffixes))
+        return result
+
+
+def compress(body, coding):
+    """Compress bytes.
+
+    Args:
+        body: Bytes
+        coding: Content coding in CODINGS
+
+    Returns:
+        result: Compressed bytes
+
+    """
+    # Return
+    if coding == 'gzip':
+        return gzip.compress(body, LEVEL)
+    return zlib.compress(body, LEVEL)
+
+
+def decompress(body, coding=None, limit=None):
+    """Decompress bytes, stopping once they exceed a size.
+
+    The size is bounded so that small bodies that decompress to huge ones
+    can't exhaust memory.
+
+    Args:
+        body: Bytes
+        coding: Content-Encoding of the bytes
+        limit: Maximum size of the decompressed bytes. Unbounded if None
+
+    Returns:
+        result: Decompressed bytes. None if larger than the limit
+
+    """
+    # Initialize key variables
+    coding = (coding or '').strip().lower()
+    if coding in ['gzip', 'x-gzip']:
+        wbits = 16 + zlib.MAX_WBITS
+    elif coding == 'deflate':
+        wbits = zlib.MAX_WBITS
+    else:
+        wbits = None
+
+    # Decompress
+    result = body
+    if wbits is not None:
+        decompressor = zlib.decompressobj(wbits)
+        result = decompressor.decompress(
+            body, 0 if limit is None else limit + 1)
+
+    # Return
+    if limit is not None and len(result) > limit:
+        return None
+    if wbits is not None and decompressor.eof is False:
+        raise zlib.error('Incomplete or truncated stream')
+    return result
+
+
+def decode(body, media_type=JSON, coding=None):
+    """Decode the body of a spoked API response.
+
+    Args:
+        body: Bytes
+        media_type: Content-Type of the response
+        coding: Content-Encoding of the response
+
+    Returns:
+        result: Data as a dict
+
+    """
+    # Decompress
+    body = decompress(body, coding=coding)
+
+    # Decode
+    if (media_type or '').split(';')[0].strip().lower() == MSGPACK:
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body.decode())
+
+
+def negotiate_coding(accept_encoding):
+    """Get the content coding to use for a request.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+
+    Returns:
+        result: Content coding in CODINGS. None if not compressed
+
+    """
+    # Return
+    accepted = _accepted(accept_encoding)
+    for coding in CODINGS:
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def negotiate_media_type(accept):
+    """Get the media type to use for a request.
+
+    Args:
+        accept: Value of the Accept header
+
+    Returns:
+        result: MSGPACK if accepted and msgpack is installed, otherwise JSON
+
+    """
+    # Return
+    if msgpack is not None and _accepted(accept).get(MSGPACK, 0) > 0:
+        return MSGPACK
+    return JSON
+
+
+def matches(if_none_match, etag):
+    """Determine whether an If-None-Match header matches an ETag.
+
+    Args:
+        if_none_match: Value of the If-None-Match header
+        etag: Quoted ETag
+
+    Returns:
+        result: True if matched
+
+    """
+    # Compare using the weak comparison function of RFC 7232
+    for item in (if_none_match or '').split(','):
+        item = item.strip()
+        if item.startswith('W/'):
+            item = item[2:]
+        if item in ['*', etag]:
+            return True
+    return False
+
+
+def _accepted(header):
+    """Parse an Accept or Accept-Encoding header.
+
+    Args:
+        header: Value of the header
+
+    Returns:
+        result: Dict of quality values keyed by lowercase value
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Parse values like "gzip;q=1.0, identity; q=0.5"
+    for item in (header or '').split(','):
+        fields = item.split(';')
+        value = fields[0].strip().lower()
+        if bool(value) is False:
+            continue
+        quality = 1.0
+        for parameter in fields[1:]:
+            (name, _, number) = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        result[value] = quality
+    return result
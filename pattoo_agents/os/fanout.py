@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""Pattoo library polling many OS spokes concurrently from one hub.
+
+Spokes are polled with asyncio so that one hub process can have hundreds
+of requests in flight at once. Connections to spokes are kept alive between
+polls when the spoke allows it. Data is relayed to the pattoo server by a
+small pool of threads, as posting uses a blocking HTTP client. The
+health of each spoke is tracked so that spokes that are down don't slow
+down every poll.
+
+Data pushed by spokes is relayed the same way. Spokes that keep pushing
+data aren't polled, so polling is only a fallback for them.
+
+The HTTP client only implements what is needed to GET data from a spoke
+with the standard library, so no additional packages are required.
+
+"""
+
+# Standard libraries
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.os.batcher import Ack
+from pattoo_agents.os.health import Health
+from pattoo_agents.os.hub import SpokeAgent
+
+# Default maximum number of spokes polled at the same time
+CONCURRENCY = 100
+
+# Default seconds to wait for the response of each spoke
+TIMEOUT = 10
+
+# Maximum number of threads posting data to the pattoo server
+POSTERS = 8
+
+# A spoke isn't polled until this many of its polling intervals have passed
+# without it pushing data
+PUSH_INTERVALS = 2
+
+# Maximum size of a line in the headers of a response
+_MAX_LINE = 65536
+
+
+class Response():
+    """Response to an HTTP request."""
+
+    __slots__ = ('status', 'headers', 'body', 'reusable')
+
+    def __init__(self, status, headers, body, reusable):
+        """Initialize the class.
+
+        Args:
+            status: HTTP status code
+            headers: Dict of headers keyed by lowercase name
+            body: Body bytes
+            reusable: True if the connection can be used again
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.status = status
+        self.headers = _Headers(headers)
+        self.body = body
+        self.reusable = reusable
+
+
+class _Headers(dict):
+    """Dict of headers with case insensitive get()."""
+
+    def get(self, key, default=None):
+        """Get a header.
+
+        Args:
+            key: Header name
+            default: Value returned if the header is missing
+
+        Returns:
+            result: Header value
+
+        """
+        # Return
+        return dict.get(self, key.lower(), default)
+
+
+class HTTPPool():
+    """Keep-alive connections used to GET URLs with asyncio."""
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._idle = {}
+
+    def __len__(self):
+        """Get the number of idle connections."""
+        return sum(len(_) for _ in self._idle.values())
+
+    async def get(self, url, headers=None):
+        """GET a URL.
+
+        Args:
+            url: URL
+            headers: Dict of request headers
+
+        Returns:
+            result: Response
+
+        """
+        # Initialize key variables
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port or 80
+        path = parts.path or '/'
+        if bool(parts.query) is True:
+            path = '{}?{}'.format(path, parts.query)
+        lines = [
+            'GET {} HTTP/1.1'.format(path), 'Host: {}'.format(parts.netloc)]
+        for key, value in (headers or {}).items():
+            lines.append('{}: {}'.format(key, value))
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        # Use an idle connection if possible. The spoke may have closed it
+        # since, so retry once with a new connection.
+        idle = self._idle.get((host, port), [])
+        while bool(idle) is True:
+            (reader, writer) = idle.pop()
+            try:
+                result = await _exchange(reader, writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                continue
+            except BaseException:
+                writer.close()
+                raise
+            self._release((host, port), reader, writer, result)
+            return result
+
+        # Use a new connection
+        (reader, writer) = await asyncio.open_connection(host, port)
+        try:
+            result = await _exchange(reader, writer, request)
+        except BaseException:
+            writer.close()
+            raise
+        self._release((host, port), reader, writer, result)
+        return result
+
+    def close(self):
+        """Close all idle connections.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        for connections in self._idle.values():
+            for (_, writer) in connections:
+                writer.close()
+        self._idle.clear()
+
+    def _release(self, key, reader, writer, response):
+        """Keep a connection for later use or close it.
+
+        Args:
+            key: Tuple of (host, port)
+            reader: asyncio.StreamReader
+            writer: asyncio.StreamWriter
+            response: Response received on the connection
+
+        Returns:
+            None
+
+        """
+        # Release
+        if response.reusable is True:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+
+
+class FanOut():
+    """Polls spokes concurrently and relays their data."""
+
+    def __init__(self, agent_program, concurrency=CONCURRENCY,
+                 timeout=TIMEOUT, posters=POSTERS, batcher=None,
+                 health=None):
+        """Initialize the class.
+
+        Args:
+            agent_program: Name of the agent program
+            concurrency: Maximum number of spokes polled at the same time
+            timeout: Maximum seconds to wait for the response of each spoke
+            posters: Maximum number of threads posting data
+            batcher: Batcher used to post data in batches. Data is posted
+                for each spoke separately if None
+            health: Health used to adapt the timeout of each spoke and skip
+                failing spokes. A new Health is created if None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.agent_program = agent_program
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.batcher = batcher
+        self.health = health or Health(timeout)
+        self._spokes = {}
+        self._settings = None
+        self._urls = None
+        self._agent_ids = {}
+        self._pushed = {}
+        self._pushing = threading.Lock()
+        self._pool = HTTPPool()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(posters)),
+            thread_name_prefix='pattoo-fanout')
+
+        # The event loop is kept between polls to keep connections alive
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+
+    def poll(self, urls, identifier, msgpack=False):
+        """Poll spokes and relay their data.
+
+        Args:
+            urls: List of spoke URLs
+            identifier: Unique identifier to use for posting data
+            msgpack: Ask spokes for msgpack instead of JSON if True
+
+        Returns:
+            result: Number of spokes whose data was relayed
+
+        """
+        # Skip spokes that are backing off
+        due = self.health.start(urls)
+
+        # Keep the SpokeAgent of each URL, and its ETag, between polls. They
+        # are only created again when the spokes or settings change.
+        settings = (identifier, bool(msgpack))
+        if settings != self._settings:
+            self._spokes = {}
+            self._settings = settings
+            self._urls = None
+        if urls != self._urls:
+            self._spokes = {
+                _: self._spokes.get(_) or SpokeAgent(
+                    self.agent_program, identifier, _, msgpack=msgpack)
+                for _ in urls}
+            self._agent_ids = {
+                _: self._agent_ids[_] for _ in urls if _ in self._agent_ids}
+            self._urls = list(urls)
+
+        # Poll spokes that aren't pushing data
+        now = time.monotonic()
+        with self._pushing:
+            self._pushed = {
+                key: value for key, value in self._pushed.items()
+                if value >= now}
+            pushing = set(self._pushed)
+        spokes = [
+            self._spokes[_] for _ in due
+            if self._agent_ids.get(_) not in pushing]
+        with self._lock:
+            results = self._loop.run_until_complete(self._poll(spokes))
+
+        # Wait for the pattoo server to acknowledge batched data outside
+        # the event loop. Data not acknowledged in time isn't counted.
+        if self.batcher is not None:
+            deadline = time.monotonic() + self.batcher.timeout
+            results = [
+                _.wait(max(0, deadline - time.monotonic()))
+                if isinstance(_, Ack) is True else _ for _ in results]
+        return sum(1 for _ in results if _ is True)
+
+    def close(self):
+        """Close all connections and stop posting threads.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        with self._lock:
+            self._pool.close()
+            self._loop.close()
+        self._executor.shutdown(wait=True)
+
+    def receive(self, source, data, identifier):
+        """Relay data pushed by a spoke.
+
+        Args:
+            source: Address of the spoke
+            data: dict of data pushed by the spoke
+            identifier: Unique identifier to use for posting data
+
+        Returns:
+            result: True if the data was queued for posting
+
+        """
+        # Don't poll the spoke while it keeps pushing data
+        with self._pushing:
+            self._pushed[data['pattoo_agent_id']] = time.monotonic() + (
+                PUSH_INTERVALS * data['pattoo_agent_polling_interval'] / 1000)
+
+        # Relay
+        if self.batcher is not None:
+            self.batcher.add(source, data)
+        else:
+            spoke = SpokeAgent(self.agent_program, identifier, source)
+            self._executor.submit(spoke.post, data)
+        return True
+
+    async def fetch(self, spoke):
+        """Get data from a spoke.
+
+        Args:
+            spoke: SpokeAgent
+
+        Returns:
+            result: dict of data retrieved. Empty if the data hasn't changed
+                since the last response or if there was an error.
+
+        """
+        # Initialize key variables
+        url = spoke._url
+        timeout = self.health.timeout(url)
+        start = time.monotonic()
+
+        # Get
+        try:
+            response = await asyncio.wait_for(
+                self._pool.get(url, headers=spoke.headers()), timeout)
+        except asyncio.TimeoutError:
+            log_message = ('''\
+No response from URL {} within {}s'''.format(url, timeout))
+            log.log2info(51578, log_message)
+            self.health.failure(
+                url, 'Timeout', latency=time.monotonic() - start)
+            return {}
+        except Exception:
+            # Most likely no connectivity or the TCP port is unavailable
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = (
+                'Error contacting URL {}: [{}, {}, {}]'
+                ''.format(url, etype, evalue, etraceback))
+            log.log2info(51579, log_message)
+            self.health.failure(url, '{}: {}'.format(etype.__name__, evalue))
+            return {}
+
+        # Record the health of the spoke
+        if response.status in [200, 304]:
+            self.health.success(url, time.monotonic() - start)
+        else:
+            self.health.failure(url, 'HTTP {}'.format(response.status))
+        return spoke.receive(response.status, response.headers, response.body)
+
+    async def _poll(self, spokes):
+        """Poll spokes and relay their data.
+
+        Args:
+            spokes: List of SpokeAgent objects
+
+        Returns:
+            result: List of True or False values for each spoke. Data
+                queued for a Batcher is represented by its Ack
+
+        """
+        # Initialize key variables
+        semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_event_loop()
+
+        async def _relay(spoke):
+            async with semaphore:
+                data = await self.fetch(spoke)
+            if bool(data) is False:
+                return False
+            self._agent_ids[spoke._url] = data.get('pattoo_agent_id')
+            if self.batcher is not None:
+                return self.batcher.add(spoke._url, data)
+            return await loop.run_in_executor(
+                self._executor, spoke.post, data)
+
+        # Relay
+        result = await asyncio.gather(
+            *[_relay(_) for _ in spokes], return_exceptions=True)
+
+        # Post the data still queued
+        if self.batcher is not None:
+            await loop.run_in_executor(self._executor, self.batcher.flush)
+        return result
+
+
+async def _exchange(reader, writer, request):
+    """Send a request and read the response.
+
+    Args:
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+        request: Request bytes
+
+    Returns:
+        result: Response
+
+    """
+    # Send
+    writer.write(request)
+    await writer.drain()
+
+    # Read the status line
+    line = await reader.readline()
+    if bool(line) is False:
+        raise ConnectionResetError('Connection closed by the server')
+    fields = line.decode('latin-1').split(None, 2)
+    version = fields[0].upper()
+    status = int(fields[1])
+
+    # Read the headers
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in [b'\r\n', b'\n', b'']:
+            break
+        if len(line) > _MAX_LINE:
+            raise ValueError('Response header line too long')
+        (name, _, value) = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    # Read the body
+    reusable = (
+        version == 'HTTP/1.1' and
+        headers.get('connection', '').lower() != 'close')
+    if status in [204, 304] or 100 <= status < 200:
+        body = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = await _chunks(reader)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        reusable = False
+
+    # Return
+    result = Response(status, headers, body, reusable)
+    return result
+
+
+async def _chunks(reader):
+    """Read a body sent with chunked transfer encoding.
+
+    Args:
+        reader: asyncio.StreamReader
+
+    Returns:
+        result: Body bytes
+
+    """
+    # Initialize key variables
+    chunks = []
+
+    # Read
+    while True:
+        line = await reader.readline()
+        size = int(line.split(b';')[0].strip(), 16)
+        if bool(size) is False:
+            break
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+    # Skip trailers
+    while True:
+        line = await reader.readline()
+        if line in [b'\r\n', b'\n', b'']:
+            break
+    return b''.join(chunks)
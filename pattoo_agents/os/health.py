@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Pattoo library tracking the health of the spokes polled by a hub.
+
+Without it, every spoke is treated the same on every poll. A spoke that is
+down uses a concurrency slot for the full timeout on every poll, so a hub
+cycle takes longer the more of the fleet is down.
+
+Health keeps the recent response times and failures of each spoke. Each
+spoke is given a timeout derived from its own 99th percentile response
+time, so that a dead spoke is given up on as soon as it is clearly slower
+than usual. Spokes that keep failing are skipped for an exponentially
+growing number of polls.
+
+"""
+
+# Standard libraries
+import json
+import math
+import os
+import tempfile
+import time
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.ringbuffer import RingBuffer
+
+# Default maximum seconds to wait for the response of a spoke
+TIMEOUT = 10
+
+# Adaptive timeouts are this multiple of the 99th percentile response time
+MULTIPLIER = 3
+
+# Minimum adaptive timeout in seconds
+MINIMUM = 1
+
+# Number of response times kept for each spoke
+SAMPLES = 100
+
+# Number of response times needed before timeouts are adapted
+MIN_SAMPLES = 5
+
+# Default maximum number of consecutive polls a failing spoke is skipped
+MAX_BACKOFF = 16
+
+
+class SpokeHealth():
+    """Response times and failures of a spoke."""
+
+    __slots__ = (
+        'latencies', 'successes', 'failures', 'consecutive', 'retry',
+        'skipped', 'error')
+
+    def __init__(self, samples=SAMPLES):
+        """Initialize the class.
+
+        Args:
+            samples: Number of response times kept
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.latencies = RingBuffer(samples)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive = 0
+        self.retry = 0
+        self.skipped = 0
+        self.error = None
+
+
+class Health():
+    """Health of the spokes polled by a hub."""
+
+    def __init__(self, timeout=TIMEOUT, multiplier=MULTIPLIER,
+                 minimum=MINIMUM, max_backoff=MAX_BACKOFF, samples=SAMPLES,
+                 clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            timeout: Maximum seconds to wait for the response of a spoke
+            multiplier: Adaptive timeouts are this multiple of the 99th
+                percentile response time
+            minimum: Minimum adaptive timeout in seconds
+            max_backoff: Maximum number of consecutive polls a failing
+                spoke is skipped. Failing spokes are never skipped if zero.
+            samples: Number of response times kept for each spoke
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.maximum = timeout
+        self.multiplier = multiplier
+        self.minimum = min(minimum, timeout)
+        self.max_backoff = max(0, int(max_backoff))
+        self.samples = samples
+        self.cycle = 0
+        self._clock = clock
+        self._spokes = {}
+        self._urls = None
+
+    def start(self, urls):
+        """Start a poll of the spokes.
+
+        Spokes that are no longer polled are forgotten.
+
+        Args:
+            urls: List of spoke URLs to poll
+
+        Returns:
+            result: List of URLs of the spokes that are due to be polled
+
+        """
+        # Initialize key variables
+        result = []
+        self.cycle += 1
+        if urls != self._urls:
+            self._spokes = {
+                _: self._spokes.get(_) or SpokeHealth(self.samples)
+                for _ in urls}
+            self._urls = list(urls)
+
+        # Skip spokes that are backing off
+        for url in urls:
+            spoke = self._spokes[url]
+            if self.cycle >= spoke.retry:
+                result.append(url)
+            else:
+                spoke.skipped += 1
+        return result
+
+    def timeout(self, url):
+        """Get the seconds to wait for the response of a spoke.
+
+        Args:
+            url: Spoke URL
+
+        Returns:
+            result: Seconds
+
+        """
+        # Use the maximum until enough response times are known
+        spoke = self._spokes.get(url)
+        if spoke is None or len(spoke.latencies) < MIN_SAMPLES:
+            return self.maximum
+
+        # Return
+        result = min(self.maximum, max(
+            self.minimum,
+            self.multiplier * percentile(spoke.latencies.values(), 0.99)))
+        return result
+
+    def success(self, url, latency):
+        """Record a response from a spoke.
+
+        Args:
+            url: Spoke URL
+            latency: Seconds taken by the spoke to respond
+
+        Returns:
+            None
+
+        """
+        # Record
+        spoke = self._spoke(url)
+        spoke.latencies.append(latency, self._clock())
+        spoke.successes += 1
+        if bool(spoke.consecutive) is True:
+            log_message = ('''\
+URL {} responded after {} consecutive failures\
+'''.format(url, spoke.consecutive))
+            log.log2info(51585, log_message)
+        spoke.consecutive = 0
+        spoke.retry = 0
+        spoke.error = None
+
+    def failure(self, url, error, latency=None):
+        """Record a failure to get a response from a spoke.
+
+        Args:
+            url: Spoke URL
+            error: Description of the failure
+            latency: Seconds waited before timing out. None if the spoke
+                didn't time out
+
+        Returns:
+            None
+
+        """
+        # Record. A timeout raises the adaptive timeout of the spoke back to
+        # the maximum until it is no longer among the slowest responses
+        spoke = self._spoke(url)
+        if latency is not None:
+            spoke.latencies.append(
+                max(latency, self.maximum), self._clock())
+        spoke.failures += 1
+        spoke.consecutive += 1
+        spoke.error = str(error)
+
+        # Skip the spoke for 1, 2, 4 ... polls from the second failure
+        if bool(self.max_backoff) is True and spoke.consecutive > 1:
+            backoff = min(self.max_backoff, 2 ** (spoke.consecutive - 2))
+            spoke.retry = self.cycle + backoff + 1
+            if spoke.consecutive == 2:
+                log_message = ('''\
+URL {} failed {} consecutive times and will be polled less often: {}\
+'''.format(url, spoke.consecutive, spoke.error))
+                log.log2info(51584, log_message)
+
+    def stats(self):
+        """Get the health of each spoke.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of dicts keyed by spoke URL
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Get statistics
+        for url, spoke in sorted(self._spokes.items()):
+            latencies = spoke.latencies.values()
+            result[url] = {
+                'up': spoke.consecutive == 0,
+                'successes': spoke.successes,
+                'failures': spoke.failures,
+                'consecutive_failures': spoke.consecutive,
+                'skipped': spoke.skipped,
+                'polls_until_retry': max(0, spoke.retry - self.cycle - 1),
+                'timeout': self.timeout(url),
+                'latency_p50': percentile(latencies, 0.5),
+                'latency_p99': percentile(latencies, 0.99),
+                'error': spoke.error}
+        return result
+
+    def save(self, filepath, acks=None):
+        """Save the health of each spoke as JSON.
+
+        The file is replaced atomically so it can be read at any time.
+
+        Args:
+            filepath: Path of the file
+            acks: Dict of the (success, time.time() value) tuples returned
+                by Batcher.acks(). Whether the pattoo server accepted the
+                last data of each source is saved if not None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        directory = os.path.dirname(os.path.abspath(filepath))
+        data = {
+            'timestamp': int(time.time()),
+            'spokes': self.stats()}
+        if acks is not None:
+            data['acks'] = {
+                source: {'accepted': success, 'timestamp': int(timestamp)}
+                for source, (success, timestamp) in acks.items()}
+
+        # Save
+        temp_path = None
+        try:
+            (f_descriptor, temp_path) = tempfile.mkstemp(
+                dir=directory, suffix='.tmp')
+            with os.fdopen(f_descriptor, 'w') as f_handle:
+                json.dump(data, f_handle, indent=2, sort_keys=True)
+            os.replace(temp_path, filepath)
+        except OSError as error:
+            log_message = ('''\
+Could not save spoke health to file {}: {}'''.format(filepath, error))
+            log.log2warning(51586, log_message)
+            if temp_path is not None and os.path.isfile(temp_path) is True:
+                os.remove(temp_path)
+
+    def _spoke(self, url):
+        """Get the SpokeHealth of a spoke.
+
+        Args:
+            url: Spoke URL
+
+        Returns:
+            result: SpokeHealth
+
+        """
+        # Return
+        result = self._spokes.get(url)
+        if result is None:
+            result = SpokeHealth(self.samples)
+            self._spokes[url] = result
+        return result
+
+
+def percentile(values, fraction):
+    """Get the nearest rank percentile of values.
+
+    Args:
+        values: List of numbers
+        fraction: Percentile as a fraction, such as 0.99
+
+    Returns:
+        result: Number. None if there are no values
+
+    """
+    # Return
+    if bool(values) is False:
+        return None
+    ordered = sorted(values)
+    result = ordered[max(0, int(math.ceil(fraction * len(ordered))) - 1)]
+    return result
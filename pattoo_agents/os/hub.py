@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Pattoo library used by the OS hub to get data from spokes."""
+
+# Standard libraries
+import sys
+import urllib.error
+import urllib.request
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_shared.phttp import PassiveAgent, Post
+from pattoo_agents.os import encoding
+
+
+class SpokeAgent(PassiveAgent):
+    """PassiveAgent that gets compressed and conditional spoke responses."""
+
+    def __init__(self, agent_program, identifier, url, etag=None,
+                 msgpack=False):
+        """Initialize the class.
+
+        Args:
+            agent_program: Name of the agent program
+            identifier: Unique identifier to use for posting data
+            url: URL of the spoke
+            etag: ETag of the last response received from the spoke
+            msgpack: Ask for msgpack instead of JSON if True and msgpack is
+                installed
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        PassiveAgent.__init__(self, agent_program, identifier, url)
+        self.etag = etag
+        self.msgpack = bool(msgpack) and encoding.msgpack is not None
+
+    def headers(self):
+        """Get the headers of a request to the spoke.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of headers
+
+        """
+        # Initialize key variables
+        result = {'Accept-Encoding': ', '.join(encoding.CODINGS)}
+
+        # Set the headers
+        if self.msgpack is True:
+            result['Accept'] = '{}, {};q=0.5'.format(
+                encoding.MSGPACK, encoding.JSON)
+        else:
+            result['Accept'] = encoding.JSON
+        if bool(self.etag) is True:
+            result['If-None-Match'] = self.etag
+        return result
+
+    def get(self):
+        """Get data from the spoke.
+
+        Args:
+            None
+
+        Returns:
+            result: dict of data retrieved. Empty if the data hasn't changed
+                since the last response.
+
+        """
+        # Initialize key variables
+        result = {}
+        url = self._url
+        req = urllib.request.Request(url, headers=self.headers())
+
+        # Get URL
+        try:
+            with urllib.request.urlopen(req) as u_handle:
+                result = self.receive(
+                    u_handle.status, u_handle.headers, u_handle.read())
+        except urllib.error.HTTPError as error:
+            result = self.receive(error.code, error.headers, b'')
+        except:
+            # Most likely no connectivity or the TCP port is unavailable
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = (
+                'Error contacting URL {}: [{}, {}, {}]'
+                ''.format(url, etype, evalue, etraceback))
+            log.log2info(51576, log_message)
+
+        # Return
+        return result
+
+    def receive(self, status, headers, body):
+        """Get data from a response of the spoke.
+
+        Args:
+            status: HTTP status code
+            headers: Case insensitive mapping of response headers
+            body: Body of the response
+
+        Returns:
+            result: dict of data retrieved. Empty if the data hasn't changed
+                since the last response or if there was an error.
+
+        """
+        # Initialize key variables
+        result = {}
+        url = self._url
+
+        # The data is unchanged
+        if status == 304:
+            return result
+        if status != 200:
+            log_message = 'HTTP {} error from URL {}'.format(status, url)
+            log.log2info(51575, log_message)
+            return result
+
+        # Decode
+        try:
+            result = encoding.decode(
+                body,
+                media_type=headers.get('Content-Type'),
+                coding=headers.get('Content-Encoding'))
+            self.etag = headers.get('ETag')
+        except:
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = (
+                'Error decoding data from URL {}: [{}, {}, {}]'
+                ''.format(url, etype, evalue, etraceback))
+            log.log2info(51574, log_message)
+        return result
+
+    def post(self, data):
+        """Post data from the spoke to the pattoo server.
+
+        Args:
+            data: dict of data retrieved from the spoke
+
+        Returns:
+            success: True if successful
+
+        """
+        # Nothing to do
+        if bool(data) is False:
+            return False
+
+        # Log message that ties the identifier to an agent_program
+        log_message = ('''\
+Agent program {} posting data as {}'''.format(
+            self._agent_program, self._identifier))
+        log.log2debug(51577, log_message)
+
+        # Post to remote server
+        server = Post(self._identifier, data)
+        success = server.post()
+
+        # Purge cache if success is True
+        if success is True:
+            server.purge()
+        return success
+
+    def relay(self):
+        """Forward data polled from the spoke to the pattoo server.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Relay
+        self.post(self.get())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Pattoo library receiving data pushed by spokes to a hub.
+
+An Ingest runs a small web server in a background thread of the hub. Each
+spoke in push mode posts its data to the PATTOO_AGENT_OS_HUBD_PUSH_URI
+endpoint, and the data is handed to a receiver that relays it to the
+pattoo server.
+
+"""
+
+# Standard libraries
+import sys
+import threading
+
+# pip3 libraries
+from flask import Flask, request
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.os import encoding
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_HUBD_PUSH_URI
+
+# Maximum bytes of pushed data, before and after decompression. Data
+# isn't authenticated, so a small compressed body mustn't be able to
+# exhaust the memory of the hub.
+MAX_LENGTH = 8 * 1024 * 1024
+MAX_SIZE = 64 * 1024 * 1024
+
+# Keys required in pushed data
+KEYS = (
+    'pattoo_agent_id', 'pattoo_agent_polling_interval', 'pattoo_datapoints')
+
+
+class _Handler(WSGIRequestHandler):
+    """Request handler that doesn't log each request."""
+
+    def log_request(self, *args, **kwargs):
+        """Don't log requests."""
+
+
+class Ingest():
+    """Web server receiving data pushed by spokes."""
+
+    def __init__(self, receiver, ip_listen_address='0.0.0.0',
+                 ip_bind_port=0):
+        """Initialize the class.
+
+        Args:
+            receiver: Function called with the source address and the data
+                of each push. Returns True if the data was accepted
+            ip_listen_address: IP address on which to listen
+            ip_bind_port: TCP port on which to listen. Any free port is used
+                if zero
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.app = _app(receiver)
+        self._server = make_server(
+            ip_listen_address, ip_bind_port, self.app, threaded=True,
+            request_handler=_Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='pattoo-ingest',
+            daemon=True)
+
+    @property
+    def port(self):
+        """Get the TCP port on which the server listens."""
+        return self._server.server_port
+
+    def start(self):
+        """Start receiving data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        self._thread.start()
+
+    def stop(self):
+        """Stop receiving data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        if self._thread.is_alive() is True:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+
+def _app(receiver):
+    """Create the Flask application of an Ingest.
+
+    Args:
+        receiver: Function called with the source address and the data of
+            each push
+
+    Returns:
+        result: Flask object
+
+    """
+    # Initialize key variables
+    result = Flask(__name__)
+    result.config['MAX_CONTENT_LENGTH'] = MAX_LENGTH
+
+    @result.route(PATTOO_AGENT_OS_HUBD_PUSH_URI, methods=['POST'])
+    def push():
+        """Receive data pushed by a spoke.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Decompress. Flask answers bodies longer than MAX_LENGTH with HTTP
+        # 413 itself
+        body = request.get_data()
+        try:
+            body = encoding.decompress(
+                body, coding=request.headers.get('Content-Encoding'),
+                limit=MAX_SIZE)
+            if body is None:
+                log_message = ('''\
+Data pushed from {} is larger than {} bytes when decompressed\
+'''.format(request.remote_addr, MAX_SIZE))
+                log.log2info(51598, log_message)
+                return 'Too large', 413
+
+            # Decode
+            data = encoding.decode(
+                body, media_type=request.headers.get('Content-Type'))
+        except:
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = ('''\
+Error decoding data pushed from {}: [{}, {}, {}]\
+'''.format(request.remote_addr, etype, evalue, etraceback))
+            log.log2info(51589, log_message)
+            return 'Invalid data', 400
+        if valid(data) is False:
+            log_message = 'Invalid data pushed from {}'.format(
+                request.remote_addr)
+            log.log2info(51590, log_message)
+            return 'Invalid data', 400
+
+        # Relay
+        if receiver(request.remote_addr, data) is True:
+            return 'Accepted', 202
+        return 'Unavailable', 503
+
+    return result
+
+
+def valid(data):
+    """Determine whether pushed data can be relayed.
+
+    Args:
+        data: Data pushed by a spoke
+
+    Returns:
+        result: True if valid
+
+    """
+    # Test
+    if isinstance(data, dict) is False:
+        return False
+    if all(_ in data for _ in KEYS) is False:
+        return False
+
+    # Return
+    result = all([
+        isinstance(data['pattoo_agent_id'], str),
+        isinstance(data['pattoo_agent_polling_interval'], int),
+        isinstance(data['pattoo_datapoints'], dict)])
+    return result
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""Pattoo library getting disk partition usage within a deadline.
+
+Getting the usage of a hung network mount can block forever. The usage of
+each mount is fetched in a pool of helper threads so that the time taken is
+bounded. Mounts that don't reply in time are quarantined and skipped until
+they recover.
+
+"""
+
+# Standard libraries
+import os
+import queue
+import re
+import threading
+import time
+
+# pip3 libraries
+import psutil
+
+# Pattoo libraries
+from pattoo_shared import log
+
+# Filesystem types that are not reported
+EXCLUDED_FSTYPES = frozenset([
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'tmpfs', 'devtmpfs', 'overlay',
+    'squashfs'])
+
+# Seconds to wait for the usage of all mounts
+TIMEOUT = 2
+
+# Seconds for which a mount that timed out is skipped
+QUARANTINE = 300
+
+# Number of helper threads
+WORKERS = 4
+
+# RAM pseudo disks. RAM disks are OK.
+_RAM = re.compile(r'^ram\d+$')
+
+# State shared by all polls in the process
+_LOCK = threading.Lock()
+_POOL = {}
+_QUARANTINE = {}
+
+
+class _Task():
+    """Function call run by a _Pool worker."""
+
+    __slots__ = (
+        'function', 'args', 'started', 'cancelled', 'blocked', 'result',
+        'error', '_lock', '_done')
+
+    def __init__(self, function, args):
+        """Initialize the class.
+
+        Args:
+            function: Function to run
+            args: Tuple of arguments for the function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.function = function
+        self.args = args
+        self.started = False
+        self.cancelled = False
+        self.blocked = False
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def run(self):
+        """Run the function unless cancelled.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Don't run cancelled tasks
+        with self._lock:
+            if self.cancelled is True:
+                return
+            self.started = True
+
+        # Run
+        try:
+            self.result = self.function(*self.args)
+        except Exception as error:
+            self.error = error
+        self._done.set()
+
+    def cancel(self):
+        """Stop the function from running if it hasn't started.
+
+        Args:
+            None
+
+        Returns:
+            result: True if cancelled
+
+        """
+        # Cancel
+        with self._lock:
+            if self.started is False:
+                self.cancelled = True
+            return self.cancelled
+
+    def done(self):
+        """Determine whether the function has returned.
+
+        Args:
+            None
+
+        Returns:
+            result: True if done
+
+        """
+        # Return
+        return self._done.is_set()
+
+    def wait(self, timeout):
+        """Wait for the function to return.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            result: True if the function returned within the timeout
+
+        """
+        # Return
+        return self._done.wait(max(0, timeout))
+
+
+class _Pool():
+    """Pool of daemon threads.
+
+    concurrent.futures waits for its threads when the interpreter exits,
+    which would never happen if a thread is blocked on a hung mount.
+
+    Threads blocked on a hung mount are replaced, up to a limit. Threads
+    are retired when their blocked call returns and there are enough
+    others.
+
+    """
+
+    def __init__(self, workers, limit):
+        """Initialize the class.
+
+        Args:
+            workers: Number of threads that aren't blocked
+            limit: Maximum number of threads, including blocked threads
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._blocked = 0
+        self._workers = workers
+        self._limit = limit
+        with self._lock:
+            self._start()
+
+    def available(self):
+        """Get the number of threads that aren't blocked.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of threads
+
+        """
+        # Return
+        with self._lock:
+            result = self._threads - self._blocked
+        return result
+
+    def block(self, task):
+        """Replace the thread running a task blocked on a hung mount.
+
+        Args:
+            task: _Task that timed out
+
+        Returns:
+            None
+
+        """
+        # The thread is no longer blocked if the task returned
+        with self._lock:
+            if task.done() is True or task.blocked is True:
+                return
+            task.blocked = True
+            self._blocked += 1
+            self._start()
+
+    def submit(self, function, *args):
+        """Run a function in the pool.
+
+        Args:
+            function: Function to run
+            args: Arguments for the function
+
+        Returns:
+            result: _Task
+
+        """
+        # Queue the task
+        result = _Task(function, args)
+        self._queue.put(result)
+        return result
+
+    def _start(self):
+        """Start threads until enough aren't blocked. The lock is held.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Don't exceed the limit
+        while self._threads - self._blocked < self._workers:
+            if self._threads >= self._limit:
+                break
+            self._threads += 1
+            thread = threading.Thread(
+                target=self._worker, name='pattoo-mounts', daemon=True)
+            thread.start()
+
+    def _worker(self):
+        """Run queued tasks until no longer needed."""
+        while True:
+            task = self._queue.get()
+            task.run()
+
+            # Retire the thread if it was replaced while blocked
+            with self._lock:
+                if task.blocked is False:
+                    continue
+                self._blocked -= 1
+                if self._threads - self._blocked > self._workers:
+                    self._threads -= 1
+                    return
+
+
+def excluded(partition, fstypes=EXCLUDED_FSTYPES):
+    """Determine whether a partition should not be reported.
+
+    Args:
+        partition: Named tuple returned by psutil.disk_partitions()
+        fstypes: Filesystem types that are not reported
+
+    Returns:
+        result: True if excluded
+
+    """
+    # Return
+    result = partition.fstype.lower() in fstypes
+    return result
+
+
+def pseudo_disk(name):
+    """Determine whether a disk is a RAM pseudo disk or a loopback device.
+
+    Args:
+        name: Disk name
+
+    Returns:
+        result: True if the disk is a pseudo disk
+
+    """
+    # Return
+    result = bool(_RAM.match(name)) or name.startswith('loop')
+    return result
+
+
+def disk_usage(
+        partitions, fstypes=EXCLUDED_FSTYPES, timeout=TIMEOUT,
+        quarantine=QUARANTINE):
+    """Get the usage of partitions within a deadline.
+
+    Args:
+        partitions: List of named tuples returned by psutil.disk_partitions()
+        fstypes: Filesystem types that are not reported
+        timeout: Seconds to wait for the usage of all partitions
+        quarantine: Seconds to skip partitions that time out
+
+    Returns:
+        result: List of (partition, usage) tuples. The usage is the named
+            tuple returned by psutil.disk_usage()
+
+    """
+    # Initialize key variables
+    result = []
+    tasks = []
+    skipped = []
+    pool = _pool()
+    now = time.monotonic()
+    deadline = now + timeout
+
+    # Start getting the usage of each partition. Nothing is queued when all
+    # threads are blocked by hung mounts.
+    available = pool.available() > 0
+    for partition in partitions:
+        if excluded(partition, fstypes=fstypes) is True:
+            continue
+        if quarantined(partition.mountpoint, now=now) is True:
+            continue
+        if available is False:
+            skipped.append(partition.mountpoint)
+            continue
+        tasks.append(
+            (partition, pool.submit(psutil.disk_usage, partition.mountpoint)))
+
+    # Get the results
+    for partition, task in tasks:
+        if task.wait(deadline - time.monotonic()) is False:
+            # Only tasks that started can be blocked by the mount. The
+            # others were waiting for a thread, and are cancelled so that
+            # they don't pile up in the queue.
+            if task.cancel() is True:
+                skipped.append(partition.mountpoint)
+            else:
+                _quarantine(partition, task, pool, quarantine)
+            continue
+        if task.error is None:
+            result.append((partition, task.result))
+
+    # Log
+    if bool(skipped) is True:
+        log_message = ('''\
+No thread was free to get the usage of disk partitions mounted on {}. \
+{} threads are not blocked by hung mounts\
+'''.format(', '.join(skipped), pool.available()))
+        log.log2warning(51597, log_message)
+    return result
+
+
+def quarantined(mountpoint, now=None):
+    """Determine whether a mount is quarantined.
+
+    Mounts remain quarantined until the quarantine expires and the usage
+    request that timed out has returned.
+
+    Args:
+        mountpoint: Mount point
+        now: Current time.monotonic() value
+
+    Returns:
+        result: True if quarantined
+
+    """
+    # Initialize key variables
+    if now is None:
+        now = time.monotonic()
+
+    # Check
+    with _LOCK:
+        entry = _QUARANTINE.get(mountpoint)
+        if entry is None:
+            return False
+        (expiry, task) = entry
+        if now < expiry or task.done() is False:
+            return True
+        del _QUARANTINE[mountpoint]
+    return False
+
+
+def _quarantine(partition, task, pool, quarantine):
+    """Quarantine a mount that timed out.
+
+    Args:
+        partition: Named tuple returned by psutil.disk_partitions()
+        task: _Task blocked on the mount
+        pool: _Pool running the task
+        quarantine: Seconds to skip the mount
+
+    Returns:
+        None
+
+    """
+    # Quarantine
+    with _LOCK:
+        _QUARANTINE[partition.mountpoint] = (
+            time.monotonic() + quarantine, task)
+
+    # Replace the blocked thread
+    pool.block(task)
+
+    # Log
+    log_message = ('''\
+Disk partition {} ({}) mounted on {} did not reply in time. Skipping it for \
+at least {}s'''.format(partition.device, partition.fstype,
+                       partition.mountpoint, quarantine))
+    log.log2warning(51572, log_message)
+
+
+def _pool():
+    """Get the _Pool of the current process.
+
+    Threads don't survive a fork, so a new pool is created in each process.
+
+    Args:
+        None
+
+    Returns:
+        result: _Pool
+
+    """
+    # Return
+    pid = os.getpid()
+    with _LOCK:
+        result = _POOL.get(pid)
+        if result is None:
+            _POOL.clear()
+            _QUARANTINE.clear()
+            result = _Pool(WORKERS, WORKERS * 4)
+            _POOL[pid] = result
+    return result
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Pattoo library collecting spoked API responses in the background.
+
+Collecting data takes time, so a hub that waits for the spoke to collect it
+on each request is slowed down by every spoke it polls. A Precollector
+creates responses in background threads, one for each polling interval
+requested by the hubs, aligned to that interval. Requests then only read
+the latest response from memory.
+
+"""
+
+# Standard libraries
+import os
+import threading
+import time
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.scheduler import Scheduler
+
+# Maximum number of polling intervals collected in the background
+MAX_INTERVALS = 4
+
+# Background collection of an interval stops when it hasn't been requested
+# for this many intervals
+IDLE_INTERVALS = 3
+
+# Seconds to wait for the first response of a new interval
+TIMEOUT = 30
+
+# Precollector objects used by each process
+_LOCK = threading.Lock()
+_PRECOLLECTORS = {}
+
+
+class _Worker():
+    """Background thread collecting the responses of an interval."""
+
+    def __init__(self, function, interval, clock):
+        """Initialize the class.
+
+        Args:
+            function: Function that creates a response from an interval
+            interval: Polling interval
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.interval = interval
+        self.requested = clock()
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self._function = function
+        self._clock = clock
+        self._response = None
+        self._thread = threading.Thread(
+            target=self._run, name='pattoo-precollector', daemon=True)
+
+    def start(self):
+        """Start collecting.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        self._thread.start()
+
+    def response(self):
+        """Get the latest response.
+
+        Args:
+            None
+
+        Returns:
+            result: Tuple of (response, age). None if there is none yet.
+
+        """
+        # Return
+        self.requested = self._clock()
+        entry = self._response
+        if entry is None:
+            return None
+        return (entry[0], max(0, self.requested - entry[1]))
+
+    def collect(self):
+        """Create a response.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Keep the previous response if this one fails
+        try:
+            response = self._function(self.interval)
+        except Exception as error:
+            log_message = ('''\
+Background collection for polling interval {}s failed: {}\
+'''.format(self.interval, error))
+            log.log2warning(51573, log_message)
+            return
+        self._response = (response, self._clock())
+
+    def _run(self):
+        """Collect until idle or stopped."""
+        scheduler = Scheduler(
+            self.interval, name='pattoo-precollector',
+            sleep=self.stopped.wait)
+        while self.stopped.is_set() is False:
+            self.collect()
+            self.ready.set()
+            if self._clock() - self.requested > (
+                    self.interval * IDLE_INTERVALS):
+                break
+            scheduler.wait()
+        self.stopped.set()
+        self.ready.set()
+
+
+class Precollector():
+    """Collects responses in the background for each polling interval."""
+
+    def __init__(self, function, max_intervals=MAX_INTERVALS,
+                 timeout=TIMEOUT, clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            function: Function that creates a response from an interval
+            max_intervals: Maximum number of intervals collected
+            timeout: Seconds to wait for the first response of an interval
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.max_intervals = max(1, int(max_intervals))
+        self.timeout = timeout
+        self._function = function
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._workers = {}
+
+    def __len__(self):
+        """Get the number of intervals collected in the background."""
+        return len(self._workers)
+
+    def response(self, interval):
+        """Get the latest response for a polling interval.
+
+        Background collection starts with the first request for an
+        interval, which waits for the first response.
+
+        Args:
+            interval: Polling interval
+
+        Returns:
+            result: Tuple of (response, age). The age is the number of
+                seconds since the response was created. None if there is
+                no response and the caller should create it.
+
+        """
+        # Get the worker of the interval
+        with self._lock:
+            worker = self._workers.get(interval)
+            if worker is None or worker.stopped.is_set() is True:
+                if len(self._workers) >= self.max_intervals:
+                    self._purge()
+                if len(self._workers) >= self.max_intervals:
+                    return None
+                worker = _Worker(self._function, interval, self._clock)
+                self._workers[interval] = worker
+                worker.start()
+
+        # Return
+        worker.ready.wait(self.timeout)
+        return worker.response()
+
+    def stop(self):
+        """Stop all background collection.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        with self._lock:
+            for worker in self._workers.values():
+                worker.stopped.set()
+            self._workers.clear()
+
+    def _purge(self):
+        """Forget intervals that are no longer collected. The lock is held.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Purge
+        for interval in [
+                _ for _, worker in self._workers.items()
+                if worker.stopped.is_set() is True]:
+            del self._workers[interval]
+
+
+def get(function):
+    """Get the Precollector of the current process.
+
+    Threads don't survive a fork, so a new Precollector is created in each
+    process.
+
+    Args:
+        function: Function that creates a response from an interval
+
+    Returns:
+        result: Precollector
+
+    """
+    # Return
+    pid = os.getpid()
+    with _LOCK:
+        result = _PRECOLLECTORS.get(pid)
+        if result is None:
+            _PRECOLLECTORS.clear()
+            result = Precollector(function)
+            _PRECOLLECTORS[pid] = result
+    return result
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Pattoo library reading Linux performance data directly from /proc.
+
+This is a faster alternative to psutil for the values the OS agent reports.
+Each file is read with a single system call into a buffer that is reused
+between polls. The results use the same field names as psutil so that
+datapoint keys don't change.
+
+"""
+
+# Standard libraries
+import collections
+import os
+import threading
+
+# Define namedtuple types with the psutil field names
+CPUTimes = collections.namedtuple(
+    'CPUTimes',
+    'user nice system idle iowait irq softirq steal guest guest_nice')
+CPUStats = collections.namedtuple(
+    'CPUStats', 'ctx_switches interrupts soft_interrupts syscalls')
+VirtualMemory = collections.namedtuple(
+    'VirtualMemory',
+    'total available percent used free active inactive buffers cached '
+    'shared slab')
+DiskIO = collections.namedtuple(
+    'DiskIO',
+    'read_count write_count read_bytes write_bytes read_time write_time '
+    'read_merged_count write_merged_count busy_time')
+NetIO = collections.namedtuple(
+    'NetIO',
+    'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin '
+    'dropout')
+
+# Linux constants
+PROC = '/proc'
+_SECTOR_SIZE = 512
+if hasattr(os, 'sysconf') is True:
+    _CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+else:
+    _CLOCK_TICKS = 100
+
+# Readers are not thread safe as they reuse their buffers
+_LOCAL = threading.local()
+
+
+class ProcFile():
+    """A /proc file read with one system call into a reused buffer."""
+
+    __slots__ = ('path', '_buffer')
+
+    def __init__(self, path, size=4096):
+        """Initialize the class.
+
+        Args:
+            path: Path to the file
+            size: Initial size of the buffer in bytes
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.path = path
+        self._buffer = bytearray(size)
+
+    def read(self):
+        """Read the file.
+
+        The buffer is doubled, and the file read again, only if the file
+        doesn't fit in it. This should happen only on the first read.
+
+        Args:
+            None
+
+        Returns:
+            result: Contents of the file as bytes
+
+        """
+        # Read
+        descriptor = os.open(self.path, os.O_RDONLY)
+        try:
+            while True:
+                count = os.readv(descriptor, [self._buffer])
+                if count < len(self._buffer):
+                    break
+                self._buffer = bytearray(len(self._buffer) * 2)
+                os.lseek(descriptor, 0, os.SEEK_SET)
+        finally:
+            os.close(descriptor)
+
+        # Return
+        result = bytes(memoryview(self._buffer)[:count])
+        return result
+
+
+class Reader():
+    """Reads Linux performance data from /proc."""
+
+    def __init__(self, proc=PROC):
+        """Initialize the class.
+
+        Args:
+            proc: Location of the proc filesystem
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._proc = proc
+        self._stat = ProcFile(os.path.join(proc, 'stat'))
+        self._meminfo = ProcFile(os.path.join(proc, 'meminfo'))
+        self._diskstats = ProcFile(os.path.join(proc, 'diskstats'))
+        self._netdev = ProcFile(os.path.join(proc, 'net', 'dev'))
+
+    def stat(self):
+        """Get CPU times and CPU statistics from a single read of /proc/stat.
+
+        Args:
+            None
+
+        Returns:
+            result: Tuple of (CPUTimes, CPUStats)
+
+        """
+        # Initialize key variables
+        cpu_times = None
+        values = {}
+        wanted = (b'ctxt', b'intr', b'softirq')
+
+        # Process
+        for line in self._stat.read().splitlines():
+            if cpu_times is None and line.startswith(b'cpu '):
+                fields = line.split()[1:len(CPUTimes._fields) + 1]
+                times = [float(_) / _CLOCK_TICKS for _ in fields]
+                times.extend(
+                    [0.0] * (len(CPUTimes._fields) - len(times)))
+                cpu_times = CPUTimes(*times)
+            elif line.startswith(wanted) is True:
+                fields = line.split(None, 2)
+                values[fields[0]] = int(fields[1])
+
+        # Return
+        result = (
+            cpu_times,
+            CPUStats(
+                ctx_switches=values.get(b'ctxt', 0),
+                interrupts=values.get(b'intr', 0),
+                soft_interrupts=values.get(b'softirq', 0),
+                syscalls=0))
+        return result
+
+    def virtual_memory(self):
+        """Get memory utilization from /proc/meminfo.
+
+        Args:
+            None
+
+        Returns:
+            result: VirtualMemory
+
+        """
+        # Get values in bytes
+        mems = {}
+        for line in self._meminfo.read().splitlines():
+            fields = line.split()
+            if len(fields) >= 2:
+                mems[fields[0]] = int(fields[1]) * 1024
+
+        # Calculate the same way psutil does
+        total = mems.get(b'MemTotal:', 0)
+        free = mems.get(b'MemFree:', 0)
+        buffers = mems.get(b'Buffers:', 0)
+        cached = mems.get(b'Cached:', 0) + mems.get(b'SReclaimable:', 0)
+        shared = mems.get(b'Shmem:', mems.get(b'MemShared:', 0))
+        available = mems.get(b'MemAvailable:', 0)
+        if bool(available) is False:
+            available = free + buffers + cached
+        if available > total:
+            available = free
+        used = total - available
+        if bool(total) is True:
+            percent = round(used / total * 100, 1)
+        else:
+            percent = 0.0
+
+        # Return
+        result = VirtualMemory(
+            total=total, available=available, percent=percent, used=used,
+            free=free, active=mems.get(b'Active:', 0),
+            inactive=mems.get(b'Inactive:', 0), buffers=buffers,
+            cached=cached, shared=shared, slab=mems.get(b'Slab:', 0))
+        return result
+
+    def disk_io_counters(self):
+        """Get disk I/O counters per disk from /proc/diskstats.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of DiskIO keyed by disk name
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Process
+        for line in self._diskstats.read().splitlines():
+            fields = line.split()
+            length = len(fields)
+            if length == 15:
+                # Linux 2.4
+                name = fields[3]
+                reads = int(fields[2])
+                (reads_merged, rbytes, rtime, writes, writes_merged,
+                 wbytes, wtime, _, busy_time, _) = map(int, fields[4:14])
+            elif length == 14 or length >= 18:
+                # Linux 2.6+, line referring to a disk
+                name = fields[2]
+                (reads, reads_merged, rbytes, rtime, writes, writes_merged,
+                 wbytes, wtime, _, busy_time, _) = map(int, fields[3:14])
+            elif length == 7:
+                # Linux 2.6+, line referring to a partition
+                name = fields[2]
+                (reads, rbytes, writes, wbytes) = map(int, fields[3:])
+                rtime = wtime = reads_merged = writes_merged = busy_time = 0
+            else:
+                continue
+
+            result[name.decode()] = DiskIO(
+                read_count=reads, write_count=writes,
+                read_bytes=rbytes * _SECTOR_SIZE,
+                write_bytes=wbytes * _SECTOR_SIZE,
+                read_time=rtime, write_time=wtime,
+                read_merged_count=reads_merged,
+                write_merged_count=writes_merged,
+                busy_time=busy_time)
+        return result
+
+    def net_io_counters(self):
+        """Get network I/O counters per interface from /proc/net/dev.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of NetIO keyed by interface name
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Skip the two header lines
+        for line in self._netdev.read().splitlines()[2:]:
+            (name, _, data) = line.rpartition(b':')
+            fields = data.split()
+            if bool(name) is False or len(fields) < 16:
+                continue
+            fields = [int(_) for _ in fields[:16]]
+            result[name.strip().decode()] = NetIO(
+                bytes_sent=fields[8], bytes_recv=fields[0],
+                packets_sent=fields[9], packets_recv=fields[1],
+                errin=fields[2], errout=fields[10],
+                dropin=fields[3], dropout=fields[11])
+        return result
+
+    def process_count(self):
+        """Get the number of processes.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of processes
+
+        """
+        # Count the process directories as they are read, without building
+        # a list of the entries of /proc
+        with os.scandir(self._proc) as entries:
+            result = sum(1 for _ in entries if _.name.isdigit())
+        return result
+
+
+def available(proc=PROC):
+    """Determine whether the /proc fast path can be used.
+
+    Args:
+        proc: Location of the proc filesystem
+
+    Returns:
+        result: True if available
+
+    """
+    # Return
+    filenames = [
+        os.path.join(proc, 'stat'), os.path.join(proc, 'meminfo'),
+        os.path.join(proc, 'diskstats'), os.path.join(proc, 'net', 'dev')]
+    result = hasattr(os, 'readv') and all(
+        os.path.isfile(filename) for filename in filenames)
+    return bool(result)
+
+
+def reader():
+    """Get the Reader for the current thread.
+
+    Args:
+        None
+
+    Returns:
+        result: Reader
+
+    """
+    # Create one Reader per thread
+    result = getattr(_LOCAL, 'reader', None)
+    if result is None:
+        result = Reader()
+        _LOCAL.reader = result
+    return result
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Pattoo library pushing spoke data to a hub.
+
+In pull mode a hub has to poll every spoke, so the cost and latency of a
+hub cycle grow with the number of spokes. A Pusher makes the spoke send its
+data to the ingest endpoint of a hub on its own schedule instead. The hub
+relays it to the pattoo server and stops polling the spoke while it keeps
+pushing. The spoked API remains available so that the hub can fall back to
+polling.
+
+"""
+
+# Standard libraries
+import sys
+import threading
+
+# pip3 libraries
+import requests
+
+# Pattoo libraries
+from pattoo_shared import log
+from pattoo_agents.scheduler import Scheduler
+from pattoo_agents.os import encoding
+
+# Seconds to wait for the hub to respond
+TIMEOUT = 10
+
+# Content coding of pushed data
+CODING = 'gzip'
+
+
+class Pusher():
+    """Pushes spoke data to a hub in a background thread."""
+
+    def __init__(self, url, interval, function, timeout=TIMEOUT,
+                 session=None):
+        """Initialize the class.
+
+        Args:
+            url: URL of the ingest endpoint of the hub
+            interval: Seconds between pushes
+            function: Function that creates an encoding.Payload from an
+                interval
+            timeout: Seconds to wait for the hub to respond
+            session: requests.Session used to push data
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.stopped = threading.Event()
+        self._function = function
+        self._session = session or requests.Session()
+        self._thread = threading.Thread(
+            target=self._run, name='pattoo-pusher', daemon=True)
+
+    def start(self):
+        """Start pushing.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        self._thread.start()
+
+    def stop(self):
+        """Stop pushing.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        self.stopped.set()
+        if self._thread.is_alive() is True:
+            self._thread.join()
+        self._session.close()
+
+    def run(self):
+        """Push in the current thread until stopped.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Run
+        self._run()
+        self._session.close()
+
+    def push(self):
+        """Collect data and push it to the hub.
+
+        Args:
+            None
+
+        Returns:
+            success: True if the hub accepted the data
+
+        """
+        # Collect and push
+        try:
+            payload = self._function(self.interval)
+            response = self._session.post(
+                self.url, data=payload.body(encoding.JSON, CODING),
+                headers={
+                    'Content-Type': encoding.JSON,
+                    'Content-Encoding': CODING},
+                timeout=self.timeout)
+        except:
+            (etype, evalue, etraceback) = sys.exc_info()
+            log_message = ('''\
+Error pushing data to hub {}: [{}, {}, {}]\
+'''.format(self.url, etype, evalue, etraceback))
+            log.log2warning(51587, log_message)
+            return False
+
+        # Return
+        if response.status_code not in [200, 202]:
+            log_message = ('''\
+HTTP {} error pushing data to hub {}\
+'''.format(response.status_code, self.url))
+            log.log2warning(51588, log_message)
+            return False
+        return True
+
+    def _run(self):
+        """Push until stopped."""
+        scheduler = Scheduler(
+            self.interval, name='pattoo-pusher', sleep=self.stopped.wait)
+        while self.stopped.is_set() is False:
+            self.push()
+            scheduler.wait()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Pattoo library converting OS counters to per-second rates."""
+
+# Standard libraries
+import os
+import threading
+import time
+
+# Rates objects used by each process
+_LOCK = threading.Lock()
+_RATES = {}
+
+
+class Rates():
+    """Per-second rates of counters since they were last seen.
+
+    Counters are identified by a group, such as 'disk_io', and a name within
+    the group, such as a disk name. A counter that decreases has been reset,
+    for example when a disk or network interface is re-attached. In that
+    case no rate is returned for it until the next call.
+
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._previous = {}
+
+    def __len__(self):
+        """Get the number of named tuples of counters being tracked."""
+        return len(self._previous)
+
+    def rates(self, group, name, counters, now=None):
+        """Get the rates of a named tuple of counters.
+
+        Args:
+            group: Group of the counters
+            name: Name of the counters within the group
+            counters: Named tuple of counters
+            now: time.monotonic() value when the counters were read
+
+        Returns:
+            result: Dict of per-second rates keyed by field name. Fields
+                that were reset and counters seen for the first time are
+                missing.
+
+        """
+        # Initialize key variables
+        result = {}
+        if now is None:
+            now = self._clock()
+        values = counters._asdict()
+
+        # Save the counters for next time
+        with self._lock:
+            previous = self._previous.get((group, name))
+            self._previous[(group, name)] = (now, values)
+        if previous is None:
+            return result
+
+        # Calculate
+        (then, old) = previous
+        elapsed = now - then
+        if elapsed <= 0:
+            return result
+        for field, value in values.items():
+            change = value - old.get(field, value)
+            if change >= 0 and field in old:
+                result[field] = change / elapsed
+        return result
+
+    def purge(self, group, names):
+        """Forget the counters of a group that are no longer present.
+
+        Args:
+            group: Group of the counters
+            names: Names of the counters of the group to keep
+
+        Returns:
+            None
+
+        """
+        # Purge
+        names = set(names)
+        with self._lock:
+            for key in [
+                    _ for _ in self._previous
+                    if _[0] == group and _[1] not in names]:
+                del self._previous[key]
+
+
+def get():
+    """Get the Rates object of the current process.
+
+    Args:
+        None
+
+    Returns:
+        result: Rates
+
+    """
+    # Return
+    pid = os.getpid()
+    with _LOCK:
+        result = _RATES.get(pid)
+        if result is None:
+            _RATES.clear()
+            result = Rates()
+            _RATES[pid] = result
+    return result
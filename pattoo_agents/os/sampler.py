@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Pattoo library sampling OS data between polls.
+
+The OS agents are polled every polling_interval seconds, so short CPU, disk
+and network spikes are invisible. A Sampler samples these values in a
+background thread every few seconds into fixed size ring buffers. Each poll
+then reports the minimum, maximum, average and 95th percentile of the
+samples taken since the previous poll.
+
+"""
+
+# Standard libraries
+import math
+import os
+import threading
+import time
+
+# pip3 libraries
+import psutil
+
+# Pattoo libraries
+from pattoo_shared.constants import DATA_FLOAT
+from pattoo_shared.variables import DataPoint
+from pattoo_agents.metadata import intern
+from pattoo_agents.ringbuffer import RingBuffer
+from pattoo_agents.scheduler import Scheduler
+from pattoo_agents.os import mounts
+from pattoo_agents.os import procfs as _procfs
+
+# Aggregates reported for each sampled value
+AGGREGATES = ('min', 'max', 'avg', 'p95')
+
+# Fields of psutil.cpu_times() sampled as percentages
+_CPU_FIELDS = ('user', 'system', 'iowait')
+
+# Samplers running in the process
+_LOCK = threading.Lock()
+_SAMPLERS = {}
+
+
+class Sampler():
+    """Samples OS data in a background thread."""
+
+    def __init__(self, interval, size, procfs=False, metadata=None,
+                 clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            interval: Seconds between samples
+            size: Number of samples kept for each value
+            procfs: Read data directly from /proc if True and available
+            metadata: MetadataSet added to all DataPoints
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.interval = max(float(interval), 0.1)
+        self.size = max(1, int(size))
+        self.metadata = metadata
+        self._procfs = bool(procfs) and _procfs.available()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._previous = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a daemon thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start only once
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='pattoo-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+
+    def sample(self):
+        """Take a sample of all values.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Get the data
+        now = self._clock()
+        if self._procfs is True:
+            reader = _procfs.reader()
+            (cpu_times, _) = reader.stat()
+            memory = reader.virtual_memory()
+            disks = reader.disk_io_counters()
+            nics = reader.net_io_counters()
+        else:
+            cpu_times = psutil.cpu_times()
+            memory = psutil.virtual_memory()
+            disks = psutil.disk_io_counters(perdisk=True)
+            nics = psutil.net_io_counters(pernic=True)
+        current = (now, cpu_times, disks, nics)
+
+        # Values that don't need a previous sample
+        values = [('memory_percent', None, memory.percent)]
+
+        # Values calculated from the changes since the previous sample
+        previous = self._previous
+        self._previous = current
+        if previous is not None:
+            values.extend(_deltas(previous, current))
+
+        # Store
+        with self._lock:
+            for key, meta, value in values:
+                ring = self._buffers.get((key, meta))
+                if ring is None:
+                    ring = RingBuffer(self.size)
+                    self._buffers[(key, meta)] = ring
+                ring.append(value, now)
+
+            # Forget values that are no longer sampled, such as removed disks
+            expired = now - (self.size * self.interval)
+            for item in [
+                    _ for _, ring in self._buffers.items()
+                    if ring.latest() < expired]:
+                del self._buffers[item]
+
+    def datapoints(self, window):
+        """Get the aggregates of the values sampled in a time window.
+
+        Args:
+            window: Number of seconds before now to aggregate
+
+        Returns:
+            result: List of DataPoint objects
+
+        """
+        # Initialize key variables
+        result = []
+        since = self._clock() - window
+
+        # Get the values
+        with self._lock:
+            items = [
+                (key, meta, ring.values(since=since))
+                for (key, meta), ring in self._buffers.items()]
+
+        # Create the DataPoints
+        for key, meta, values in items:
+            if bool(values) is False:
+                continue
+            for name, value in zip(AGGREGATES, aggregate(values)):
+                datapoint = DataPoint(
+                    '{}_{}'.format(key, name), value, data_type=DATA_FLOAT)
+                for item in [self.metadata, meta]:
+                    if item is not None:
+                        item.add_to(datapoint)
+                result.append(datapoint)
+        return result
+
+    def _run(self):
+        """Sample until stopped."""
+        scheduler = Scheduler(
+            self.interval, align=False, name='pattoo-sampler',
+            sleep=self._stop.wait)
+        while self._stop.is_set() is False:
+            self.sample()
+            scheduler.wait()
+
+
+def aggregate(values):
+    """Get the minimum, maximum, average and 95th percentile of values.
+
+    Args:
+        values: List of numbers
+
+    Returns:
+        result: Tuple of numbers in the same order as AGGREGATES
+
+    """
+    # Nearest rank 95th percentile
+    ordered = sorted(values)
+    p95 = ordered[max(0, int(math.ceil(0.95 * len(ordered))) - 1)]
+
+    # Return
+    result = (
+        ordered[0], ordered[-1], sum(ordered) / len(ordered), p95)
+    return result
+
+
+def get(interval, size, procfs=False, metadata=None):
+    """Get the running Sampler of the current process.
+
+    A new Sampler is started if the parameters change or if the process
+    was forked.
+
+    Args:
+        interval: Seconds between samples
+        size: Number of samples kept for each value
+        procfs: Read data directly from /proc if True and available
+        metadata: MetadataSet added to all DataPoints
+
+    Returns:
+        result: Sampler
+
+    """
+    # Initialize key variables
+    key = (os.getpid(), interval, size, bool(procfs), metadata)
+
+    # Get the sampler
+    with _LOCK:
+        result = _SAMPLERS.get(key)
+        if result is None:
+            for sampler in _SAMPLERS.values():
+                sampler.stop()
+            _SAMPLERS.clear()
+            result = Sampler(interval, size, procfs=procfs, metadata=metadata)
+            _SAMPLERS[key] = result
+            result.start()
+    return result
+
+
+def _deltas(previous, current):
+    """Get the values calculated from two consecutive samples.
+
+    Args:
+        previous: Tuple of (timestamp, cpu_times, disks, nics)
+        current: Tuple of (timestamp, cpu_times, disks, nics)
+
+    Returns:
+        result: List of (key, MetadataSet, value) tuples
+
+    """
+    # Initialize key variables
+    result = []
+    (then, cpu_then, disks_then, nics_then) = previous
+    (now, cpu_now, disks_now, nics_now) = current
+    elapsed = max(now - then, 1e-9)
+
+    # CPU utilization percentages
+    if cpu_then._fields == cpu_now._fields:
+        deltas = dict(
+            (field, max(0, new - old)) for field, new, old in zip(
+                cpu_now._fields, cpu_now, cpu_then))
+        total = sum(deltas.values()) - deltas.get(
+            'guest', 0) - deltas.get('guest_nice', 0)
+        for field in _CPU_FIELDS:
+            if field in deltas:
+                result.append((
+                    'cpu_times_percent_{}'.format(field), None,
+                    100.0 * deltas[field] / max(total, 1e-9)))
+
+    # Disk and network rates per second
+    for (label, label_key, fields, counters_then, counters_now) in [
+            ('disk_io', 'disk_partition',
+             ('read_bytes', 'write_bytes'), disks_then, disks_now),
+            ('network_io', 'network_io_interface',
+             ('bytes_recv', 'bytes_sent'), nics_then, nics_now)]:
+        for name, counters in counters_now.items():
+            old = counters_then.get(name)
+            if old is None:
+                continue
+            if label == 'disk_io' and mounts.pseudo_disk(name) is True:
+                continue
+            meta = intern([(label_key, name)])
+            for field in fields:
+                change = getattr(counters, field) - getattr(old, field)
+                result.append((
+                    '{}_{}_per_second'.format(label, field), meta,
+                    max(0, change) / elapsed))
+    return result
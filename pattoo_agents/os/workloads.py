@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""Pattoo library reporting the processes and cgroups using the most resources.
+
+Processes are grouped by name so that the number of time series stays
+stable when processes restart. The psutil.Process objects and process names
+are kept between polls so only the changing values are read each cycle.
+
+"""
+
+# Standard libraries
+import os
+import threading
+import time
+
+# pip3 libraries
+import psutil
+
+# Pattoo libraries
+from pattoo_shared.constants import DATA_INT, DATA_FLOAT
+from pattoo_shared.variables import DataPoint
+from pattoo_agents.metadata import intern
+
+# Location of cgroup filesystems
+CGROUP = '/sys/fs/cgroup'
+
+# Maximum depth of cgroups reported, such as system.slice/nginx.service
+_CGROUP_DEPTH = 2
+
+# Maximum number of cgroups read each cycle
+_MAX_CGROUPS = 1000
+
+# Tracker objects used by each process
+_LOCK = threading.Lock()
+_TRACKERS = {}
+
+
+class Usage():
+    """Resources used by a process name or cgroup since the last cycle."""
+
+    __slots__ = ('cpu_percent', 'memory', 'io_bytes_per_second', 'instances')
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.cpu_percent = 0.0
+        self.memory = 0
+        self.io_bytes_per_second = 0.0
+        self.instances = 0
+
+
+class Tracker():
+    """Tracks the resources used by processes and cgroups between cycles."""
+
+    def __init__(self, top, cgroups=False, limit=200, cgroup=CGROUP,
+                 clock=time.monotonic):
+        """Initialize the class.
+
+        Args:
+            top: Number of process names and cgroups reported for each of
+                CPU, memory and I/O usage
+            cgroups: Report cgroup usage if True
+            limit: Maximum number of DataPoints created each cycle
+            cgroup: Location of cgroup filesystems
+            clock: Monotonic clock function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.top = max(0, int(top))
+        self.cgroups = bool(cgroups)
+        self.limit = max(0, int(limit))
+        self._cgroup = cgroup
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # Values from the previous cycle
+        self._processes = {}
+        self._cgroup_counters = {}
+        self._last = None
+
+    def datapoints(self, metadata=None):
+        """Get the DataPoints of the processes and cgroups using the most.
+
+        Args:
+            metadata: MetadataSet added to all DataPoints
+
+        Returns:
+            result: List of DataPoint objects
+
+        """
+        # Get the usage
+        with self._lock:
+            now = self._clock()
+            elapsed = None if self._last is None else now - self._last
+            self._last = now
+            processes = self.processes(elapsed)
+            if self.cgroups is True:
+                cgroups = self.cgroup_usage(elapsed)
+            else:
+                cgroups = {}
+
+        # Create the DataPoints
+        result = []
+        for label, usage in [('process', processes), ('cgroup', cgroups)]:
+            for name in _top(usage, self.top):
+                datapoints = _datapoints(label, name, usage[name], metadata)
+                if len(result) + len(datapoints) > self.limit:
+                    return result
+                result.extend(datapoints)
+        return result
+
+    def processes(self, elapsed):
+        """Get the resources used by each process name.
+
+        Args:
+            elapsed: Seconds since the previous cycle. None if there wasn't
+                one.
+
+        Returns:
+            result: Dict of Usage keyed by process name
+
+        """
+        # Initialize key variables
+        result = {}
+        seen = {}
+
+        for pid in psutil.pids():
+            # Reuse the Process and its name from the previous cycle
+            entry = self._processes.get(pid)
+            try:
+                if entry is None:
+                    process = psutil.Process(pid)
+                    entry = [process, process.name(), None, None]
+                process = entry[0]
+                with process.oneshot():
+                    cpu_times = process.cpu_times()
+                    cpu = cpu_times.user + cpu_times.system
+                    memory = process.memory_info().rss
+                    io_bytes = _io_bytes(process)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+                continue
+            seen[pid] = entry
+
+            # Add the usage since the previous cycle to the process name
+            usage = result.get(entry[1])
+            if usage is None:
+                usage = Usage()
+                result[entry[1]] = usage
+            usage.instances += 1
+            usage.memory += memory
+            if bool(elapsed) is True:
+                usage.cpu_percent += _rate(entry[2], cpu, elapsed) * 100
+                usage.io_bytes_per_second += _rate(
+                    entry[3], io_bytes, elapsed)
+            entry[2] = cpu
+            entry[3] = io_bytes
+
+        # Forget processes that have stopped
+        self._processes = seen
+        return result
+
+    def cgroup_usage(self, elapsed):
+        """Get the resources used by each cgroup.
+
+        Args:
+            elapsed: Seconds since the previous cycle. None if there wasn't
+                one.
+
+        Returns:
+            result: Dict of Usage keyed by cgroup path
+
+        """
+        # Initialize key variables
+        result = {}
+        counters = read_cgroups(self._cgroup)
+
+        # Calculate
+        for path, (cpu, memory, io_bytes) in counters.items():
+            usage = Usage()
+            usage.instances = 1
+            usage.memory = memory
+            previous = self._cgroup_counters.get(path)
+            if bool(elapsed) is True and previous is not None:
+                usage.cpu_percent = _rate(previous[0], cpu, elapsed) * 100
+                usage.io_bytes_per_second = _rate(
+                    previous[2], io_bytes, elapsed)
+            result[path] = usage
+
+        # Save for next time
+        self._cgroup_counters = counters
+        return result
+
+
+def get(top, cgroups=False, limit=200):
+    """Get the Tracker of the current process.
+
+    Args:
+        top: Number of process names and cgroups reported for each of CPU,
+            memory and I/O usage
+        cgroups: Report cgroup usage if True
+        limit: Maximum number of DataPoints created each cycle
+
+    Returns:
+        result: Tracker
+
+    """
+    # Return
+    key = (os.getpid(), top, bool(cgroups), limit)
+    with _LOCK:
+        result = _TRACKERS.get(key)
+        if result is None:
+            _TRACKERS.clear()
+            result = Tracker(top, cgroups=cgroups, limit=limit)
+            _TRACKERS[key] = result
+    return result
+
+
+def read_cgroups(root=CGROUP):
+    """Read the CPU, memory and I/O counters of cgroups.
+
+    Both the unified (v2) and legacy (v1) cgroup hierarchies are supported.
+
+    Args:
+        root: Location of cgroup filesystems
+
+    Returns:
+        result: Dict of (CPU seconds, memory bytes, I/O bytes) tuples keyed
+            by cgroup path
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Unified hierarchy
+    if os.path.isfile(os.path.join(root, 'cgroup.controllers')) is True:
+        for path in _cgroup_paths(root):
+            directory = os.path.join(root, path)
+            cpu = _key_value(
+                os.path.join(directory, 'cpu.stat')).get('usage_usec')
+            if cpu is None:
+                continue
+            result[path] = (
+                cpu / 1000000,
+                _integer(os.path.join(directory, 'memory.current')),
+                _io_stat(os.path.join(directory, 'io.stat')))
+        return result
+
+    # Legacy hierarchy
+    cpuacct = os.path.join(root, 'cpuacct')
+    for path in _cgroup_paths(cpuacct):
+        cpu = _integer(os.path.join(cpuacct, path, 'cpuacct.usage'), None)
+        if cpu is None:
+            continue
+        result[path] = (
+            cpu / 1000000000,
+            _integer(
+                os.path.join(root, 'memory', path, 'memory.usage_in_bytes')),
+            _key_value(os.path.join(
+                root, 'blkio', path,
+                'blkio.throttle.io_service_bytes')).get('Total', 0))
+    return result
+
+
+def _top(usage, count):
+    """Get the names using the most CPU, memory and I/O.
+
+    Args:
+        usage: Dict of Usage keyed by name
+        count: Number of names to get for each resource
+
+    Returns:
+        result: List of names
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Get the names
+    for attribute in ['cpu_percent', 'memory', 'io_bytes_per_second']:
+        ranked = sorted(
+            usage, key=lambda _: getattr(usage[_], attribute), reverse=True)
+        for name in ranked[:count]:
+            if name not in result:
+                result.append(name)
+    return result
+
+
+def _datapoints(label, name, usage, metadata):
+    """Create the DataPoints of a process name or cgroup.
+
+    Args:
+        label: 'process' or 'cgroup'
+        name: Process name or cgroup path
+        usage: Usage
+        metadata: MetadataSet added to all DataPoints
+
+    Returns:
+        result: List of DataPoint objects
+
+    """
+    # Initialize key variables
+    result = []
+    meta = intern([('{}_name'.format(label), name)])
+
+    # Create
+    for key, value, data_type in [
+            ('cpu_percent', usage.cpu_percent, DATA_FLOAT),
+            ('memory', usage.memory, DATA_INT),
+            ('io_bytes_per_second', usage.io_bytes_per_second, DATA_FLOAT),
+            ('instances', usage.instances, DATA_INT)]:
+        if label == 'cgroup' and key == 'instances':
+            continue
+        datapoint = DataPoint(
+            '{}_{}'.format(label, key), value, data_type=data_type)
+        for item in [metadata, meta]:
+            if item is not None:
+                item.add_to(datapoint)
+        result.append(datapoint)
+    return result
+
+
+def _rate(previous, current, elapsed):
+    """Get the per-second rate of a counter.
+
+    Args:
+        previous: Previous value. None if there wasn't one
+        current: Current value
+        elapsed: Seconds between the values
+
+    Returns:
+        result: Rate. Zero if the counter was reset.
+
+    """
+    # Return
+    if previous is None or current < previous:
+        return 0.0
+    return (current - previous) / elapsed
+
+
+def _io_bytes(process):
+    """Get the number of bytes read and written by a process.
+
+    Args:
+        process: psutil.Process
+
+    Returns:
+        result: Number of bytes. Zero if unavailable
+
+    """
+    # Only root can read the counters of processes owned by other users
+    try:
+        counters = process.io_counters()
+    except (psutil.AccessDenied, AttributeError, NotImplementedError):
+        return 0
+    return counters.read_bytes + counters.write_bytes
+
+
+def _cgroup_paths(root):
+    """Get the paths of cgroups relative to the root of the hierarchy.
+
+    Args:
+        root: Root of the hierarchy
+
+    Returns:
+        result: List of paths
+
+    """
+    # Initialize key variables
+    result = []
+    directories = [('', 0)]
+
+    # Walk the hierarchy breadth first
+    while bool(directories) is True and len(result) < _MAX_CGROUPS:
+        (path, depth) = directories.pop(0)
+        try:
+            entries = sorted(os.listdir(os.path.join(root, path)))
+        except OSError:
+            continue
+        for entry in entries:
+            child = os.path.join(path, entry)
+            if os.path.isdir(os.path.join(root, child)) is False:
+                continue
+            result.append(child)
+            if depth + 1 < _CGROUP_DEPTH:
+                directories.append((child, depth + 1))
+    return result[:_MAX_CGROUPS]
+
+
+def _integer(filepath, default=0):
+    """Read an integer from a file.
+
+    Args:
+        filepath: Path to the file
+        default: Value returned if the file can't be read
+
+    Returns:
+        result: Integer
+
+    """
+    # Read
+    try:
+        with open(filepath, 'rb') as f_handle:
+            return int(f_handle.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return default
+
+
+def _key_value(filepath):
+    """Read a file of 'key value' lines.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        result: Dict of integers keyed by key. The value of the last line is
+            used for keys that appear more than once.
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Read
+    try:
+        with open(filepath, 'r') as f_handle:
+            lines = f_handle.read().splitlines()
+    except OSError:
+        return result
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 2:
+            try:
+                result[fields[-2]] = int(fields[-1])
+            except ValueError:
+                continue
+    return result
+
+
+def _io_stat(filepath):
+    """Get the number of bytes read and written from a cgroup v2 io.stat.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        result: Number of bytes
+
+    """
+    # Initialize key variables
+    result = 0
+
+    # Read lines like "8:0 rbytes=1 wbytes=2 rios=3 wios=4 ..."
+    try:
+        with open(filepath, 'r') as f_handle:
+            lines = f_handle.read().splitlines()
+    except OSError:
+        return result
+    for line in lines:
+        for field in line.split()[1:]:
+            (key, _, value) = field.partition('=')
+            if key in ['rbytes', 'wbytes'] and value.isdigit() is True:
+                result += int(value)
+    return result
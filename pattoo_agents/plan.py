@@ -0,0 +1,190 @@
+"""Module for polling plans compiled from agent configurations."""
+
+# Standard imports
+import collections
+import threading
+
+# Pattoo libraries
+from pattoo_shared import data
+from pattoo_shared import log
+
+# Define namedtuple types
+PlanItem = collections.namedtuple(
+    'PlanItem', 'target credentials points checksum')
+PlanDiff = collections.namedtuple('PlanDiff', 'added removed changed')
+
+# Plans last used by each agent program
+_LOCK = threading.Lock()
+_PLANS = {}
+
+
+class PollingPlan():
+    """Immutable set of everything an agent polls each cycle.
+
+    A plan is compiled once from the configuration and reused every cycle
+    until the configuration changes.
+
+    """
+
+    def __init__(self, items):
+        """Initialize the class.
+
+        Args:
+            items: List of PlanItem objects. Only one item per target is
+                kept.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        lookup = {}
+        for item in items:
+            if isinstance(item, PlanItem) is True:
+                lookup[item.target] = item
+
+        # Set variables
+        self.items = tuple(item for _, item in sorted(lookup.items()))
+        self._lookup = lookup
+        self.checksum = data.hashstring(
+            ''.join(item.checksum for item in self.items))
+
+    def __repr__(self):
+        """Return a representation of the attributes of the class.
+
+        Args:
+            None
+
+        Returns:
+            result: String representation.
+
+        """
+        # Return repr
+        return ('''\
+<{} targets={}, checksum={}>\
+'''.format(self.__class__.__name__, len(self.items), repr(self.checksum)))
+
+    def __iter__(self):
+        """Iterate over the PlanItem objects of the plan."""
+        return iter(self.items)
+
+    def __len__(self):
+        """Get the number of targets in the plan."""
+        return len(self.items)
+
+    def targets(self):
+        """Get the targets in the plan.
+
+        Args:
+            None
+
+        Returns:
+            result: Tuple of targets
+
+        """
+        # Return
+        result = tuple(item.target for item in self.items)
+        return result
+
+    def diff(self, other):
+        """Get the differences between this plan and an older one.
+
+        Args:
+            other: Older PollingPlan object. None if there wasn't one.
+
+        Returns:
+            result: PlanDiff of tuples of targets added, removed and changed
+
+        """
+        # Compare
+        if isinstance(other, PollingPlan) is False:
+            result = PlanDiff(
+                added=self.targets(), removed=tuple(), changed=tuple())
+            return result
+        result = PlanDiff(
+            added=tuple(
+                target for target in self.targets()
+                if target not in other._lookup),
+            removed=tuple(
+                target for target in other.targets()
+                if target not in self._lookup),
+            changed=tuple(
+                item.target for item in self.items
+                if item.target in other._lookup and (
+                    item.checksum != other._lookup[item.target].checksum)))
+        return result
+
+
+def plan_item(target, credentials, points):
+    """Create a PlanItem.
+
+    Args:
+        target: Target to poll
+        credentials: Object with the parameters used to access the target
+        points: List of objects to poll on the target
+
+    Returns:
+        result: PlanItem
+
+    """
+    # Initialize key variables
+    points = tuple(points)
+    checksum = data.hashstring(
+        repr(_fingerprint((target, credentials, points))))
+
+    # Return
+    result = PlanItem(
+        target=target, credentials=credentials, points=points,
+        checksum=checksum)
+    return result
+
+
+def track(agent_program, polling_plan):
+    """Track the PollingPlan used by an agent program and log changes.
+
+    Args:
+        agent_program: Agent program
+        polling_plan: PollingPlan about to be used
+
+    Returns:
+        result: PlanDiff against the previous plan for the agent program
+
+    """
+    # Nothing to do if the plan is the one used last time
+    with _LOCK:
+        previous = _PLANS.get(agent_program)
+        if previous is polling_plan:
+            return PlanDiff(added=tuple(), removed=tuple(), changed=tuple())
+        _PLANS[agent_program] = polling_plan
+
+    # Log the changes
+    result = polling_plan.diff(previous)
+    log_message = ('''\
+Agent {} polling plan updated. {} target(s) added, {} removed, {} changed\
+'''.format(agent_program, len(result.added), len(result.removed),
+           len(result.changed)))
+    log.log2debug(51571, log_message)
+    return result
+
+
+def _fingerprint(value):
+    """Create a hashable, ordered representation of an object.
+
+    Args:
+        value: Object
+
+    Returns:
+        result: Fingerprint
+
+    """
+    # Process
+    if isinstance(value, (list, tuple)) is True:
+        result = tuple(_fingerprint(item) for item in value)
+    elif isinstance(value, dict) is True:
+        result = tuple(
+            (key, _fingerprint(item)) for key, item in sorted(value.items()))
+    elif hasattr(value, '__dict__') is True:
+        result = (value.__class__.__name__, _fingerprint(vars(value)))
+    else:
+        result = value
+    return result
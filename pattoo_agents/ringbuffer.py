@@ -0,0 +1,84 @@
+"""Module for fixed size buffers of timestamped values."""
+
+# Standard imports
+from array import array
+
+
+class RingBuffer():
+    """Fixed size buffer of timestamped values. Old values are overwritten."""
+
+    __slots__ = ('size', '_values', '_timestamps', '_index', '_count')
+
+    def __init__(self, size):
+        """Initialize the class.
+
+        Args:
+            size: Maximum number of values
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.size = max(1, int(size))
+        self._values = array('d', [0.0]) * self.size
+        self._timestamps = array('d', [0.0]) * self.size
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        """Get the number of values in the buffer."""
+        return self._count
+
+    def append(self, value, timestamp):
+        """Add a value to the buffer.
+
+        Args:
+            value: Value
+            timestamp: time.monotonic() value when the value was sampled
+
+        Returns:
+            None
+
+        """
+        # Add
+        self._values[self._index] = value
+        self._timestamps[self._index] = timestamp
+        self._index = (self._index + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def latest(self):
+        """Get the timestamp of the most recent value.
+
+        Args:
+            None
+
+        Returns:
+            result: Timestamp. None if the buffer is empty
+
+        """
+        # Return
+        if bool(self._count) is False:
+            return None
+        return self._timestamps[(self._index - 1) % self.size]
+
+    def values(self, since=None):
+        """Get the values in the buffer.
+
+        Args:
+            since: Only return values sampled at or after this timestamp
+
+        Returns:
+            result: List of values, oldest first
+
+        """
+        # Initialize key variables
+        result = []
+        start = (self._index - self._count) % self.size
+
+        # Get values
+        for offset in range(self._count):
+            index = (start + offset) % self.size
+            if since is None or self._timestamps[index] >= since:
+                result.append(self._values[index])
+        return result
@@ -0,0 +1,141 @@
+"""Module used to schedule the polling cycles of agent daemons."""
+
+# Standard libraries
+import time
+
+# Pattoo libraries
+from pattoo_shared import log
+
+# Overrun policies
+OVERRUN_SKIP = 'skip'
+OVERRUN_CATCHUP = 'catchup'
+OVERRUN_STRETCH = 'stretch'
+OVERRUN_POLICIES = [OVERRUN_SKIP, OVERRUN_CATCHUP, OVERRUN_STRETCH]
+
+
+class Scheduler():
+    """Drift-free cycle scheduler based on the monotonic clock.
+
+    Deadlines are kept on a fixed grid of 'interval' seconds aligned to the
+    wall clock, so the duration of a cycle never shifts the start of the
+    cycles that follow. When a cycle overruns its deadline, the policy
+    decides what happens next:
+
+        OVERRUN_SKIP: Drop the missed ticks and wait for the next grid tick
+        OVERRUN_CATCHUP: Start the missed ticks back to back until caught up
+        OVERRUN_STRETCH: Restart the grid 'interval' seconds from now
+
+    The first cycle ends at the first grid tick, so it is usually shorter
+    than 'interval'. Overrunning it isn't counted as a missed deadline.
+
+    """
+
+    def __init__(self, interval, policy=OVERRUN_SKIP, align=True,
+                 name=None, clock=time.monotonic, wallclock=time.time,
+                 sleep=time.sleep):
+        """Initialize the class.
+
+        Args:
+            interval: Cycle interval in seconds
+            policy: Overrun policy. One of OVERRUN_POLICIES
+            align: Align ticks to multiples of interval on the wall clock
+            name: Name used when logging missed deadlines
+            clock: Monotonic clock function
+            wallclock: Wall clock function used for alignment
+            sleep: Sleep function
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.interval = max(abs(interval), 0.001)
+        self.name = name
+        self.missed = 0
+        self.cycles = 0
+        self._clock = clock
+        self._sleep = sleep
+
+        # Use a sane overrun policy
+        if policy in OVERRUN_POLICIES:
+            self.policy = policy
+        else:
+            self.policy = OVERRUN_SKIP
+
+        # Set the first deadline
+        now = self._clock()
+        if bool(align) is True:
+            self._deadline = now + (
+                self.interval - (wallclock() % self.interval))
+        else:
+            self._deadline = now + self.interval
+        self._partial = self._deadline - now < self.interval
+
+    def wait(self):
+        """Sleep until the start of the next cycle.
+
+        Args:
+            None
+
+        Returns:
+            missed: Number of deadlines missed by the cycle that just ended
+
+        """
+        # Initialize key variables
+        missed = 0
+        now = self._clock()
+        self.cycles += 1
+
+        # Move past the ticks missed by a partial first cycle
+        partial = self._partial
+        self._partial = False
+        if partial is True and now > self._deadline:
+            self._deadline += (
+                (now - self._deadline) // self.interval + 1) * self.interval
+
+        # Apply the overrun policy
+        if now > self._deadline:
+            overrun = now - self._deadline
+            if self.policy == OVERRUN_STRETCH:
+                missed = 1
+                self._deadline = now
+            elif self.policy == OVERRUN_CATCHUP:
+                missed = 1
+            else:
+                missed = int(overrun // self.interval) + 1
+                self._deadline += missed * self.interval
+
+            # Log the overrun
+            self.missed += missed
+            log_message = ('''\
+Agent {} cycle overran its deadline by {:.3f}s. Missed {} deadline(s), {} in \
+total, using the "{}" overrun policy\
+'''.format(self.name, overrun, missed, self.missed, self.policy))
+            log.log2warning(51570, log_message)
+
+        # Sleep until the deadline
+        delay = self._deadline - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+
+        # Set the next deadline
+        self._deadline += self.interval
+        return missed
+
+    def stats(self):
+        """Get scheduler statistics.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of statistics
+
+        """
+        # Return
+        result = {
+            'interval': self.interval,
+            'policy': self.policy,
+            'cycles': self.cycles,
+            'missed': self.missed}
+        return result
@@ -5,14 +5,15 @@
 from copy import deepcopy
 
 # Import project libraries
-from pattoo_shared import configuration, files
-from pattoo_shared.configuration import Config
+from pattoo_shared import configuration
+from pattoo_agents.configuration import AgentConfig
+from pattoo_agents import plan
 from pattoo_shared.variables import IPTargetPollingPoints
 from .constants import PATTOO_AGENT_SNMPD, PATTOO_AGENT_SNMP_IFMIBD
 from .variables import SNMPAuth, SNMPVariableList
 
 
-class ConfigSNMP(Config):
+class ConfigSNMP(AgentConfig):
     """Class gathers all configuration information."""
 
     def __init__(self):
@@ -26,12 +27,7 @@ class ConfigSNMP(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration directory
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_SNMPD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_SNMPD)
 
     def snmpvariables(self):
         """Get list of dicts of SNMP information in configuration file.
@@ -44,7 +40,9 @@ class ConfigSNMP(Config):
 
         """
         # Get result
-        result = _snmpvariables(PATTOO_AGENT_SNMPD, self._agent_config)
+        result = self._cached(
+            'snmpvariables',
+            lambda: _snmpvariables(PATTOO_AGENT_SNMPD, self._agent_config))
         return result
 
     def target_polling_points(self):
@@ -58,8 +56,27 @@ class ConfigSNMP(Config):
 
         """
         # Get result
-        result = _target_polling_points(
-            PATTOO_AGENT_SNMPD, self._agent_config)
+        result = self._cached(
+            'target_polling_points',
+            lambda: _target_polling_points(
+                PATTOO_AGENT_SNMPD, self._agent_config))
+        return result
+
+    def polling_plan(self):
+        """Get the compiled plan of everything to poll.
+
+        Args:
+            None
+
+        Returns:
+            result: PollingPlan object
+
+        """
+        # Get result
+        result = self._cached(
+            'polling_plan',
+            lambda: _polling_plan(
+                self.snmpvariables(), self.target_polling_points()))
         return result
 
     def polling_interval(self):
@@ -77,7 +94,7 @@ class ConfigSNMP(Config):
         return result
 
 
-class ConfigSNMPIfMIB(Config):
+class ConfigSNMPIfMIB(AgentConfig):
     """Class gathers all configuration information."""
 
     def __init__(self):
@@ -91,12 +108,7 @@ class ConfigSNMPIfMIB(Config):
 
         """
         # Instantiate inheritance
-        Config.__init__(self)
-
-        # Get the configuration directory
-        config_file = configuration.agent_config_filename(
-            PATTOO_AGENT_SNMP_IFMIBD)
-        self._agent_config = files.read_yaml_file(config_file)
+        AgentConfig.__init__(self, PATTOO_AGENT_SNMP_IFMIBD)
 
     def snmpvariables(self):
         """Get list of dicts of SNMP information in configuration file.
@@ -109,7 +121,10 @@ class ConfigSNMPIfMIB(Config):
 
         """
         # Get result
-        result = _snmpvariables(PATTOO_AGENT_SNMP_IFMIBD, self._agent_config)
+        result = self._cached(
+            'snmpvariables',
+            lambda: _snmpvariables(
+                PATTOO_AGENT_SNMP_IFMIBD, self._agent_config))
         return result
 
     def target_polling_points(self):
@@ -123,8 +138,27 @@ class ConfigSNMPIfMIB(Config):
 
         """
         # Get result
-        result = _target_polling_points(
-            PATTOO_AGENT_SNMP_IFMIBD, self._agent_config)
+        result = self._cached(
+            'target_polling_points',
+            lambda: _target_polling_points(
+                PATTOO_AGENT_SNMP_IFMIBD, self._agent_config))
+        return result
+
+    def polling_plan(self):
+        """Get the compiled plan of everything to poll.
+
+        Args:
+            None
+
+        Returns:
+            result: PollingPlan object
+
+        """
+        # Get result
+        result = self._cached(
+            'polling_plan',
+            lambda: _polling_plan(
+                self.snmpvariables(), self.target_polling_points()))
         return result
 
     def polling_interval(self):
@@ -180,6 +214,47 @@ def _target_polling_points(key, _configuration):
     return result
 
 
+def _polling_plan(snmpvariables, target_polling_points):
+    """Compile the SNMP polling plan.
+
+    Args:
+        snmpvariables: List of SNMPVariable objects
+        target_polling_points: List of IPTargetPollingPoints objects
+
+    Returns:
+        result: PollingPlan object
+
+    """
+    # Initialize key variables
+    ip_snmpvariables = {}
+    ip_polltargets = {}
+    items = []
+
+    # Create a dict of snmpvariables keyed by ip_target
+    for snmpvariable in snmpvariables:
+        ip_snmpvariables[snmpvariable.ip_target] = snmpvariable
+
+    # Create a dict of oid lists keyed by ip_target
+    for dpt in target_polling_points:
+        # Ignore invalid data
+        if dpt.valid is False:
+            continue
+
+        # Process
+        ip_polltargets.setdefault(dpt.target, []).extend(dpt.data)
+
+    # Only targets with credentials and OIDs are polled
+    for ip_target, snmpvariable in sorted(ip_snmpvariables.items()):
+        if ip_target in ip_polltargets:
+            items.append(
+                plan.plan_item(
+                    ip_target, snmpvariable, ip_polltargets[ip_target]))
+
+    # Return
+    result = plan.PollingPlan(items)
+    return result
+
+
 def _polling_interval(key, _configuration):
     """Get targets.
 
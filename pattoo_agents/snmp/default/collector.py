@@ -8,10 +8,12 @@ import multiprocessing
 # Pattoo libraries
 from pattoo_agents.snmp import snmp
 from pattoo_shared import data
-from pattoo_shared.variables import (
-    DataPoint, DataPointMetadata, TargetDataPoints, AgentPolledData)
+from pattoo_shared.variables import AgentPolledData
 from pattoo_agents.snmp.constants import PATTOO_AGENT_SNMPD
 from pattoo_agents.snmp.configuration import ConfigSNMP as Config
+from pattoo_agents.configuration import get_config
+from pattoo_agents import plan
+from pattoo_agents.batch import DataPointBatch, target_datapoints
 
 
 def poll():
@@ -27,79 +29,55 @@ def poll():
 
     """
     # Initialize key variables.
-    config = Config()
-    ip_snmpvariables = {}
-    ip_polltargets = {}
+    config = get_config(Config)
     _pi = config.polling_interval()
 
     # Initialize AgentPolledData
     agent_program = PATTOO_AGENT_SNMPD
     agentdata = AgentPolledData(agent_program, _pi)
 
-    # Get SNMP OIDs to be polled (Along with authorizations and ip_targets)
-    cfg_snmpvariables = config.snmpvariables()
-    target_poll_targets = config.target_polling_points()
-
-    # Create a dict of snmpvariables keyed by ip_target
-    for snmpvariable in cfg_snmpvariables:
-        ip_snmpvariables[snmpvariable.ip_target] = snmpvariable
-
-    # Create a dict of oid lists keyed by ip_target
-    for dpt in target_poll_targets:
-        # Ignore invalid data
-        if dpt.valid is False:
-            continue
-
-        # Process
-        next_target = dpt.target
-        if next_target in ip_polltargets:
-            ip_polltargets[next_target].extend(dpt.data)
-        else:
-            ip_polltargets[next_target] = dpt.data
+    # Get the compiled plan of OIDs, authorizations and ip_targets to poll
+    polling_plan = config.polling_plan()
+    plan.track(agent_program, polling_plan)
 
     # Poll oids for all targets and update the TargetDataPoints
-    ddv_list = _snmpwalks(ip_snmpvariables, ip_polltargets)
-    agentdata.add(ddv_list)
+    batches = _snmpwalks(polling_plan)
+    agentdata.add(target_datapoints(batches))
 
     # Return data
     return agentdata
 
 
-def _snmpwalks(ip_snmpvariables, ip_polltargets):
+def _snmpwalks(polling_plan):
     """Get PATOO_SNMP agent data.
 
     Update the TargetDataPoints with DataPoints
 
     Args:
-        ip_snmpvariables: Dict of type SNMPVariable keyed by ip_target
-        ip_polltargets: Dict keyed by ip_target with PollingPoint
-            lists to poll
+        polling_plan: PollingPlan with SNMPVariable credentials and
+            PollingPoint points for each ip_target
 
     Returns:
-        ddv_list: List of type TargetDataPoints
+        batches: List of type DataPointBatch
 
     """
     # Initialize key variables
-    arguments = []
     sub_processes_in_pool = max(1, multiprocessing.cpu_count())
 
     # Poll all targets in sequence
-    for ip_target, snmpvariable in sorted(ip_snmpvariables.items()):
-        if ip_target in ip_polltargets:
-            polltargets = ip_polltargets[ip_target]
-            arguments.append((snmpvariable, polltargets))
+    arguments = [(item.credentials, item.points) for item in polling_plan]
 
     # Create a pool of sub process resources
     with multiprocessing.Pool(processes=sub_processes_in_pool) as pool:
 
         # Create sub processes from the pool
-        ddv_list = pool.starmap(_walker, arguments)
+        batches = pool.starmap(_walker, arguments)
 
     # Wait for all the processes to end and get results
     pool.join()
 
     # Return
-    return ddv_list
+    return batches
 
 
 def _walker(snmpvariable, polltargets):
@@ -110,14 +88,13 @@ def _walker(snmpvariable, polltargets):
         polltargets: List of PollingPoint objects to poll
 
     Returns:
-        ddv: TargetDataPoints for the SNMPVariable target
+        batch: DataPointBatch for the SNMPVariable target
 
     """
     # Intialize data gathering
-    ddv = TargetDataPoints(snmpvariable.ip_target)
+    batch = DataPointBatch(snmpvariable.ip_target)
 
-    # Get list of type DataPoint
-    datapoints = []
+    # Add the polled data to the batch
     for polltarget in polltargets:
         # Get OID polling results
         query = snmp.SNMP(snmpvariable)
@@ -132,13 +109,11 @@ def _walker(snmpvariable, polltargets):
                 value = _dp.value
 
             # Update datapoints
-            datapoint = DataPoint(
+            batch.append(
                 polltarget.address,
                 value,
-                data_type=_dp.data_type)
-            datapoint.add(DataPointMetadata('oid', _dp.key))
-            datapoints.append(datapoint)
+                data_type=_dp.data_type,
+                metadata=(('oid', _dp.key),))
 
     # Return
-    ddv.add(datapoints)
-    return ddv
+    return batch
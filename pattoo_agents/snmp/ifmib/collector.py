@@ -6,11 +6,13 @@ import multiprocessing
 import collections
 
 # Pattoo libraries
-from pattoo_shared.variables import (
-    DataPointMetadata, DataPoint, TargetDataPoints, AgentPolledData)
+from pattoo_shared.variables import AgentPolledData
 from pattoo_agents.snmp.constants import PATTOO_AGENT_SNMP_IFMIBD
 from pattoo_agents.snmp.ifmib.mib_if import Query
 from pattoo_agents.snmp.configuration import ConfigSNMPIfMIB as Config
+from pattoo_agents.configuration import get_config
+from pattoo_agents import plan
+from pattoo_agents.batch import DataPointBatch, target_datapoints
 
 
 def poll():
@@ -26,79 +28,55 @@ def poll():
 
     """
     # Initialize key variables.
-    config = Config()
-    ip_snmpvariables = {}
-    ip_polltargets = {}
+    config = get_config(Config)
     _pi = config.polling_interval()
 
     # Initialize AgentPolledData
     agent_program = PATTOO_AGENT_SNMP_IFMIBD
     agentdata = AgentPolledData(agent_program, _pi)
 
-    # Get SNMP OIDs to be polled (Along with authorizations and ip_targets)
-    cfg_snmpvariables = config.snmpvariables()
-    target_poll_targets = config.target_polling_points()
-
-    # Create a dict of snmpvariables keyed by ip_target
-    for snmpvariable in cfg_snmpvariables:
-        ip_snmpvariables[snmpvariable.ip_target] = snmpvariable
-
-    # Create a dict of oid lists keyed by ip_target
-    for dpt in target_poll_targets:
-        # Ignore invalid data
-        if dpt.valid is False:
-            continue
-
-        # Process
-        next_target = dpt.target
-        if next_target in ip_polltargets:
-            ip_polltargets[next_target].extend(dpt.data)
-        else:
-            ip_polltargets[next_target] = dpt.data
+    # Get the compiled plan of OIDs, authorizations and ip_targets to poll
+    polling_plan = config.polling_plan()
+    plan.track(agent_program, polling_plan)
 
     # Poll oids for all targets and update the TargetDataPoints
-    ddv_list = _snmpwalks(ip_snmpvariables, ip_polltargets)
-    agentdata.add(ddv_list)
+    batches = _snmpwalks(polling_plan)
+    agentdata.add(target_datapoints(batches))
 
     # Return data
     return agentdata
 
 
-def _snmpwalks(ip_snmpvariables, ip_polltargets):
+def _snmpwalks(polling_plan):
     """Get PATOO_SNMP agent data.
 
     Update the TargetDataPoints with DataPoints
 
     Args:
-        ip_snmpvariables: Dict of type SNMPVariable keyed by ip_target
-        ip_polltargets: Dict keyed by ip_target with PollingPoint
-            lists to poll
+        polling_plan: PollingPlan with SNMPVariable credentials and
+            PollingPoint points for each ip_target
 
     Returns:
-        ddv_list: List of type TargetDataPoints
+        batches: List of type DataPointBatch
 
     """
     # Initialize key variables
-    arguments = []
     sub_processes_in_pool = max(1, multiprocessing.cpu_count())
 
     # Poll all targets in sequence
-    for ip_target, snmpvariable in sorted(ip_snmpvariables.items()):
-        if ip_target in ip_polltargets:
-            polltargets = ip_polltargets[ip_target]
-            arguments.append((snmpvariable, polltargets))
+    arguments = [(item.credentials, item.points) for item in polling_plan]
 
     # Create a pool of sub process resources
     with multiprocessing.Pool(processes=sub_processes_in_pool) as pool:
 
         # Create sub processes from the pool
-        ddv_list = pool.starmap(_walker, arguments)
+        batches = pool.starmap(_walker, arguments)
 
     # Wait for all the processes to end and get results
     pool.join()
 
     # Return
-    return ddv_list
+    return batches
 
 
 def _walker(snmpvariable, polltargets):
@@ -109,28 +87,28 @@ def _walker(snmpvariable, polltargets):
         polltargets: List of PollingPoint objects to poll
 
     Returns:
-        ddv: TargetDataPoints for the SNMPVariable target
+        batch: DataPointBatch for the SNMPVariable target
 
     """
     # Intialize data gathering
-    ddv = TargetDataPoints(snmpvariable.ip_target)
+    batch = DataPointBatch(snmpvariable.ip_target)
     query = Query(snmpvariable)
     results = query.everything()
-    datapoints = _create_datapoints(results)
-    ddv.add(datapoints)
-    return ddv
+    _create_datapoints(results, batch)
+    return batch
 
 
-def _create_datapoints(items):
+def _create_datapoints(items, batch):
     """Get PATOO_SNMP agent data.
 
-    Update the TargetDataPoints with DataPoints
+    Update the DataPointBatch with datapoints
 
     Args:
         items: Dict of type SNMPVariable keyed by OID branch
+        batch: DataPointBatch to update
 
     Returns:
-        result: List of DataPoints with metadata added
+        None
 
     Method:
         1) Poll all desired OIDs from the target target. Ignore shutdown
@@ -144,7 +122,6 @@ def _create_datapoints(items):
 
     """
     # Initialize key variables
-    result = []
     ifindex_lookup = _metadata(items)
 
     # Process the results
@@ -166,39 +143,27 @@ def _create_datapoints(items):
                 if bool(ifindex_lookup[ifindex].ifadminstatus) is False:
                     continue
 
-                # Create a new Datapoint keyed by MIB equivalent
-                new_key = _key(polled_datapoint.key)
-                datapoint = DataPoint(
-                    new_key,
-                    polled_datapoint.value,
-                    data_type=polled_datapoint.data_type)
-
                 # Add metadata to the datapoint
-                datapoint.add(
-                    DataPointMetadata('oid', polled_datapoint.key))
+                metadata = [('oid', polled_datapoint.key)]
                 if bool(ifindex_lookup[ifindex].ifdescr) is True:
-                    datapoint.add(
-                        DataPointMetadata(
-                            'ifDescr',
-                            ifindex_lookup[ifindex].ifdescr))
+                    metadata.append(
+                        ('ifDescr', ifindex_lookup[ifindex].ifdescr))
                 if bool(ifindex_lookup[ifindex].ifname) is True:
-                    datapoint.add(
-                        DataPointMetadata(
-                            'ifName',
-                            ifindex_lookup[ifindex].ifname))
+                    metadata.append(
+                        ('ifName', ifindex_lookup[ifindex].ifname))
 
                 # Add metadata to the datapoint (Don't update checksum as this
                 # value may change over time via configuration)
                 if bool(ifindex_lookup[ifindex].ifalias) is True:
-                    datapoint.add(
-                        DataPointMetadata(
-                            'ifAlias',
-                            ifindex_lookup[ifindex].ifalias,
-                            update_checksum=False))
-
-                result.append(datapoint)
+                    metadata.append(
+                        ('ifAlias', ifindex_lookup[ifindex].ifalias, False))
 
-    return result
+                # Create a new datapoint keyed by MIB equivalent
+                batch.append(
+                    _key(polled_datapoint.key),
+                    polled_datapoint.value,
+                    data_type=polled_datapoint.data_type,
+                    metadata=metadata)
 
 
 def _metadata(results):
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare the psutil and /proc data gathering of the OS agent."""
+
+from __future__ import print_function
+import argparse
+import os
+import sys
+import timeit
+
+# PIP libraries
+import psutil
+
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+
+# Import pattoo libraries
+from pattoo_agents.os import collector, procfs
+
+
+def main():
+    """Time each Performance method with and without the /proc fast path.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Get the number of iterations
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--count', type=int, default=200,
+        help='Number of times each method is run.')
+    args = parser.parse_args()
+
+    # Nothing to compare without /proc
+    if procfs.available() is False:
+        print('The /proc fast path is not available on this system.')
+        sys.exit(1)
+
+    # Time the raw data gathering
+    reader = procfs.reader()
+    sources = [
+        ('process_count', lambda: len(psutil.pids()), reader.process_count),
+        ('cpu_times+stats',
+         lambda: (psutil.cpu_times(), psutil.cpu_stats()), reader.stat),
+        ('virtual_memory', psutil.virtual_memory, reader.virtual_memory),
+        ('disk_io', lambda: psutil.disk_io_counters(perdisk=True),
+         reader.disk_io_counters),
+        ('network_io', lambda: psutil.net_io_counters(pernic=True),
+         reader.net_io_counters)]
+    _print(
+        'Source', [(name, _timeit(slow, args.count), _timeit(
+            fast, args.count)) for (name, slow, fast) in sources])
+    print()
+
+    # Time each Performance method, including the creation of datapoints
+    paths = {
+        'psutil': collector.Performance(procfs=False),
+        'procfs': collector.Performance(procfs=True)}
+    methods = ['stats_system', 'stats_disk_io', 'stats_network']
+    _print(
+        'Method', [(method, _timeit(
+            getattr(paths['psutil'], method), args.count), _timeit(
+                getattr(paths['procfs'], method), args.count))
+                   for method in methods])
+
+
+def _timeit(function, count):
+    """Get the average run time of a function.
+
+    Args:
+        function: Function to time
+        count: Number of times to run the function
+
+    Returns:
+        result: Average run time in milliseconds
+
+    """
+    # Return
+    result = timeit.timeit(function, number=count) * 1000 / count
+    return result
+
+
+def _print(title, rows):
+    """Print benchmark results.
+
+    Args:
+        title: Title of the first column
+        rows: List of (name, psutil time, procfs time) tuples
+
+    Returns:
+        None
+
+    """
+    # Print
+    print('{:<18}{:>12}{:>12}{:>10}'.format(
+        title, 'psutil (ms)', 'procfs (ms)', 'Speedup'))
+    for (name, slow, fast) in rows:
+        print('{:<18}{:>12.3f}{:>12.3f}{:>9.1f}x'.format(
+            name, slow, fast, slow / max(fast, 1e-9)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Test the modbus tcp collector module."""
+
+# Standard imports
+import threading
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                os.path.abspath(os.path.join(
+                        EXEC_DIR,
+                        os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = ('''\
+{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}modbus{0}tcp'''.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# PIP libraries
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.bit_read_message import (
+    ReadCoilsResponse, ReadDiscreteInputsResponse)
+from pymodbus.register_read_message import (
+    ReadHoldingRegistersResponse, ReadInputRegistersResponse)
+
+# Pattoo imports
+from pattoo_shared.constants import DATA_INT, DATA_FLOAT
+from pattoo_agents.batch import DataPointBatch
+from pattoo_agents.modbus import decoding, planner
+from pattoo_agents.modbus.tcp import collector, configuration, connections
+from pattoo_agents.modbus.variables import (
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable)
+from tests.libraries.configuration import UnittestConfig
+
+
+class Client():
+    """Fake ModbusTcpClient returning the address of each register."""
+
+    instances = []
+
+    def __init__(self, host, port=502, timeout=3):
+        """Initialize the class."""
+        self.host = host
+        self.reads = []
+        self.closed = False
+        self.error = None
+        Client.instances.append(self)
+
+    def read_input_registers(self, address, count=1, unit=0):
+        """Read input registers."""
+        self.reads.append(('input', address, count, unit))
+        if self.error is not None:
+            raise self.error
+        return ReadInputRegistersResponse(
+            list(range(address, address + count)))
+
+    def read_holding_registers(self, address, count=1, unit=0):
+        """Read holding registers."""
+        self.reads.append(('holding', address, count, unit))
+        return ReadHoldingRegistersResponse(
+            list(range(address, address + count)))
+
+    def read_coils(self, address, count=1, unit=0):
+        """Read coils."""
+        self.reads.append(('coil', address, count, unit))
+        return ReadCoilsResponse([bool(_ % 2) for _ in range(count)])
+
+    def read_discrete_inputs(self, address, count=1, unit=0):
+        """Read discrete inputs."""
+        self.reads.append(('discrete', address, count, unit))
+        return ReadDiscreteInputsResponse([True] * count)
+
+    def close(self):
+        """Close the connection."""
+        self.closed = True
+
+
+class Engine():
+    """Fake asyncio engine reading registers with a Client."""
+
+    def __init__(self):
+        """Initialize the class."""
+        self.client = Client('target')
+        self.arguments = None
+
+    def poll(self, arguments):
+        """Read registers."""
+        self.arguments = arguments
+        result = []
+        for argument in arguments:
+            variables = argument[1]
+            responses = []
+            for _rv in variables:
+                if isinstance(_rv, InputRegisterVariable):
+                    responses.append(self.client.read_input_registers(
+                        _rv.address, count=_rv.count, unit=_rv.unit))
+                else:
+                    responses.append(self.client.read_holding_registers(
+                        _rv.address, count=_rv.count, unit=_rv.unit))
+            result.append(responses)
+        return result
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def setUp(self):
+        """Reset the fake clients."""
+        Client.instances = []
+
+    def test__serial_poller(self):
+        """Testing function _serial_poller."""
+        # Initialize key variables
+        pool = connections.Connections(factory=Client)
+        variables = planner.plan([
+            InputRegisterVariable(register=30001, count=2, unit=1),
+            HoldingRegisterVariable(
+                register=40011, count=2, unit=1, multiplier=2),
+            HoldingRegisterVariable(
+                register=40012, count=1, unit=1, multiplier=3)])
+
+        # All registers are read over one connection
+        for _ in range(2):
+            batch = collector._serial_poller('target', variables, pool)
+        self.assertEqual(len(Client.instances), 1)
+        self.assertEqual(Client.instances[0].reads, [
+            ('holding', 10, 2, 1), ('input', 0, 2, 1)] * 2)
+
+        # Multipliers are applied to the registers read
+        result = list(zip(batch.keys, batch.values))
+        self.assertEqual(result, [
+            ('holding_register_40011', 20), ('holding_register_40012', 22),
+            ('holding_register_40012', 33),
+            ('input_register_30001', 0), ('input_register_30002', 1)])
+
+        # Connections are replaced after a failure
+        Client.instances[0].error = ConnectionException('down')
+        with mock.patch.object(collector.log, 'log2warning') as log2warning:
+            batch = collector._serial_poller('target', variables[1:], pool)
+            self.assertEqual(log2warning.call_args[0][0], 51028)
+        self.assertEqual(len(batch.keys), 0)
+        self.assertEqual(Client.instances[0].closed, True)
+        collector._serial_poller('target', variables[1:], pool)
+        self.assertEqual(len(Client.instances), 2)
+
+    def test__serial_poller_connections(self):
+        """Testing function _serial_poller with several connections."""
+        # Initialize key variables
+        barrier = threading.Barrier(2, timeout=5)
+
+        class _Client(Client):
+            def read_input_registers(self, address, count=1, unit=0):
+                barrier.wait()
+                return Client.read_input_registers(
+                    self, address, count=count, unit=unit)
+
+        pool = connections.Connections(size=2, factory=_Client)
+        variables = planner.plan([
+            InputRegisterVariable(register=30001, unit=1),
+            InputRegisterVariable(register=30001, unit=2)])
+
+        # Both reads must be in progress at the same time to pass the
+        # barrier
+        batch = collector._serial_poller('target', variables, pool)
+        self.assertEqual(len(Client.instances), 2)
+        self.assertEqual(batch.keys, ['input_register_30001'] * 2)
+        self.assertEqual(len(set(batch.metadata_ids)), 2)
+
+    def test__serial_poller_bits(self):
+        """Testing function _serial_poller with coils and discrete inputs."""
+        # Initialize key variables
+        pool = connections.Connections(factory=Client)
+        variables = planner.plan([
+            CoilVariable(register=1, count=3, unit=1),
+            CoilVariable(register=2, count=1, unit=1, multiplier=5),
+            DiscreteInputVariable(register=10001, count=2, unit=1)])
+
+        # Coils and discrete inputs are read in bulk
+        batch = collector._serial_poller('target', variables, pool)
+        self.assertEqual(Client.instances[0].reads, [
+            ('coil', 0, 3, 1), ('discrete', 0, 2, 1)])
+        result = list(zip(batch.keys, batch.values))
+        self.assertEqual(result, [
+            ('coil_1', 0), ('coil_2', 1), ('coil_2', 5), ('coil_3', 0),
+            ('discrete_input_10001', 1), ('discrete_input_10002', 1)])
+
+    def test__serial_poller_gateway(self):
+        """Testing function _serial_poller with a gateway."""
+        # Initialize key variables
+        pool = connections.Connections(factory=Client)
+        gateway = configuration.Gateway(
+            max_requests=1, inter_frame_delay=0.5)
+        variables = planner.plan([
+            InputRegisterVariable(register=30001, unit=2),
+            InputRegisterVariable(register=30001, unit=1),
+            HoldingRegisterVariable(register=40001, unit=1)])
+
+        # Units are read in order, with a delay between requests
+        with mock.patch.object(collector.time, 'sleep') as sleep:
+            batch = collector._serial_poller(
+                'target', variables, pool, gateway)
+        self.assertEqual(len(batch.keys), 3)
+        self.assertEqual(Client.instances[0].reads, [
+            ('holding', 0, 1, 1), ('input', 0, 1, 1), ('input', 0, 1, 2)])
+        delays = [_[0][0] for _ in sleep.call_args_list]
+        self.assertEqual(len(delays), 3)
+        self.assertEqual(delays[0], 0)
+        for delay in delays[1:]:
+            self.assertTrue(0.4 < delay <= 0.5)
+
+        # Targets that aren't gateways aren't delayed
+        with mock.patch.object(collector.time, 'sleep') as sleep:
+            collector._serial_poller('target', variables, pool)
+        self.assertEqual(sleep.call_count, 0)
+
+    def test__async_poller(self):
+        """Testing function _async_poller."""
+        # Initialize key variables
+        pool = connections.Connections(factory=Client)
+        _engine = Engine()
+        variables = planner.plan([
+            InputRegisterVariable(register=30001, count=2, unit=1),
+            HoldingRegisterVariable(
+                register=40011, count=2, unit=1, multiplier=2)])
+
+        # The same data is polled as with threads
+        expected = collector._serial_poller('target', variables, pool)
+        gateway = configuration.Gateway(
+            max_requests=1, inter_frame_delay=0.1)
+        batches = collector._async_poller(
+            _engine, [('target', variables + [None], gateway)])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0].target, 'target')
+        self.assertEqual(batches[0].keys, expected.keys)
+        self.assertEqual(list(batches[0].values), list(expected.values))
+        self.assertEqual(_engine.client.reads, Client.instances[0].reads)
+        self.assertEqual(
+            _engine.arguments,
+            [('target', [_.variable for _ in variables], gateway)])
+
+        # Failed reads are skipped
+        _engine.poll = lambda arguments: [[None, None]]
+        batches = collector._async_poller(
+            _engine, [('target', variables, None)])
+        self.assertEqual(len(batches[0].keys), 0)
+
+    def test__add(self):
+        """Testing function _add."""
+        # Initialize key variables
+        batch = DataPointBatch('target')
+        int32 = decoding.encoding(data_type='int32', word_order='little')
+        float32 = decoding.encoding(data_type='float32')
+        registerread = planner.RegisterRead(
+            HoldingRegisterVariable(register=40001, count=5, unit=1), [
+                planner.Point(40001, 0, 2),
+                planner.Point(40002, 1, 1, int32),
+                planner.Point(40004, 3, 10, float32),
+                planner.Point(40005, 4, 1, float32)])
+        response = ReadHoldingRegistersResponse(
+            [7, 0xFFFF, 0xFFFE, 0x3FC0, 0x0000])
+
+        # Values are decoded, multiplied and typed
+        collector._add(batch, 'target', registerread, response)
+        self.assertEqual(batch.keys, [
+            'holding_register_40001', 'holding_register_40002',
+            'holding_register_40004'])
+        self.assertEqual(list(batch.values), [14, -65537, 15.0])
+        self.assertEqual(
+            [_.data_type for _ in batch.datapoints()],
+            [DATA_INT, DATA_INT, DATA_FLOAT])
+
+    def test__read(self):
+        """Testing function _read."""
+        # Initialize key variables
+        lease = connections.Lease(mock.Mock())
+        variable = InputRegisterVariable(register=30001)
+
+        # Connections that return I/O errors are discarded
+        lease.client.read_input_registers.return_value = ModbusIOException()
+        with mock.patch.object(collector.log, 'log2warning'):
+            (key, response) = collector._read(lease, 'target', variable)
+        self.assertEqual(key, 'input_register')
+        self.assertEqual(response.isError(), True)
+        self.assertEqual(lease.broken, True)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
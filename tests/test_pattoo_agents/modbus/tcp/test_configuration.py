@@ -4,6 +4,7 @@
 import sys
 import unittest
 import os
+from unittest import mock
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -25,10 +26,11 @@ else:
     sys.exit(2)
 
 # Pattoo imports
+from pattoo_agents.modbus import decoding
 from pattoo_agents.modbus.tcp import configuration
 from pattoo_agents.modbus.variables import (
     InputRegisterVariable, HoldingRegisterVariable, RegisterVariable,
-    TargetRegisterVariables)
+    CoilVariable, DiscreteInputVariable, TargetRegisterVariables)
 from tests.libraries.configuration import UnittestConfig
 
 
@@ -53,6 +55,112 @@ class TestConfigModbusTCP(unittest.TestCase):
         result = self.config.polling_interval()
         self.assertEqual(result, expected)
 
+    def test_connections(self):
+        """Testing method / function connections."""
+        # Initialize key values
+        expected = 1
+
+        # Test
+        result = self.config.connections()
+        self.assertEqual(result, expected)
+
+    def test_engine(self):
+        """Testing method / function engine."""
+        # Initialize key values
+        expected = 'threads'
+
+        # Test
+        result = self.config.engine()
+        self.assertEqual(result, expected)
+
+    def test_pipeline(self):
+        """Testing method / function pipeline."""
+        # Initialize key values
+        expected = 1
+
+        # Test
+        result = self.config.pipeline()
+        self.assertEqual(result, expected)
+
+    def test_gateways(self):
+        """Testing method / function gateways."""
+        # Initialize key values
+        expected = {}
+
+        # Test
+        result = self.config.gateways()
+        self.assertEqual(result, expected)
+
+    def test__gateways(self):
+        """Testing method / function _gateways."""
+        # Initialize key values
+        config = configuration.ConfigModbusTCP()
+        config._agent_config = {
+            'pattoo_agent_modbustcpd': {
+                'gateways': [
+                    {'ip_targets': ['gw1', 'gw2']},
+                    {'ip_targets': ['gw3'], 'max_requests': 2,
+                     'inter_frame_delay': 0.05},
+                    {'max_requests': 3},
+                    'gw4']}}
+
+        # Test
+        result = config._gateways()
+        self.assertEqual(result, {
+            'gw1': configuration.Gateway(1, 0),
+            'gw2': configuration.Gateway(1, 0),
+            'gw3': configuration.Gateway(2, 0.05)})
+
+    def test_max_register_gap(self):
+        """Testing method / function max_register_gap."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.max_register_gap()
+        self.assertEqual(result, expected)
+
+    def test__create_drv_encodings(self):
+        """Testing method / function _create_drv with encodings."""
+        # Initialize key variables
+        float32 = decoding.encoding(data_type='float32')
+        data = {
+            'ip_targets': ['127.0.0.1'],
+            'holding_registers': [
+                {'address': 40001},
+                {'address': 40002},
+                {'address': 40003, 'data_type': 'float32'},
+                {'address': 40005, 'data_type': 'float32'},
+                {'address': 40007, 'data_type': 'float16'}]}
+
+        # Values spanning several registers are read one by one
+        result = self.config._create_drv(data, 'holding_registers')
+        self.assertEqual(len(result), 1)
+        self.assertEqual(
+            [(_.register, _.count, _.encoding) for _ in result[0].data],
+            [(40003, 2, float32), (40005, 2, float32),
+             (40001, 2, decoding.DEFAULT)])
+
+    def test__create_drv_bits(self):
+        """Testing method / function _create_drv with coils."""
+        # Initialize key variables
+        data = {
+            'ip_targets': ['127.0.0.1'],
+            'coils': [
+                {'address': 1}, {'address': 2},
+                {'address': 5, 'data_type': 'float32'}],
+            'discrete_inputs': [{'address': 10001}]}
+
+        # Test
+        result = self.config._create_drv(data, 'coils')
+        self.assertEqual(
+            [(type(_), _.register, _.count) for _ in result[0].data],
+            [(CoilVariable, 1, 2), (CoilVariable, 5, 1)])
+        result = self.config._create_drv(data, 'discrete_inputs')
+        self.assertEqual(
+            [(type(_), _.register, _.count) for _ in result[0].data],
+            [(DiscreteInputVariable, 10001, 1)])
+
     def test_registervariables(self):
         """Testing method / function registervariables."""
         # Initialize variables
@@ -237,6 +345,49 @@ class TestBasicFunctions(unittest.TestCase):
         # Tested by test_registervariables
         pass
 
+    def test__polling_plan(self):
+        """Testing method / function _polling_plan."""
+        # Initialize key variables
+        gateway = configuration.Gateway(1, 0.05)
+        drvs = []
+        for ip_target in ['gw', 'plc']:
+            drv = TargetRegisterVariables(ip_target)
+            drv.add([InputRegisterVariable(register=30001)])
+            drvs.append(drv)
+
+        # Gateways are the credentials of their targets
+        result = configuration._polling_plan(drvs, gateways={'gw': gateway})
+        self.assertEqual(
+            [(_.target, _.credentials) for _ in result],
+            [('gw', gateway), ('plc', None)])
+
+        # Changing the limits of a gateway changes its checksum
+        other = configuration._polling_plan(
+            drvs, gateways={'gw': configuration.Gateway(2, 0.05)})
+        self.assertEqual(other.diff(result).changed, ('gw',))
+
+    def test__get_encodings(self):
+        """Testing method / function _get_encodings."""
+        # Initialize key variables
+        items = [
+            {'address': 40001},
+            {'address': 40002, 'data_type': 'float32',
+             'word_order': 'little'},
+            {'address': 40004, 'data_type': 'float16'},
+            40005,
+            {'data_type': 'int32'}]
+
+        # Test
+        with mock.patch.object(configuration.log, 'log2warning') as warning:
+            result = configuration._get_encodings(items)
+        self.assertEqual(warning.call_args[0][0], 51594)
+        self.assertEqual(result, {
+            40001: decoding.DEFAULT,
+            40002: decoding.encoding(
+                data_type='float32', word_order='little'),
+            40004: None})
+        self.assertEqual(configuration._get_encodings(None), {})
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Test the modbus tcp connections module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                os.path.abspath(os.path.join(
+                        EXEC_DIR,
+                        os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = ('''\
+{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}modbus{0}tcp'''.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.modbus.tcp import connections
+from tests.libraries.configuration import UnittestConfig
+
+
+class Client():
+    """Fake ModbusTcpClient."""
+
+    def __init__(self, host, port=502, timeout=3):
+        """Initialize the class."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.closed = False
+
+    def close(self):
+        """Close the connection."""
+        self.closed = True
+
+
+class TestConnections(unittest.TestCase):
+    """Checks all Connections methods."""
+
+    def test_lease(self):
+        """Testing method / function lease."""
+        # Initialize key variables
+        item = connections.Connections(timeout=5, factory=Client)
+
+        # Clients are reused
+        with item.lease('a') as lease:
+            client = lease.client
+            self.assertEqual(
+                (client.host, client.port, client.timeout), ('a', 502, 5))
+        with item.lease('a') as lease:
+            self.assertIs(lease.client, client)
+        with item.lease('a', port=503) as lease:
+            self.assertIsNot(lease.client, client)
+        self.assertEqual(len(item), 2)
+
+        # Discarded clients are closed and replaced
+        with item.lease('a') as lease:
+            lease.discard()
+        self.assertEqual(client.closed, True)
+        with item.lease('a') as lease:
+            self.assertIsNot(lease.client, client)
+            client = lease.client
+
+        # So are clients that raised exceptions
+        with self.assertRaises(ValueError):
+            with item.lease('a') as lease:
+                raise ValueError()
+        self.assertEqual(client.closed, True)
+
+    def test_size(self):
+        """Testing the maximum number of connections to a target."""
+        # Initialize key variables
+        item = connections.Connections(size=2, factory=Client)
+        clients = set()
+        busy = []
+        lock = threading.Lock()
+
+        def _read():
+            with item.lease('a') as lease:
+                with lock:
+                    clients.add(lease.client)
+                    busy.append(1)
+                    self.assertLessEqual(len(busy), 2)
+                time.sleep(0.01)
+                with lock:
+                    busy.pop()
+
+        # Test
+        threads = [threading.Thread(target=_read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(len(item), 2)
+
+    def test_prune(self):
+        """Testing method / function prune."""
+        # Initialize key variables
+        item = connections.Connections(factory=Client)
+        with item.lease('a') as lease:
+            client_a = lease.client
+        with item.lease('b') as lease:
+            client_b = lease.client
+
+            # Connections in use are closed when released
+            item.prune(['b'])
+            self.assertEqual(client_b.closed, False)
+        self.assertEqual(client_b.closed, True)
+        self.assertEqual(client_a.closed, False)
+        self.assertEqual(len(item), 1)
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Initialize key variables
+        item = connections.Connections(factory=Client)
+        with item.lease('a') as lease:
+            client = lease.client
+
+        # Test
+        item.close()
+        self.assertEqual(client.closed, True)
+        self.assertEqual(len(item), 0)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_get(self):
+        """Testing function get."""
+        # Test
+        result = connections.get(2)
+        self.assertIs(connections.get(2), result)
+        self.assertEqual(result.size, 2)
+        self.assertIsNot(connections.get(1), result)
+        connections.close()
+        self.assertIsNot(connections.get(1), result)
+        connections.close()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
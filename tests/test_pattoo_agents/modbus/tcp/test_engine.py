@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Test the modbus tcp engine module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import socketserver
+import struct
+import threading
+import time
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                os.path.abspath(os.path.join(
+                        EXEC_DIR,
+                        os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = ('''\
+{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}modbus{0}tcp'''.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# PIP libraries
+from pymodbus.bit_read_message import ReadCoilsResponse
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.register_read_message import (
+    ReadHoldingRegistersResponse, ReadInputRegistersResponse)
+
+# Pattoo imports
+from pattoo_agents.modbus.tcp import configuration, engine
+from pattoo_agents.modbus.variables import (
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable)
+from tests.libraries.configuration import UnittestConfig
+
+
+class Handler(socketserver.BaseRequestHandler):
+    """Fake Modbus TCP target.
+
+    Requests are answered in reverse order once the number of requests set
+    by the server has arrived. The values of registers are their addresses.
+    Unit 99 returns exceptions and unit 98 never responds.
+
+    """
+
+    def handle(self):
+        """Answer requests."""
+        frames = []
+        while True:
+            header = self._read(7)
+            if header is None:
+                return
+            (transaction, _, length, unit) = struct.unpack('>HHHB', header)
+            body = self._read(length - 1)
+            self.server.requests.append((transaction, unit, body))
+            frames.append((transaction, unit, body))
+            if len(frames) < self.server.batch:
+                continue
+            for (transaction, unit, body) in reversed(frames):
+                if unit == 98:
+                    continue
+                (function, address, count) = struct.unpack('>BHH', body)
+                if unit == 99:
+                    response = ExceptionResponse(function, 2)
+                elif function in [1, 2]:
+                    response = ReadCoilsResponse(
+                        [bool(_ % 2) for _ in range(address, address + count)])
+                    response.function_code = function
+                elif function == 4:
+                    response = ReadInputRegistersResponse(
+                        list(range(address, address + count)))
+                else:
+                    response = ReadHoldingRegistersResponse(
+                        list(range(address, address + count)))
+                pdu = bytes([response.function_code]) + response.encode()
+                self.request.sendall(struct.pack(
+                    '>HHHB', transaction, 0, len(pdu) + 1, unit) + pdu)
+            frames = []
+
+    def _read(self, size):
+        """Read bytes."""
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if bool(chunk) is False:
+                return None
+            data += chunk
+        return data
+
+
+class Server(socketserver.ThreadingTCPServer):
+    """Fake Modbus TCP server."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, batch=1):
+        """Initialize the class."""
+        socketserver.ThreadingTCPServer.__init__(
+            self, ('127.0.0.1', 0), Handler)
+        self.batch = batch
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the server."""
+        self.shutdown()
+        self.server_close()
+
+
+class TestEngine(unittest.TestCase):
+    """Checks all Engine methods."""
+
+    def test_poll(self):
+        """Testing method / function poll."""
+        # Initialize key variables
+        server = Server(batch=2)
+        item = engine.Engine(pipeline=2, port=server.server_address[1])
+        variables = [
+            InputRegisterVariable(register=30001, count=2, unit=1),
+            HoldingRegisterVariable(register=40011, count=3, unit=2)]
+
+        # Responses are matched to pipelined requests
+        for _ in range(2):
+            result = item.poll([('127.0.0.1', variables)])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0][0].registers, [0, 1])
+        self.assertEqual(result[0][1].registers, [10, 11, 12])
+        self.assertEqual(len(server.requests), 4)
+        self.assertEqual(
+            len(set(_[0] for _ in server.requests[:2])), 2)
+        self.assertEqual([_[1] for _ in server.requests], [1, 2, 1, 2])
+
+        # The connection is kept between polls
+        self.assertEqual(len(item), 1)
+
+        # Coils and discrete inputs
+        result = item.poll([('127.0.0.1', [
+            CoilVariable(register=2, count=3),
+            DiscreteInputVariable(register=10001, count=2)])])
+        self.assertEqual(result[0][0].bits[:3], [True, False, True])
+        self.assertEqual(result[0][1].bits[:2], [False, True])
+        self.assertEqual(
+            [struct.unpack('>B', _[2][:1])[0] for _ in server.requests[-2:]],
+            [1, 2])
+
+        # Invalid variables aren't read
+        result = item.poll([('127.0.0.1', [InputRegisterVariable()])])
+        self.assertEqual(result, [[None]])
+
+        # Connections to removed targets are closed
+        item.prune(['127.0.0.1'])
+        self.assertEqual(len(item), 0)
+        item.close()
+        server.stop()
+
+    def test_poll_errors(self):
+        """Testing method / function poll with failures."""
+        # Initialize key variables
+        server = Server()
+        port = server.server_address[1]
+        item = engine.Engine(timeout=0.5, port=port)
+
+        # Exception responses are returned
+        result = item.poll([(
+            '127.0.0.1', [InputRegisterVariable(register=30001, unit=99)])])
+        self.assertEqual(result[0][0].isError(), True)
+        self.assertEqual(result[0][0].exception_code, 2)
+
+        # Timeouts close the connection
+        with mock.patch.object(engine.log, 'log2warning') as log2warning:
+            result = item.poll([(
+                '127.0.0.1',
+                [InputRegisterVariable(register=30001, unit=98)])])
+            self.assertEqual(log2warning.call_args[0][0], 51592)
+        self.assertEqual(result, [[None]])
+        self.assertEqual(len(item), 0)
+
+        # The next poll reconnects
+        result = item.poll([(
+            '127.0.0.1', [InputRegisterVariable(register=30001, unit=1)])])
+        self.assertEqual(result[0][0].registers, [0])
+        item.close()
+        server.stop()
+
+        # Targets that can't be reached
+        item = engine.Engine(timeout=0.5, port=port)
+        with mock.patch.object(engine.log, 'log2warning') as log2warning:
+            result = item.poll([(
+                '127.0.0.1', [InputRegisterVariable(register=30001)])])
+            self.assertEqual(log2warning.call_args[0][0], 51591)
+        self.assertEqual(result, [[None]])
+        item.close()
+
+    def test_poll_gateway(self):
+        """Testing method / function poll with a gateway."""
+        # Initialize key variables
+        server = Server()
+        item = engine.Engine(pipeline=4, port=server.server_address[1])
+        gateway = configuration.Gateway(
+            max_requests=1, inter_frame_delay=0.1)
+        variables = [
+            InputRegisterVariable(register=30001, unit=1),
+            InputRegisterVariable(register=30002, unit=2),
+            InputRegisterVariable(register=30003, unit=3)]
+
+        # Requests are sent one at a time, in order, and spaced out. The
+        # server only answers requests one at a time so the poll would
+        # still work without the limit
+        start = time.monotonic()
+        result = item.poll([('127.0.0.1', variables, gateway)])
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual([_.registers for _ in result[0]], [[0], [1], [2]])
+        self.assertEqual([_[1] for _ in server.requests], [1, 2, 3])
+        connection = item._connections[('127.0.0.1', item.port)]
+        self.assertEqual((connection.pipeline, connection.delay), (1, 0.1))
+
+        # The connection is replaced when the limits change
+        item.poll([('127.0.0.1', variables[:1])])
+        self.assertIsNot(
+            item._connections[('127.0.0.1', item.port)], connection)
+        self.assertEqual(
+            item._connections[('127.0.0.1', item.port)].pipeline, 4)
+        item.close()
+        server.stop()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Engines are reused until the pipeline changes
+        result = engine.get(2)
+        self.assertIs(engine.get(2), result)
+        self.assertEqual(result.pipeline, 2)
+        other = engine.get(3)
+        self.assertIsNot(other, result)
+        self.assertEqual(result._loop.is_closed(), True)
+        engine.close()
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Test
+        result = engine.get()
+        engine.close()
+        self.assertEqual(result._loop.is_closed(), True)
+        self.assertIsNot(engine.get(), result)
+        engine.close()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the tests
+    unittest.main()
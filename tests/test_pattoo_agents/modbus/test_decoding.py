@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Test module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}modbus'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Standard imports
+import struct
+
+# Pattoo imports
+from pattoo_shared.constants import DATA_INT, DATA_FLOAT
+from pattoo_agents.modbus import decoding
+from pattoo_agents.modbus.planner import Point
+from tests.libraries.configuration import UnittestConfig
+
+
+def _registers(fmt, value):
+    """Get the big endian registers of a packed value."""
+    data = struct.pack(fmt, value)
+    return list(struct.unpack('>{}H'.format(len(data) // 2), data))
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_encoding(self):
+        """Testing function encoding."""
+        # Test
+        self.assertEqual(decoding.encoding(), decoding.DEFAULT)
+        result = decoding.encoding(
+            data_type='Float32', byte_order='little', word_order=' LITTLE ')
+        self.assertEqual(result, ('float32', 'little', 'little'))
+        self.assertIsNone(decoding.encoding(data_type='float16'))
+        self.assertIsNone(decoding.encoding(byte_order='middle'))
+        self.assertIsNone(decoding.encoding(word_order=1))
+
+    def test_size(self):
+        """Testing function size."""
+        # Test
+        self.assertEqual(decoding.size(decoding.DEFAULT), 1)
+        for (data_type, expected) in [
+                ('int16', 1), ('int32', 2), ('float32', 2), ('uint64', 4),
+                ('float64', 4)]:
+            result = decoding.size(decoding.encoding(data_type=data_type))
+            self.assertEqual(result, expected)
+
+    def test_data_type(self):
+        """Testing function data_type."""
+        # Test
+        self.assertEqual(decoding.data_type(decoding.DEFAULT), DATA_INT)
+        self.assertEqual(
+            decoding.data_type(decoding.encoding(data_type='int64')),
+            DATA_INT)
+        self.assertEqual(
+            decoding.data_type(decoding.encoding(data_type='float64')),
+            DATA_FLOAT)
+
+    def test_decode(self):
+        """Testing function decode."""
+        # Initialize key variables
+        registers = (
+            [0xFFFE] + _registers('>i', -70000) + _registers('>f', 1.5) +
+            _registers('>Q', 2 ** 40 + 7) + _registers('>d', -0.25))
+        points = [
+            Point(1, 0, 1),
+            Point(2, 0, 1, decoding.encoding(data_type='int16')),
+            Point(3, 1, 1, decoding.encoding(data_type='int32')),
+            Point(4, 3, 1, decoding.encoding(data_type='float32')),
+            Point(5, 5, 1, decoding.encoding(data_type='uint64')),
+            Point(6, 9, 1, decoding.encoding(data_type='float64')),
+            Point(7, 12, 1, decoding.encoding(data_type='float64')),
+            Point(8, 13, 1)]
+
+        # Test
+        result = decoding.decode(registers, points)
+        self.assertEqual(
+            result, [65534, -2, -70000, 1.5, 2 ** 40 + 7, -0.25, None, None])
+
+    def test_decode_bits(self):
+        """Testing function decode_bits."""
+        # Test
+        bits = [True, False, True] + [False] * 5
+        points = [Point(1, 0, 1), Point(2, 1, 1), Point(3, 2, 1),
+                  Point(9, 8, 1)]
+        result = decoding.decode_bits(bits, points)
+        self.assertEqual(result, [1, 0, 1, None])
+
+    def test_decode_orders(self):
+        """Testing function decode with byte and word orders."""
+        # Registers of 0x01020304 in each order
+        expected = 0x01020304
+        for (byte_order, word_order, registers) in [
+                ('big', 'big', [0x0102, 0x0304]),
+                ('little', 'big', [0x0201, 0x0403]),
+                ('big', 'little', [0x0304, 0x0102]),
+                ('little', 'little', [0x0403, 0x0201])]:
+            encoding = decoding.encoding(
+                data_type='uint32', byte_order=byte_order,
+                word_order=word_order)
+            result = decoding.decode(registers, [Point(1, 0, 1, encoding)])
+            self.assertEqual(result, [expected])
+
+            # Only the byte order applies to 16 bit values
+            encoding = decoding.encoding(
+                byte_order=byte_order, word_order=word_order)
+            result = decoding.decode(registers, [Point(1, 1, 1, encoding)])
+            if byte_order == 'big':
+                self.assertEqual(result, [registers[1]])
+            else:
+                self.assertEqual(
+                    result, [((registers[1] & 0xFF) << 8) + (
+                        registers[1] >> 8)])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the tests
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Test module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}modbus'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.modbus import decoding, planner
+from pattoo_agents.modbus.planner import Point
+from pattoo_agents.modbus.variables import (
+    InputRegisterVariable, HoldingRegisterVariable, CoilVariable,
+    DiscreteInputVariable)
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestRegisterRead(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing function __init__."""
+        # Test
+        variable = InputRegisterVariable(register=30001, count=2)
+        result = planner.RegisterRead(variable, [Point(30001, 0, 1)])
+        self.assertEqual(result.variable, variable)
+        self.assertEqual(result.points, (Point(30001, 0, 1),))
+
+    def test___repr__(self):
+        """Testing function __repr__."""
+        # Test
+        variable = InputRegisterVariable(register=30001, count=2)
+        result = planner.RegisterRead(variable, [Point(30001, 0, 1)])
+        expected = '<RegisterRead variable={}, points=1>'.format(
+            repr(variable))
+        self.assertEqual(repr(result), expected)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_plan(self):
+        """Testing function plan."""
+        # Registers with different multipliers are read together
+        result = planner.plan([
+            HoldingRegisterVariable(register=40001, count=2, multiplier=2),
+            HoldingRegisterVariable(register=40003, count=1),
+            HoldingRegisterVariable(register=40001, count=1, multiplier=2)])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].variable.address, 0)
+        self.assertEqual(result[0].variable.count, 3)
+        self.assertEqual(result[0].points, (
+            Point(40001, 0, 2), Point(40002, 1, 2), Point(40003, 2, 1)))
+
+        # Register types and units are read separately
+        result = planner.plan([
+            InputRegisterVariable(register=30001, unit=1),
+            InputRegisterVariable(register=30002, unit=2),
+            HoldingRegisterVariable(register=40002, unit=1)])
+        self.assertEqual(
+            [(type(_.variable), _.variable.unit) for _ in result],
+            [(HoldingRegisterVariable, 1), (InputRegisterVariable, 1),
+             (InputRegisterVariable, 2)])
+
+        # Gaps are read only up to max_gap
+        variables = [
+            InputRegisterVariable(register=30001),
+            InputRegisterVariable(register=30004)]
+        result = planner.plan(variables)
+        self.assertEqual([_.variable.count for _ in result], [1, 1])
+        result = planner.plan(variables, max_gap=2)
+        self.assertEqual([_.variable.count for _ in result], [4])
+        self.assertEqual(
+            [_.offset for _ in result[0].points], [0, 3])
+
+        # Requests never read more than MAX_COUNT registers
+        result = planner.plan([
+            InputRegisterVariable(register=30001, count=100),
+            InputRegisterVariable(register=30101, count=100)])
+        self.assertEqual(
+            [(_.variable.address, _.variable.count) for _ in result],
+            [(0, 125), (125, 75)])
+        result = planner.plan(
+            [InputRegisterVariable(register=30001, count=10)], max_count=4)
+        self.assertEqual(
+            [_.variable.count for _ in result], [4, 4, 2])
+
+        # Values spanning several registers are read whole
+        float32 = decoding.encoding(data_type='float32')
+        variables = [
+            HoldingRegisterVariable(register=40001, count=2),
+            HoldingRegisterVariable(
+                register=40003, count=4, encoding=float32)]
+        result = planner.plan(variables, max_count=3)
+        self.assertEqual(
+            [(_.variable.address, _.variable.count) for _ in result],
+            [(0, 2), (2, 2), (4, 2)])
+        result = planner.plan(variables, max_count=4)
+        self.assertEqual(
+            [(_.variable.address, _.variable.count) for _ in result],
+            [(0, 4), (4, 2)])
+        self.assertEqual(result[0].points, (
+            Point(40001, 0, 1), Point(40002, 1, 1),
+            Point(40003, 2, 1, float32)))
+
+        # Coils and discrete inputs are read up to MAX_BITS at a time
+        result = planner.plan([
+            CoilVariable(register=1, count=1500),
+            CoilVariable(register=1501, count=1500),
+            DiscreteInputVariable(register=10001, count=3)])
+        self.assertEqual(
+            [(type(_.variable), _.variable.register, _.variable.count)
+             for _ in result],
+            [(CoilVariable, 1, 2000), (CoilVariable, 2001, 1000),
+             (DiscreteInputVariable, 10001, 3)])
+        self.assertEqual(result[1].points[0], Point(2001, 0, 1))
+
+        # Invalid entries are ignored
+        self.assertEqual(planner.plan([None, 'x']), [])
+
+    def test__spans(self):
+        """Testing function _spans."""
+        # Initialize key variables
+        extents = [(1, 1), (2, 2), (4, 4), (9, 9)]
+
+        # Test
+        result = list(planner._spans([], 0, 125))
+        self.assertEqual(result, [])
+        result = list(planner._spans(extents, 0, 125))
+        self.assertEqual(result, [(1, 2), (4, 4), (9, 9)])
+        result = list(planner._spans(extents, 1, 125))
+        self.assertEqual(result, [(1, 4), (9, 9)])
+        result = list(planner._spans(extents, 1, 3))
+        self.assertEqual(result, [(1, 2), (4, 4), (9, 9)])
+
+        # Values spanning several addresses aren't split
+        result = list(planner._spans([(1, 2), (3, 6), (5, 5)], 0, 5))
+        self.assertEqual(result, [(1, 2), (3, 6)])
+        result = list(planner._spans([(1, 4)], 0, 2))
+        self.assertEqual(result, [(1, 4)])
+
+    def test__register(self):
+        """Testing function _register."""
+        # Test
+        self.assertEqual(
+            planner._register(InputRegisterVariable, 0), 30001)
+        self.assertEqual(
+            planner._register(InputRegisterVariable, 9998), 39999)
+        self.assertEqual(
+            planner._register(InputRegisterVariable, 9999), 310000)
+        self.assertEqual(
+            planner._register(HoldingRegisterVariable, 10), 40011)
+        self.assertEqual(planner._register(CoilVariable, 0), 1)
+        self.assertEqual(planner._register(CoilVariable, 65535), 65536)
+        self.assertEqual(
+            planner._register(DiscreteInputVariable, 9999), 110000)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the tests
+    unittest.main()
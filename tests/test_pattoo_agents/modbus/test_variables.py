@@ -23,9 +23,11 @@ else:
     sys.exit(2)
 
 # Pattoo imports
+from pattoo_agents.modbus import decoding
 from pattoo_agents.modbus.variables import (
     RegisterVariable, InputRegisterVariable,
-    HoldingRegisterVariable, TargetRegisterVariables, )
+    HoldingRegisterVariable, CoilVariable, DiscreteInputVariable,
+    TargetRegisterVariables, )
 from tests.libraries.configuration import UnittestConfig
 
 
@@ -45,8 +47,17 @@ class TestRegisterVariable(unittest.TestCase):
         self.assertEqual(_rv.address, None)
         self.assertEqual(_rv.count, 2)
         self.assertEqual(_rv.unit, 3)
+        self.assertEqual(_rv.encoding, decoding.DEFAULT)
         self.assertTrue(_rv.valid)
 
+        # Test with an encoding
+        encoding = decoding.encoding(data_type='float32')
+        _rv = RegisterVariable(register=1, count=2, encoding=encoding)
+        self.assertEqual(_rv.encoding, encoding)
+        self.assertTrue(_rv.valid)
+        _rv = RegisterVariable(register=1, count=2, encoding='float32')
+        self.assertFalse(_rv.valid)
+
         # Test with no arguments
         _rv = RegisterVariable()
         self.assertTrue(isinstance(_rv, RegisterVariable))
@@ -275,6 +286,61 @@ class TestHoldingRegisterVariable(unittest.TestCase):
             self.assertFalse(_rv.valid)
 
 
+class TestCoilVariable(unittest.TestCase):
+    """Checks all CoilVariable methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test with valid values
+        for (register, address) in [(1, 0), (9999, 9998), (65536, 65535)]:
+            _rv = CoilVariable(register=register, count=2000, unit=3)
+            self.assertTrue(isinstance(_rv, CoilVariable))
+            self.assertTrue(isinstance(_rv, RegisterVariable))
+            self.assertEqual(_rv.register, register)
+            self.assertEqual(_rv.address, address)
+            self.assertEqual(_rv.count, 2000)
+            self.assertEqual(_rv.unit, 3)
+            self.assertTrue(_rv.valid)
+
+        # Test with invalid values
+        for register in [0, 65537, None, 'test']:
+            _rv = CoilVariable(register=register)
+            self.assertEqual(_rv.address, None)
+            self.assertFalse(_rv.valid)
+
+
+class TestDiscreteInputVariable(unittest.TestCase):
+    """Checks all DiscreteInputVariable methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test with valid values
+        for (register, address) in [
+                (10001, 0), (19999, 9998), (100001, 0), (165536, 65535)]:
+            _rv = DiscreteInputVariable(register=register, count=8, unit=3)
+            self.assertTrue(isinstance(_rv, DiscreteInputVariable))
+            self.assertTrue(isinstance(_rv, RegisterVariable))
+            self.assertEqual(_rv.register, register)
+            self.assertEqual(_rv.address, address)
+            self.assertEqual(_rv.count, 8)
+            self.assertEqual(_rv.unit, 3)
+            self.assertTrue(_rv.valid)
+
+        # Test with invalid values
+        for register in [1, 10000, 165537, None, 'test']:
+            _rv = DiscreteInputVariable(register=register)
+            self.assertEqual(_rv.address, None)
+            self.assertFalse(_rv.valid)
+
+
 class TestTargetRegisterVariables(unittest.TestCase):
     """Checks all TargetRegisterVariables methods."""
 
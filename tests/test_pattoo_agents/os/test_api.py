@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the os api module."""
+
+import sys
+import unittest
+import os
+import json
+import gzip
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import api, cache, precollector
+from pattoo_agents.os.api import API
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_SPOKED_API_PREFIX
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_home(self):
+        """Testing method / function home."""
+        client = API.test_client()
+        response = client.get(
+            '{}/30'.format(PATTOO_AGENT_OS_SPOKED_API_PREFIX))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.headers['Age'], '0')
+        result = json.loads(response.get_data())
+        self.assertEqual(result['pattoo_agent_polling_interval'], 30000)
+
+    def test_home_conditional(self):
+        """Testing method / function home with compression and ETags."""
+        # Initialize key variables
+        client = API.test_client()
+        url = '{}/45'.format(PATTOO_AGENT_OS_SPOKED_API_PREFIX)
+        headers = {'Accept-Encoding': 'gzip'}
+
+        with mock.patch.object(
+                api.ConfigSpoked, 'cache_ttl', return_value=60):
+            # Compressed response
+            response = client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+            result = json.loads(gzip.decompress(response.get_data()))
+            self.assertEqual(result['pattoo_agent_polling_interval'], 45000)
+            etag = response.headers['ETag']
+
+            # The same snapshot isn't sent again
+            headers['If-None-Match'] = etag
+            response = client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.get_data(), b'')
+            self.assertEqual(response.headers['ETag'], etag)
+
+            # Each representation has its own ETag
+            headers['Accept-Encoding'] = 'identity'
+            response = client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Content-Encoding', response.headers)
+        cache.get(60).clear()
+
+    def test_home_precollect(self):
+        """Testing method / function home with background collection."""
+        # Initialize key variables
+        client = API.test_client()
+        item = precollector.Precollector(api.snapshot)
+        url = '{}/60'.format(PATTOO_AGENT_OS_SPOKED_API_PREFIX)
+
+        # The response is collected in the background
+        with mock.patch.object(
+                api.ConfigSpoked, 'precollect', return_value=True):
+            with mock.patch.object(precollector, 'get', return_value=item):
+                try:
+                    response = client.get(url)
+                    self.assertEqual(len(item), 1)
+                finally:
+                    item.stop()
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.get_data())
+        self.assertEqual(result['pattoo_agent_polling_interval'], 60000)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
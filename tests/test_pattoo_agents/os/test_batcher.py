@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Test the os batcher module."""
+
+import sys
+import unittest
+import os
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import batcher
+from tests.libraries.configuration import UnittestConfig
+
+
+class Session():
+    """Fake requests.Session."""
+
+    def __init__(self, status_code=200):
+        """Initialize the class."""
+        self.status_code = status_code
+        self.posted = []
+
+    def post(self, url, json=None, timeout=None):
+        """Post data."""
+        if self.status_code is None:
+            raise ConnectionError(url)
+        self.posted.append(json)
+        return mock.Mock(status_code=self.status_code)
+
+    def close(self):
+        """Close the session."""
+
+
+class TestBatcher(unittest.TestCase):
+    """Checks all Batcher methods."""
+
+    def setUp(self):
+        """Use an empty cache directory."""
+        self.session = Session()
+        self.item = batcher.Batcher(
+            'test_batcher', size=2, wait=10, session=self.session)
+        for filename in os.listdir(self.item._cache_dir):
+            if 'test_batcher' in filename:
+                os.remove(os.path.join(self.item._cache_dir, filename))
+
+    def tearDown(self):
+        """Stop the batcher."""
+        self.item.close()
+
+    def test_add(self):
+        """Testing method / function add."""
+        # Batches are posted when full
+        first = self.item.add('spoke1', {'a': 1})
+        self.assertFalse(first.wait(0.1))
+        second = self.item.add('spoke2', {'b': 2})
+        self.assertTrue(first.wait(5))
+        self.assertTrue(second.wait(5))
+        self.assertEqual(self.session.posted, [{'a': 1}, {'b': 2}])
+
+        # Each source is acknowledged
+        acks = self.item.acks()
+        self.assertEqual(sorted(acks), ['spoke1', 'spoke2'])
+        self.assertTrue(acks['spoke1'][0])
+
+    def test_add_wait(self):
+        """Testing method / function add with a time limit."""
+        self.item.wait = 0.05
+        ack = self.item.add('spoke1', {'a': 1})
+        self.assertTrue(ack.wait(5))
+
+    def test_flush(self):
+        """Testing method / function flush."""
+        # Failed data is saved to the cache
+        self.session.status_code = None
+        ack = self.item.add('spoke1', {'a': 1})
+        with mock.patch.object(batcher.log, 'log2warning'):
+            self.item.flush()
+        self.assertFalse(ack.wait(0))
+        self.assertFalse(self.item.acks()['spoke1'][0])
+        cached = [
+            _ for _ in os.listdir(self.item._cache_dir)
+            if 'test_batcher' in _]
+        self.assertEqual(len(cached), 1)
+
+        # It is posted after the next successful post
+        self.session.status_code = 200
+        self.item.add('spoke1', {'b': 2})
+        self.item.flush()
+        self.assertEqual(self.session.posted, [{'b': 2}, {'a': 1}])
+        cached = [
+            _ for _ in os.listdir(self.item._cache_dir)
+            if 'test_batcher' in _]
+        self.assertEqual(cached, [])
+
+    def test_flush_error(self):
+        """Testing method / function flush with HTTP errors."""
+        self.session.status_code = 500
+        ack = self.item.add('spoke1', {'a': 1})
+        with mock.patch.object(batcher.log, 'log2warning') as log2warning:
+            self.item.flush()
+        self.assertFalse(ack.wait(0))
+        self.assertEqual(log2warning.call_args_list[0][0][0], 51581)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Test the os cache module."""
+
+import sys
+import unittest
+import os
+import threading
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import cache
+from tests.libraries.configuration import UnittestConfig
+
+
+class Clock():
+    """Fake monotonic clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0
+
+    def __call__(self):
+        """Get the time."""
+        return self.now
+
+
+class TestCache(unittest.TestCase):
+    """Checks all Cache methods."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Initialize key variables
+        clock = Clock()
+        calls = []
+        item = cache.Cache(10, clock=clock)
+
+        def _function():
+            calls.append(clock.now)
+            return len(calls)
+
+        # Values are reused until they expire
+        self.assertEqual(item.get(60, _function), (1, 0))
+        clock.now = 4
+        self.assertEqual(item.get(60, _function), (1, 4))
+        self.assertEqual(item.get(30, _function), (2, 0))
+        clock.now = 10
+        self.assertEqual(item.get(60, _function), (3, 0))
+        self.assertEqual(calls, [0, 4, 10])
+
+    def test_get_no_ttl(self):
+        """Testing method / function get without a TTL."""
+        item = cache.Cache(0)
+        self.assertEqual(item.get(60, lambda: 1)[0], 1)
+        self.assertEqual(item.get(60, lambda: 2)[0], 2)
+        self.assertEqual(len(item), 0)
+
+    def test_get_concurrent(self):
+        """Testing method / function get with concurrent callers."""
+        # Initialize key variables
+        item = cache.Cache(0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def _function():
+            calls.append(None)
+            started.set()
+            release.wait(5)
+            return 'value'
+
+        def _caller():
+            results.append(item.get(60, _function)[0])
+
+        # Callers arriving while the value is created share it
+        threads = [threading.Thread(target=_caller) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_get_error(self):
+        """Testing method / function get with a failing function."""
+        item = cache.Cache(10)
+
+        def _function():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            item.get(60, _function)
+        self.assertEqual(len(item), 0)
+        self.assertEqual(item.get(60, lambda: 1)[0], 1)
+
+    def test_max_entries(self):
+        """Testing the maximum number of cached values."""
+        clock = Clock()
+        item = cache.Cache(10, max_entries=2, clock=clock)
+        for key in range(3):
+            clock.now = key
+            item.get(key, lambda: key)
+        self.assertEqual(len(item), 2)
+        self.assertEqual(item.get(1, lambda: None), (1, 1))
+
+    def test_clear(self):
+        """Testing method / function clear."""
+        item = cache.Cache(10)
+        item.get(60, lambda: 1)
+        item.clear()
+        self.assertEqual(len(item), 0)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        result = cache.get(5)
+        self.assertIs(cache.get(5), result)
+        self.assertIsNot(cache.get(0), result)
+        self.assertEqual(result.ttl, 5)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
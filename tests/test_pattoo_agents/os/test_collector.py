@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Test the os collector module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pip imports
+import psutil
+
+# Pattoo imports
+from pattoo_shared.variables import AgentPolledData
+from pattoo_shared.constants import DATA_FLOAT
+from pattoo_agents.os import collector, procfs, rates
+from pattoo_agents.metadata import MetadataSet
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestPerformance(unittest.TestCase):
+    """Checks all Performance methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        facts = collector.host_facts()
+        result = collector.Performance()
+        self.assertEqual(result.hostname, facts.hostname)
+        self.assertIs(result.metadata, facts.metadata)
+
+    def test_stats_system(self):
+        """Testing method / function stats_system."""
+        result = collector.Performance().stats_system()
+        keys = [item.key for item in result]
+        for key in ['process_count', 'load_average_01min', 'cpu_times_user',
+                    'cpu_times_percent_user', 'memory_total']:
+            self.assertIn(key, keys)
+        for item in result:
+            self.assertEqual(
+                item.metadata['hostname'], collector.host_facts().hostname)
+
+    def test_procfs(self):
+        """Testing the /proc fast path."""
+        # Skip if /proc can't be used
+        if procfs.available() is False:
+            return
+
+        # The same datapoints are created
+        expected = collector.Performance()
+        result = collector.Performance(procfs=True)
+        self.assertIsNotNone(result._reader)
+        for method in ['stats_system', 'stats_disk_io', 'stats_network']:
+            self.assertEqual(
+                [(_.key, _.metadata) for _ in getattr(result, method)()],
+                [(_.key, _.metadata) for _ in getattr(expected, method)()])
+
+    def test_rates(self):
+        """Testing the per-second rates of counters."""
+        # No rates the first time
+        performance = collector.Performance(rates=rates.Rates())
+        result = performance.stats_network()
+        self.assertFalse(
+            any(_.key.endswith('_per_second') for _ in result))
+
+        # Rates have the same metadata as their counters
+        result = performance.stats_network()
+        counters = [
+            ('{}_per_second'.format(_.key), _.metadata) for _ in result
+            if _.key.endswith('_per_second') is False]
+        per_second = [_ for _ in result if _.key.endswith('_per_second')]
+        self.assertEqual(
+            sorted(str(_) for _ in counters),
+            sorted(str((_.key, _.metadata)) for _ in per_second))
+        for datapoint in per_second:
+            self.assertEqual(datapoint.data_type, DATA_FLOAT)
+            self.assertGreaterEqual(datapoint.value, 0)
+        performance.stats_system()
+        keys = [_.key for _ in performance.stats_system()]
+        self.assertIn('cpu_times_user_per_second', keys)
+        self.assertIn('cpu_stats_ctx_switches_per_second', keys)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_poll(self):
+        """Testing method / function poll."""
+        result = collector.poll('test_agent', 10)
+        self.assertTrue(isinstance(result, AgentPolledData))
+        self.assertTrue(result.valid)
+
+    def test_host_facts(self):
+        """Testing method / function host_facts."""
+        result = collector.host_facts()
+        self.assertTrue(isinstance(result, collector.HostFacts))
+        self.assertTrue(isinstance(result.metadata, MetadataSet))
+        self.assertIs(collector.host_facts(), result)
+
+    def test_refresh_host_facts(self):
+        """Testing method / function refresh_host_facts."""
+        result = collector.host_facts()
+        collector.refresh_host_facts()
+        self.assertIsNot(collector.host_facts(), result)
+        self.assertEqual(collector.host_facts(), result)
+
+    def test_sampling(self):
+        """Testing method / function sampling."""
+        self.assertIsNone(collector.sampling(0, 10))
+        result = collector.sampling(60, 10)
+        self.assertIs(collector.sampling(60, 10), result)
+        self.assertIs(result.metadata, collector.host_facts().metadata)
+        result.stop()
+
+        # Sampled data is added to the polled data
+        result.sample()
+        agentdata = collector.poll('test_agent', 10, sampler=result)
+        keys = [
+            _.key for _ in agentdata.data[0].data
+            if _.key.startswith('memory_percent_')]
+        self.assertEqual(
+            keys, ['memory_percent_min', 'memory_percent_max',
+                   'memory_percent_avg', 'memory_percent_p95'])
+
+    def test_tracking(self):
+        """Testing method / function tracking."""
+        self.assertIsNone(collector.tracking(0))
+        result = collector.tracking(2, limit=8)
+        self.assertIs(collector.tracking(2, limit=8), result)
+
+        # Process data is added to the polled data
+        agentdata = collector.poll('test_agent', 10, tracker=result)
+        keys = [
+            _.key for _ in agentdata.data[0].data
+            if 'process_name' in _.metadata]
+        self.assertEqual(len(keys), 8)
+        self.assertIn('process_instances', keys)
+
+    def test__cpu_times_percent(self):
+        """Testing method / function _cpu_times_percent."""
+        # The first sample is compared with itself
+        collector._CPU_TIMES.clear()
+        now = psutil.cpu_times()
+        result = collector._cpu_times_percent(now)
+        self.assertEqual(result._fields, now._fields)
+        self.assertEqual(sum(result), 0)
+
+        # Percentages of the time elapsed between samples
+        fields = now._fields
+        later = now.__class__(*[
+            value + (3 if field == 'user' else 1 if field == 'idle' else 0)
+            for field, value in zip(fields, now)])
+        result = collector._cpu_times_percent(later)
+        self.assertEqual(result.user, 75.0)
+        self.assertEqual(result.idle, 25.0)
+
+        # Less than a second between samples
+        sooner = later.__class__(*[
+            value + (0.3 if field == 'user' else 0.1 if field in (
+                'system', 'idle') else 0)
+            for field, value in zip(fields, later)])
+        result = collector._cpu_times_percent(sooner)
+        self.assertEqual(result.user, 60.0)
+        self.assertEqual(result.system, 20.0)
+        self.assertEqual(result.idle, 20.0)
+
+        # Time going backwards is ignored
+        result = collector._cpu_times_percent(now)
+        self.assertEqual(sum(result), 0)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
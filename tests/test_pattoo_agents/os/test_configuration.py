@@ -57,6 +57,102 @@ class TestConfigSpoked(unittest.TestCase):
         result = self.config.ip_bind_port()
         self.assertEqual(result, expected)
 
+    def test_procfs(self):
+        """Testing function procfs."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.procfs()
+        self.assertEqual(result, expected)
+
+    def test_sampling_interval(self):
+        """Testing function sampling_interval."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.sampling_interval()
+        self.assertEqual(result, expected)
+
+    def test_sampling_size(self):
+        """Testing function sampling_size."""
+        # Initialize key values
+        expected = 300
+
+        # Test
+        result = self.config.sampling_size()
+        self.assertEqual(result, expected)
+
+    def test_rates(self):
+        """Testing function rates."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.rates()
+        self.assertEqual(result, expected)
+
+    def test_cache_ttl(self):
+        """Testing function cache_ttl."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_ttl()
+        self.assertEqual(result, expected)
+
+    def test_precollect(self):
+        """Testing function precollect."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.precollect()
+        self.assertEqual(result, expected)
+
+    def test_top_processes(self):
+        """Testing function top_processes."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.top_processes()
+        self.assertEqual(result, expected)
+
+    def test_cgroups(self):
+        """Testing function cgroups."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.cgroups()
+        self.assertEqual(result, expected)
+
+    def test_max_series(self):
+        """Testing function max_series."""
+        # Initialize key values
+        expected = 200
+
+        # Test
+        result = self.config.max_series()
+        self.assertEqual(result, expected)
+
+    def test_push_url(self):
+        """Testing function push_url."""
+        # Test
+        result = self.config.push_url()
+        self.assertEqual(result, None)
+
+    def test_push_interval(self):
+        """Testing function push_interval."""
+        # Initialize key values
+        expected = 300
+
+        # Test
+        result = self.config.push_interval()
+        self.assertEqual(result, expected)
+
     def test_language(self):
         """Test pattoo_shared.Config inherited method language."""
         # Initialize key values
@@ -209,6 +305,60 @@ class TestConfigHubd(unittest.TestCase):
         result = self.config.polling_interval()
         self.assertEqual(result, expected)
 
+    def test_concurrency(self):
+        """Testing function concurrency."""
+        # Initialize key values
+        expected = 100
+
+        # Test
+        result = self.config.concurrency()
+        self.assertEqual(result, expected)
+
+    def test_timeout(self):
+        """Testing function timeout."""
+        # Initialize key values
+        expected = 10
+
+        # Test
+        result = self.config.timeout()
+        self.assertEqual(result, expected)
+
+    def test_batch_size(self):
+        """Testing function batch_size."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.batch_size()
+        self.assertEqual(result, expected)
+
+    def test_batch_wait(self):
+        """Testing function batch_wait."""
+        # Initialize key values
+        expected = 1
+
+        # Test
+        result = self.config.batch_wait()
+        self.assertEqual(result, expected)
+
+    def test_msgpack(self):
+        """Testing function msgpack."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.msgpack()
+        self.assertEqual(result, expected)
+
+    def test_max_backoff(self):
+        """Testing function max_backoff."""
+        # Initialize key values
+        expected = 16
+
+        # Test
+        result = self.config.max_backoff()
+        self.assertEqual(result, expected)
+
     def test_ip_targets(self):
         """Testing function ip_targets."""
         # Test
@@ -223,6 +373,41 @@ class TestConfigHubd(unittest.TestCase):
             self.assertEqual(item['ip_address'], '127.0.0.1')
             self.assertEqual(item['ip_bind_port'], 5000)
 
+    def test_spoke_urls(self):
+        """Testing function spoke_urls."""
+        # Initialize key values
+        expected = ['http://127.0.0.1:5000/pattoo-agent-os/98']
+
+        # Test
+        result = self.config.spoke_urls()
+        self.assertEqual(result, expected)
+        self.assertIs(self.config.spoke_urls(), result)
+
+    def test_agent_id(self):
+        """Testing function agent_id."""
+        # Test
+        result = self.config.agent_id()
+        self.assertEqual(bool(result), True)
+        self.assertIs(self.config.agent_id(), result)
+
+    def test_ingest_ip_listen_address(self):
+        """Testing function ingest_ip_listen_address."""
+        # Initialize key values
+        expected = '0.0.0.0'
+
+        # Test
+        result = self.config.ingest_ip_listen_address()
+        self.assertEqual(result, expected)
+
+    def test_ingest_ip_bind_port(self):
+        """Testing function ingest_ip_bind_port."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.ingest_ip_bind_port()
+        self.assertEqual(result, expected)
+
     def test_language(self):
         """Test pattoo_shared.Config inherited method language."""
         # Initialize key values
@@ -375,6 +560,69 @@ class TestConfigAutonomousd(unittest.TestCase):
         result = self.config.polling_interval()
         self.assertEqual(result, expected)
 
+    def test_procfs(self):
+        """Testing function procfs."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.procfs()
+        self.assertEqual(result, expected)
+
+    def test_sampling_interval(self):
+        """Testing function sampling_interval."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.sampling_interval()
+        self.assertEqual(result, expected)
+
+    def test_sampling_size(self):
+        """Testing function sampling_size."""
+        # Initialize key values
+        expected = 300
+
+        # Test
+        result = self.config.sampling_size()
+        self.assertEqual(result, expected)
+
+    def test_rates(self):
+        """Testing function rates."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.rates()
+        self.assertEqual(result, expected)
+
+    def test_top_processes(self):
+        """Testing function top_processes."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.top_processes()
+        self.assertEqual(result, expected)
+
+    def test_cgroups(self):
+        """Testing function cgroups."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.cgroups()
+        self.assertEqual(result, expected)
+
+    def test_max_series(self):
+        """Testing function max_series."""
+        # Initialize key values
+        expected = 200
+
+        # Test
+        result = self.config.max_series()
+        self.assertEqual(result, expected)
+
     def test_language(self):
         """Test pattoo_shared.Config inherited method language."""
         # Initialize key values
@@ -506,6 +754,18 @@ class TestConfigAutonomousd(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test__spoked_url(self):
+        """Testing function _spoked_url."""
+        # Test
+        result = configuration._spoked_url('127.0.0.1', 5000, 300)
+        self.assertEqual(result, 'http://127.0.0.1:5000/pattoo-agent-os/300')
+        result = configuration._spoked_url('::1', 5000, 300)
+        self.assertEqual(result, 'http://[::1]:5000/pattoo-agent-os/300')
+
+
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
     UnittestConfig().create()
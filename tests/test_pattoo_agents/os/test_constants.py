@@ -31,6 +31,7 @@ from pattoo_agents.os.constants import PATTOO_AGENT_OS_SPOKED
 from pattoo_agents.os.constants import PATTOO_AGENT_OS_SPOKED_PROXY
 from pattoo_agents.os.constants import PATTOO_AGENT_OS_AUTONOMOUSD
 from pattoo_agents.os.constants import PATTOO_AGENT_OS_HUBD
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_HUBD_PUSH_URI
 
 
 class TestConstants(unittest.TestCase):
@@ -54,6 +55,8 @@ class TestConstants(unittest.TestCase):
             PATTOO_AGENT_OS_AUTONOMOUSD, 'pattoo_agent_os_autonomousd')
         self.assertEqual(
             PATTOO_AGENT_OS_HUBD, 'pattoo_agent_os_hubd')
+        self.assertEqual(
+            PATTOO_AGENT_OS_HUBD_PUSH_URI, '/pattoo-agent-os/push')
 
 
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test the os encoding module."""
+
+import sys
+import unittest
+import os
+import json
+import zlib
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import encoding
+from tests.libraries.configuration import UnittestConfig
+
+# Data used for testing
+DATA = {'key': 'value', 'numbers': [1, 2.5, 3]}
+
+
+class FakeMsgpack():
+    """Replacement for the msgpack package."""
+
+    @staticmethod
+    def packb(data, use_bin_type=True):
+        """Encode data."""
+        return b'msgpack' + json.dumps(data).encode()
+
+    @staticmethod
+    def unpackb(body, raw=False):
+        """Decode data."""
+        return json.loads(body[len(b'msgpack'):].decode())
+
+
+class TestPayload(unittest.TestCase):
+    """Checks all Payload methods."""
+
+    def test_body(self):
+        """Testing method / function body."""
+        # Initialize key variables
+        body = json.dumps(DATA).encode()
+        payload = encoding.Payload(DATA, body)
+
+        # Test
+        self.assertIs(payload.body(), body)
+        for coding in encoding.CODINGS:
+            result = payload.body(coding=coding)
+            self.assertIs(payload.body(coding=coding), result)
+            self.assertEqual(encoding.decode(result, coding=coding), DATA)
+        with mock.patch.object(encoding, 'msgpack', FakeMsgpack):
+            result = payload.body(encoding.MSGPACK, 'gzip')
+            self.assertEqual(
+                encoding.decode(
+                    result, media_type=encoding.MSGPACK, coding='gzip'),
+                DATA)
+
+    def test_etag(self):
+        """Testing method / function etag."""
+        payload = encoding.Payload(DATA, b'{}')
+        etags = set([
+            payload.etag(media_type, coding)
+            for media_type in [encoding.JSON, encoding.MSGPACK]
+            for coding in [None, 'gzip', 'deflate']])
+        self.assertEqual(len(etags), 6)
+        self.assertEqual(
+            payload.etag(), '"{}"'.format(payload.digest))
+        self.assertNotEqual(
+            payload.etag(), encoding.Payload(DATA, b'[]').etag())
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_decode(self):
+        """Testing method / function decode."""
+        body = json.dumps(DATA).encode()
+        self.assertEqual(encoding.decode(body), DATA)
+        self.assertEqual(
+            encoding.decode(
+                encoding.compress(body, 'gzip'),
+                media_type='application/json; charset=utf-8',
+                coding='GZIP'),
+            DATA)
+
+    def test_decompress(self):
+        """Testing method / function decompress."""
+        # Initialize key variables
+        body = b'0' * 1000
+
+        # Bodies are decompressed up to the limit
+        for coding in encoding.CODINGS:
+            compressed = encoding.compress(body, coding)
+            self.assertEqual(encoding.decompress(compressed, coding), body)
+            self.assertEqual(
+                encoding.decompress(compressed, coding, limit=1000), body)
+            self.assertIsNone(
+                encoding.decompress(compressed, coding, limit=999))
+            with self.assertRaises(zlib.error):
+                encoding.decompress(compressed[:-10], coding)
+        self.assertEqual(encoding.decompress(body, limit=1000), body)
+        self.assertIsNone(encoding.decompress(body, limit=10))
+
+    def test_negotiate_coding(self):
+        """Testing method / function negotiate_coding."""
+        self.assertIsNone(encoding.negotiate_coding(None))
+        self.assertIsNone(encoding.negotiate_coding('identity, br'))
+        self.assertEqual(
+            encoding.negotiate_coding('deflate, gzip;q=0.5'), 'gzip')
+        self.assertEqual(
+            encoding.negotiate_coding('gzip;q=0, deflate'), 'deflate')
+        self.assertEqual(encoding.negotiate_coding('*'), 'gzip')
+        self.assertIsNone(encoding.negotiate_coding('*;q=0'))
+
+    def test_negotiate_media_type(self):
+        """Testing method / function negotiate_media_type."""
+        accept = 'application/msgpack, application/json;q=0.5'
+        with mock.patch.object(encoding, 'msgpack', None):
+            self.assertEqual(
+                encoding.negotiate_media_type(accept), encoding.JSON)
+        with mock.patch.object(encoding, 'msgpack', FakeMsgpack):
+            self.assertEqual(
+                encoding.negotiate_media_type(accept), encoding.MSGPACK)
+            self.assertEqual(
+                encoding.negotiate_media_type('*/*'), encoding.JSON)
+
+    def test_matches(self):
+        """Testing method / function matches."""
+        self.assertTrue(encoding.matches('"a", "b"', '"b"'))
+        self.assertTrue(encoding.matches('W/"b"', '"b"'))
+        self.assertTrue(encoding.matches('*', '"b"'))
+        self.assertFalse(encoding.matches('"a"', '"b"'))
+        self.assertFalse(encoding.matches(None, '"b"'))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Test the os fanout module."""
+
+import sys
+import unittest
+import os
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import batcher, fanout, hub
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Spoke returning JSON that supports keep-alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        """Respond to a GET request."""
+        # Initialize key variables
+        path = self.path.split('?')[0]
+        body = b'{"path": "%s"}' % path.encode()
+
+        # Respond
+        if path == '/slow':
+            time.sleep(1)
+        if self.headers.get('If-None-Match') == '"1"':
+            self.send_response(304)
+            self.send_header('ETag', '"1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"1"')
+        if path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in [body[:5], body[5:], b'']:
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            return
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Don't log requests."""
+
+
+class TestFanOut(unittest.TestCase):
+    """Checks all HTTPPool and FanOut methods."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a web server."""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the web server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def test_get(self):
+        """Testing method / function HTTPPool.get."""
+        # Initialize key variables
+        pool = fanout.HTTPPool()
+        loop = asyncio.new_event_loop()
+
+        try:
+            # Connections are kept alive
+            result = loop.run_until_complete(
+                pool.get('{}/a?b=1'.format(self.url)))
+            self.assertEqual(result.status, 200)
+            self.assertEqual(result.body, b'{"path": "/a"}')
+            self.assertEqual(result.headers.get('ETag'), '"1"')
+            self.assertEqual(len(pool), 1)
+            result = loop.run_until_complete(
+                pool.get(self.url + '/b', headers={'If-None-Match': '"1"'}))
+            self.assertEqual(result.status, 304)
+            self.assertEqual(len(pool), 1)
+
+            # Chunked responses
+            result = loop.run_until_complete(pool.get(self.url + '/chunked'))
+            self.assertEqual(result.body, b'{"path": "/chunked"}')
+
+            # Closed connections are replaced
+            key = ('127.0.0.1', self.server.server_port)
+            for (_, writer) in pool._idle[key]:
+                writer.transport.abort()
+            result = loop.run_until_complete(pool.get(self.url + '/c'))
+            self.assertEqual(result.body, b'{"path": "/c"}')
+        finally:
+            pool.close()
+            loop.close()
+
+    def test_poll(self):
+        """Testing method / function poll."""
+        # Initialize key variables
+        item = fanout.FanOut('agent', concurrency=2, timeout=0.5)
+        urls = ['{}/{}'.format(self.url, _) for _ in range(5)]
+        urls.append(self.url + '/slow')
+        urls.append('http://127.0.0.1:1/refused')
+        posted = []
+
+        def _post(spoke, data):
+            posted.append(data['path'])
+            return True
+
+        # Only spokes that reply in time are relayed
+        try:
+            with mock.patch.object(hub.SpokeAgent, 'post', _post):
+                with mock.patch.object(fanout.log, 'log2info'):
+                    self.assertEqual(item.poll(urls, 'id'), 5)
+                    self.assertEqual(
+                        sorted(posted), ['/{}'.format(_) for _ in range(5)])
+
+                    # Unchanged data isn't relayed again
+                    spoke = item._spokes[urls[0]]
+                    self.assertEqual(spoke.etag, '"1"')
+                    self.assertEqual(item.poll(urls, 'id'), 0)
+                    self.assertIs(item._spokes[urls[0]], spoke)
+
+                    # Spokes are created again when the identifier changes
+                    self.assertEqual(item.poll(urls[:1], 'other'), 1)
+                    self.assertEqual(len(item._spokes), 1)
+        finally:
+            item.close()
+
+    def test_poll_health(self):
+        """Testing method / function poll with the health of spokes."""
+        # Initialize key variables
+        item = fanout.FanOut('agent', timeout=0.5)
+        urls = [self.url + '/a', 'http://127.0.0.1:1/refused']
+
+        # Failing spokes are skipped after the second failure
+        try:
+            with mock.patch.object(hub.SpokeAgent, 'post', return_value=True):
+                with mock.patch.object(fanout.log, 'log2info') as log2info:
+                    for _ in range(3):
+                        item.poll(urls, 'id')
+            self.assertEqual(
+                [_[0][0] for _ in log2info.call_args_list],
+                [51579, 51579, 51584])
+            result = item.health.stats()
+            self.assertEqual(result[urls[0]]['successes'], 3)
+            self.assertEqual(result[urls[1]]['failures'], 2)
+            self.assertEqual(result[urls[1]]['skipped'], 1)
+        finally:
+            item.close()
+
+    def test_receive(self):
+        """Testing method / function receive."""
+        # Initialize key variables
+        item = fanout.FanOut('agent')
+        urls = [self.url + '/a', self.url + '/b']
+        data = {
+            'pattoo_agent_id': 'spoke',
+            'pattoo_agent_polling_interval': 300000}
+        posted = []
+
+        def _post(spoke, data):
+            posted.append((spoke._url, data))
+            return True
+
+        try:
+            with mock.patch.object(hub.SpokeAgent, 'post', _post):
+                # Pushed data is relayed
+                self.assertEqual(item.receive('10.0.0.1', data, 'id'), True)
+                item._executor.submit(lambda: None).result()
+                self.assertEqual(posted, [('10.0.0.1', data)])
+
+                # Spokes that push data aren't polled
+                self.assertEqual(item.poll(urls, 'id'), 2)
+                item._agent_ids[urls[0]] = 'spoke'
+                self.assertEqual(item.poll(urls, 'other'), 1)
+
+                # They are polled again when pushes stop
+                item._pushed['spoke'] = 0
+                self.assertEqual(item.poll(urls, 'id'), 2)
+        finally:
+            item.close()
+
+    def test_poll_batcher(self):
+        """Testing method / function poll with a Batcher."""
+        # Initialize key variables
+        session = mock.Mock()
+        session.post.return_value = mock.Mock(status_code=200)
+        item = fanout.FanOut(
+            'agent', batcher=batcher.Batcher(
+                'test_fanout', size=3, wait=10, session=session))
+        urls = ['{}/{}'.format(self.url, _) for _ in range(5)]
+
+        # Data is posted in batches
+        try:
+            self.assertEqual(item.poll(urls, 'id'), 5)
+            self.assertEqual(session.post.call_count, 5)
+            self.assertEqual(sorted(item.batcher.acks()), sorted(urls))
+        finally:
+            item.batcher.close()
+            item.close()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Test the os health module."""
+
+import sys
+import json
+import tempfile
+import unittest
+import os
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import health
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestHealth(unittest.TestCase):
+    """Checks all Health methods."""
+
+    def test_start(self):
+        """Testing method / function start."""
+        # Initialize key variables
+        item = health.Health(timeout=10, max_backoff=4)
+        urls = ['a', 'b']
+
+        # Spokes are skipped for 1, 2, 4, 4 polls from the second failure
+        polled = []
+        for _ in range(20):
+            due = item.start(urls)
+            polled.append('b' in due)
+            self.assertIn('a', due)
+            if 'b' in due:
+                with mock.patch.object(health.log, 'log2info'):
+                    item.failure('b', 'Refused')
+        expected = [
+            True, True, False, True, False, False, True, False, False,
+            False, False, True, False, False, False, False, True, False,
+            False, False]
+        self.assertEqual(polled, expected)
+        self.assertEqual(item.stats()['b']['skipped'], 14)
+
+        # Spokes that respond are polled every time again
+        with mock.patch.object(health.log, 'log2info') as log2info:
+            item.success('b', 0.1)
+            self.assertEqual(log2info.call_args[0][0], 51585)
+        self.assertEqual(item.start(urls), urls)
+
+        # Spokes no longer polled are forgotten
+        item.start(['a'])
+        self.assertEqual(sorted(item.stats()), ['a'])
+
+        # Failing spokes are never skipped if max_backoff is zero
+        item = health.Health(max_backoff=0)
+        for _ in range(5):
+            self.assertEqual(item.start(urls), urls)
+            item.failure('b', 'Refused')
+
+    def test_timeout(self):
+        """Testing method / function timeout."""
+        # Initialize key variables
+        item = health.Health(timeout=10, multiplier=3, minimum=1)
+        item.start(['a'])
+
+        # The maximum is used until enough response times are known
+        for _ in range(health.MIN_SAMPLES - 1):
+            item.success('a', 2)
+        self.assertEqual(item.timeout('a'), 10)
+        self.assertEqual(item.timeout('unknown'), 10)
+
+        # Three times the 99th percentile
+        item.success('a', 2)
+        self.assertEqual(item.timeout('a'), 6)
+
+        # The minimum applies to fast spokes
+        item = health.Health(timeout=10, multiplier=3, minimum=1)
+        for _ in range(health.MIN_SAMPLES):
+            item.success('a', 0.01)
+        self.assertEqual(item.timeout('a'), 1)
+
+        # Timeouts restore the maximum
+        item.failure('a', 'Timeout', latency=1)
+        self.assertEqual(item.timeout('a'), 10)
+
+    def test_stats(self):
+        """Testing method / function stats."""
+        # Initialize key variables
+        item = health.Health(timeout=10)
+        item.start(['a', 'b'])
+        item.success('a', 0.5)
+        item.failure('b', 'Refused')
+
+        # Test
+        result = item.stats()
+        self.assertEqual(result['a']['up'], True)
+        self.assertEqual(result['a']['successes'], 1)
+        self.assertEqual(result['a']['latency_p50'], 0.5)
+        self.assertEqual(result['a']['timeout'], 10)
+        self.assertEqual(result['b']['up'], False)
+        self.assertEqual(result['b']['failures'], 1)
+        self.assertEqual(result['b']['consecutive_failures'], 1)
+        self.assertEqual(result['b']['polls_until_retry'], 0)
+        self.assertEqual(result['b']['latency_p99'], None)
+        self.assertEqual(result['b']['error'], 'Refused')
+
+    def test_save(self):
+        """Testing method / function save."""
+        # Initialize key variables
+        item = health.Health()
+        item.start(['a'])
+        item.success('a', 0.5)
+
+        # Test
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'health.json')
+            item.save(filepath)
+            with open(filepath, 'r') as f_handle:
+                result = json.load(f_handle)
+            self.assertEqual(result['spokes'], item.stats())
+            self.assertNotIn('acks', result)
+            self.assertEqual(os.listdir(directory), ['health.json'])
+
+            # The acknowledgements of the pattoo server are saved
+            item.save(filepath, acks={'a': (False, 10.5)})
+            with open(filepath, 'r') as f_handle:
+                result = json.load(f_handle)
+            self.assertEqual(
+                result['acks'], {'a': {'accepted': False, 'timestamp': 10}})
+
+            # Errors are logged
+            with mock.patch.object(health.log, 'log2warning') as log2warning:
+                item.save(os.path.join(directory, 'missing', 'health.json'))
+                self.assertEqual(log2warning.call_args[0][0], 51586)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_percentile(self):
+        """Testing method / function percentile."""
+        # Test
+        values = list(range(1, 101))
+        self.assertEqual(health.percentile(values, 0.99), 99)
+        self.assertEqual(health.percentile(values, 0.5), 50)
+        self.assertEqual(health.percentile([3], 0.99), 3)
+        self.assertEqual(health.percentile([], 0.99), None)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test the os hub module."""
+
+import sys
+import unittest
+import os
+import threading
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pip imports
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+# Pattoo imports
+from pattoo_agents.os import api, cache, encoding, hub
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_SPOKED_API_PREFIX
+from tests.libraries.configuration import UnittestConfig
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """Request handler that doesn't log requests."""
+
+    def log_request(self, *args, **kwargs):
+        """Don't log requests."""
+
+
+class TestSpokeAgent(unittest.TestCase):
+    """Checks all SpokeAgent methods."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a spoke."""
+        cls.server = make_server(
+            '127.0.0.1', 0, api.API, threaded=True,
+            request_handler=_QuietHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:{}{}/55'.format(
+            cls.server.server_port, PATTOO_AGENT_OS_SPOKED_API_PREFIX)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the spoke."""
+        cls.server.shutdown()
+        cls.thread.join()
+        cache.get(60).clear()
+
+    def test_headers(self):
+        """Testing method / function headers."""
+        result = hub.SpokeAgent('agent', 'id', self.url).headers()
+        self.assertEqual(result['Accept-Encoding'], 'gzip, deflate')
+        self.assertEqual(result['Accept'], encoding.JSON)
+        self.assertNotIn('If-None-Match', result)
+        with mock.patch.object(encoding, 'msgpack', object()):
+            result = hub.SpokeAgent(
+                'agent', 'id', self.url, etag='"a"', msgpack=True).headers()
+        self.assertTrue(result['Accept'].startswith(encoding.MSGPACK))
+        self.assertEqual(result['If-None-Match'], '"a"')
+
+    def test_get(self):
+        """Testing method / function get."""
+        agent = hub.SpokeAgent('agent', 'id', self.url)
+        with mock.patch.object(
+                api.ConfigSpoked, 'cache_ttl', return_value=60):
+            # The first request gets the data
+            result = agent.get()
+            self.assertEqual(result['pattoo_agent_polling_interval'], 55000)
+            self.assertTrue(agent.etag.endswith('-gzip"'))
+
+            # Unchanged data isn't received again
+            etag = agent.etag
+            self.assertEqual(agent.get(), {})
+            self.assertEqual(agent.etag, etag)
+
+    def test_get_error(self):
+        """Testing method / function get with an unreachable spoke."""
+        agent = hub.SpokeAgent(
+            'agent', 'id', '{}/0/missing'.format(self.url))
+        with mock.patch.object(hub.log, 'log2info') as log2info:
+            self.assertEqual(agent.get(), {})
+        self.assertEqual(log2info.call_args[0][0], 51575)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Test the os ingest module."""
+
+import sys
+import gzip
+import json
+import unittest
+import os
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# pip3 libraries
+import requests
+
+# Pattoo imports
+from pattoo_agents.os import ingest
+from pattoo_agents.os.constants import PATTOO_AGENT_OS_HUBD_PUSH_URI
+from tests.libraries.configuration import UnittestConfig
+
+# Data pushed by a spoke
+_DATA = {
+    'pattoo_agent_id': 'spoke',
+    'pattoo_agent_polling_interval': 300000,
+    'pattoo_agent_timestamp': 1,
+    'pattoo_datapoints': {'key_value_pairs': {}, 'datapoint_pairs': []}}
+
+
+class TestIngest(unittest.TestCase):
+    """Checks all Ingest methods."""
+
+    def test_push(self):
+        """Testing pushing data to an Ingest."""
+        # Initialize key variables
+        received = []
+        accept = [True]
+
+        def _receiver(source, data):
+            received.append((source, data))
+            return accept[0]
+
+        item = ingest.Ingest(_receiver, ip_listen_address='127.0.0.1')
+        item.start()
+        url = 'http://127.0.0.1:{}{}'.format(
+            item.port, PATTOO_AGENT_OS_HUBD_PUSH_URI)
+
+        try:
+            # Compressed data is accepted
+            response = requests.post(
+                url, data=gzip.compress(json.dumps(_DATA).encode()),
+                headers={
+                    'Content-Type': 'application/json',
+                    'Content-Encoding': 'gzip'})
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(received, [('127.0.0.1', _DATA)])
+
+            # The receiver may refuse data
+            accept[0] = False
+            response = requests.post(url, json=_DATA)
+            self.assertEqual(response.status_code, 503)
+
+            # Invalid data is rejected
+            with mock.patch.object(ingest.log, 'log2info') as log2info:
+                response = requests.post(url, data=b'{')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(log2info.call_args[0][0], 51589)
+                response = requests.post(url, json={'a': 1})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(log2info.call_args[0][0], 51590)
+            self.assertEqual(len(received), 2)
+
+            # Data that is too large is rejected
+            with mock.patch.object(ingest, 'MAX_SIZE', 100):
+                with mock.patch.object(ingest.log, 'log2info') as log2info:
+                    response = requests.post(
+                        url, data=gzip.compress(b' ' * 101),
+                        headers={'Content-Encoding': 'gzip'})
+                    self.assertEqual(response.status_code, 413)
+                    self.assertEqual(log2info.call_args[0][0], 51598)
+            item.app.config['MAX_CONTENT_LENGTH'] = 10
+            response = requests.post(url, json=_DATA)
+            self.assertEqual(response.status_code, 413)
+            self.assertEqual(len(received), 2)
+
+            # Only POST is allowed
+            self.assertEqual(requests.get(url).status_code, 405)
+        finally:
+            item.stop()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_valid(self):
+        """Testing function valid."""
+        # Test
+        self.assertEqual(ingest.valid(_DATA), True)
+        self.assertEqual(ingest.valid([]), False)
+        self.assertEqual(ingest.valid({'pattoo_agent_id': 'spoke'}), False)
+        data = dict(_DATA)
+        data['pattoo_agent_polling_interval'] = '300000'
+        self.assertEqual(ingest.valid(data), False)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
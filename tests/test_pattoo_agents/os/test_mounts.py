@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Test the os mounts module."""
+
+import sys
+import unittest
+import os
+import collections
+import threading
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import mounts
+from tests.libraries.configuration import UnittestConfig
+
+# Named tuple like those returned by psutil.disk_partitions()
+Partition = collections.namedtuple(
+    'Partition', 'device mountpoint fstype opts')
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def setUp(self):
+        """Start each test without quarantined mounts."""
+        mounts._QUARANTINE.clear()
+
+    def test_excluded(self):
+        """Testing method / function excluded."""
+        self.assertTrue(
+            mounts.excluded(Partition('server:/', '/mnt', 'nfs4', 'rw')))
+        self.assertTrue(
+            mounts.excluded(Partition('overlay', '/', 'OVERLAY', 'rw')))
+        self.assertFalse(
+            mounts.excluded(Partition('/dev/sda1', '/', 'ext4', 'rw')))
+        self.assertTrue(
+            mounts.excluded(
+                Partition('/dev/sda1', '/', 'ext4', 'rw'),
+                fstypes=frozenset(['ext4'])))
+
+    def test_disk_usage(self):
+        """Testing method / function disk_usage."""
+        # Initialize key variables
+        release = threading.Event()
+        good = Partition('/dev/sda1', '/good', 'ext4', 'rw')
+        hung = Partition('server:/', '/hung', 'fuse', 'rw')
+        tmpfs = Partition('tmpfs', '/tmp', 'tmpfs', 'rw')
+        calls = []
+
+        def _usage(mountpoint):
+            calls.append(mountpoint)
+            if mountpoint == '/hung':
+                release.wait(10)
+            return mountpoint
+
+        # The hung mount is skipped and quarantined
+        with mock.patch.object(mounts.psutil, 'disk_usage', _usage):
+            with mock.patch.object(mounts.log, 'log2warning'):
+                result = mounts.disk_usage(
+                    [good, hung, tmpfs], timeout=0.2, quarantine=0)
+            self.assertEqual(result, [(good, '/good')])
+            self.assertTrue(mounts.quarantined('/hung'))
+            self.assertNotIn('/tmp', calls)
+
+            # It stays quarantined while the request is blocked
+            calls.clear()
+            result = mounts.disk_usage([good, hung], timeout=0.2)
+            self.assertEqual(result, [(good, '/good')])
+            self.assertEqual(calls, ['/good'])
+
+            # It is used again when it recovers
+            release.set()
+            mounts._QUARANTINE['/hung'][1].wait(1)
+            self.assertFalse(mounts.quarantined('/hung'))
+            result = mounts.disk_usage([good, hung], timeout=1)
+            self.assertEqual(result, [(good, '/good'), (hung, '/hung')])
+
+    def test_disk_usage_blocked(self):
+        """Testing method / function disk_usage with all threads blocked."""
+        # Initialize key variables
+        release = threading.Event()
+        pool = mounts._Pool(1, 1)
+        hung = Partition('server:/', '/hung', 'fuse', 'rw')
+        good = Partition('/dev/sda1', '/good', 'ext4', 'rw')
+        calls = []
+
+        def _usage(mountpoint):
+            calls.append(mountpoint)
+            if mountpoint == '/hung':
+                release.wait(10)
+            return mountpoint
+
+        # The only thread is blocked. Other mounts are skipped without
+        # queueing their requests.
+        with mock.patch.object(mounts, '_pool', return_value=pool):
+            with mock.patch.object(mounts.psutil, 'disk_usage', _usage):
+                with mock.patch.object(mounts.log, 'log2warning') as warning:
+                    result = mounts.disk_usage([hung, good], timeout=0.2)
+                    self.assertEqual(result, [])
+                    self.assertEqual(pool.available(), 0)
+                    self.assertEqual(calls, ['/hung'])
+                    queued = pool._queue.qsize()
+                    result = mounts.disk_usage([hung, good], timeout=0.2)
+                self.assertEqual(result, [])
+                self.assertEqual(calls, ['/hung'])
+                self.assertEqual(pool._queue.qsize(), queued)
+                codes = [_[0][0] for _ in warning.call_args_list]
+                self.assertEqual(codes, [51572, 51597, 51597])
+                release.set()
+
+    def test_pool(self):
+        """Testing class _Pool."""
+        # Initialize key variables
+        release = threading.Event()
+        pool = mounts._Pool(1, 3)
+
+        # Blocked threads are replaced
+        blocked = pool.submit(release.wait, 10)
+        self.assertFalse(blocked.wait(0.1))
+        pool.block(blocked)
+        self.assertEqual(pool.available(), 1)
+        self.assertEqual(pool._threads, 2)
+        self.assertEqual(pool.submit(abs, -1).wait(1), True)
+
+        # Tasks that haven't started can be cancelled
+        queued = mounts._Task(abs, (-1,))
+        self.assertTrue(queued.cancel())
+        queued.run()
+        self.assertFalse(queued.done())
+        self.assertFalse(blocked.cancel())
+
+        # Replacements are retired when the blocked call returns
+        release.set()
+        self.assertTrue(blocked.wait(1))
+        for _ in range(100):
+            if pool._threads == 1:
+                break
+            blocked.wait(0.01)
+        self.assertEqual(pool._threads, 1)
+        self.assertEqual(pool.available(), 1)
+
+    def test_disk_usage_errors(self):
+        """Testing method / function disk_usage with failing partitions."""
+        partition = Partition('/dev/sda1', '/missing', 'ext4', 'rw')
+
+        def _usage(mountpoint):
+            raise PermissionError(mountpoint)
+
+        with mock.patch.object(mounts.psutil, 'disk_usage', _usage):
+            self.assertEqual(mounts.disk_usage([partition]), [])
+        self.assertFalse(mounts.quarantined('/missing'))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test the os precollector module."""
+
+import sys
+import unittest
+import os
+import time
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import precollector
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestPrecollector(unittest.TestCase):
+    """Checks all Precollector methods."""
+
+    def test_response(self):
+        """Testing method / function response."""
+        # Initialize key variables
+        calls = []
+
+        def _function(interval):
+            calls.append(interval)
+            return len(calls)
+
+        item = precollector.Precollector(_function)
+        try:
+            # The first request waits for the first response
+            (response, age) = item.response(0.05)
+            self.assertGreaterEqual(response, 1)
+            self.assertGreaterEqual(age, 0)
+
+            # Responses are refreshed in the background
+            time.sleep(0.12)
+            self.assertGreater(item.response(0.05)[0], response)
+            self.assertEqual(set(calls), set([0.05]))
+            self.assertEqual(len(item), 1)
+        finally:
+            item.stop()
+
+    def test_response_idle(self):
+        """Testing method / function response for idle intervals."""
+        item = precollector.Precollector(lambda _: 'value')
+        try:
+            item.response(0.01)
+            worker = item._workers[0.01]
+            self.assertTrue(worker.stopped.wait(1))
+
+            # The next request starts collecting again
+            self.assertEqual(item.response(0.01)[0], 'value')
+            self.assertIsNot(item._workers[0.01], worker)
+        finally:
+            item.stop()
+
+    def test_response_error(self):
+        """Testing method / function response with a failing function."""
+        def _function(interval):
+            raise ValueError(interval)
+
+        item = precollector.Precollector(_function)
+        try:
+            with mock.patch.object(
+                    precollector.log, 'log2warning') as log2warning:
+                self.assertIsNone(item.response(60))
+            self.assertEqual(log2warning.call_args[0][0], 51573)
+        finally:
+            item.stop()
+
+    def test_max_intervals(self):
+        """Testing the maximum number of intervals."""
+        item = precollector.Precollector(
+            lambda _: 'value', max_intervals=1)
+        try:
+            self.assertEqual(item.response(60)[0], 'value')
+            self.assertIsNone(item.response(30))
+            self.assertEqual(len(item), 1)
+        finally:
+            item.stop()
+        self.assertEqual(len(item), 0)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        result = precollector.get(str)
+        self.assertIs(precollector.get(str), result)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Test the os procfs module."""
+
+import sys
+import unittest
+import os
+import shutil
+import tempfile
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import procfs
+from tests.libraries.configuration import UnittestConfig
+
+# Contents of a fake /proc filesystem
+_FILES = {
+    'stat': '''\
+cpu  100 20 30 400 50 6 7 8 0 0
+cpu0 100 20 30 400 50 6 7 8 0 0
+intr 1234 0 0 0
+ctxt 5678
+btime 1600000000
+processes 999
+procs_running 2
+softirq 4321 0 0
+''',
+    'meminfo': '''\
+MemTotal:        1000 kB
+MemFree:          200 kB
+MemAvailable:     600 kB
+Buffers:           50 kB
+Cached:           100 kB
+Active:           300 kB
+Inactive:         150 kB
+Shmem:             10 kB
+Slab:              40 kB
+SReclaimable:      30 kB
+''',
+    'diskstats': '''\
+   8       0 sda 10 2 30 4 50 6 70 8 0 9 10 0 0 0 0
+   8       1 sda1 1 2 3 4
+''',
+    os.path.join('net', 'dev'): '''\
+Inter-|   Receive                            |  Transmit
+ face |bytes packets errs drop fifo frame compressed multicast|bytes \
+packets errs drop fifo colls carrier compressed
+    lo:     100       2    0    0    0     0          0         0      \
+100       2    0    0    0     0       0          0
+  eth0:    1000      10    1    2    0     0          0         0     \
+2000      20    3    4    0     0       0          0
+''',
+    os.path.join('1', 'status'): '',
+    os.path.join('22', 'status'): '',
+}
+
+
+def _proc():
+    """Create a fake /proc directory."""
+    directory = tempfile.mkdtemp()
+    for filename, text in _FILES.items():
+        filepath = os.path.join(directory, filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w') as f_handle:
+            f_handle.write(text)
+    os.makedirs(os.path.join(directory, 'self'))
+    return directory
+
+
+class TestProcFile(unittest.TestCase):
+    """Checks all ProcFile methods."""
+
+    def test_read(self):
+        """Testing method / function read."""
+        # Files larger than the buffer are read in full
+        directory = _proc()
+        filepath = os.path.join(directory, 'stat')
+        item = procfs.ProcFile(filepath, size=16)
+        self.assertEqual(item.read().decode(), _FILES['stat'])
+        self.assertEqual(item.read().decode(), _FILES['stat'])
+        shutil.rmtree(directory)
+
+
+class TestReader(unittest.TestCase):
+    """Checks all Reader methods."""
+
+    def setUp(self):
+        """Create a fake /proc directory."""
+        self.directory = _proc()
+        self.reader = procfs.Reader(proc=self.directory)
+
+    def tearDown(self):
+        """Delete the fake /proc directory."""
+        shutil.rmtree(self.directory)
+
+    def test_stat(self):
+        """Testing method / function stat."""
+        (cpu_times, cpu_stats) = self.reader.stat()
+        ticks = procfs._CLOCK_TICKS
+        self.assertEqual(cpu_times.user, 100 / ticks)
+        self.assertEqual(cpu_times.steal, 8 / ticks)
+        self.assertEqual(cpu_times.guest_nice, 0)
+        self.assertEqual(
+            cpu_stats,
+            procfs.CPUStats(
+                ctx_switches=5678, interrupts=1234, soft_interrupts=4321,
+                syscalls=0))
+
+    def test_virtual_memory(self):
+        """Testing method / function virtual_memory."""
+        result = self.reader.virtual_memory()
+        self.assertEqual(result.total, 1024000)
+        self.assertEqual(result.available, 614400)
+        self.assertEqual(result.used, 409600)
+        self.assertEqual(result.percent, 40.0)
+        self.assertEqual(result.cached, 133120)
+        self.assertEqual(result.shared, 10240)
+
+    def test_disk_io_counters(self):
+        """Testing method / function disk_io_counters."""
+        result = self.reader.disk_io_counters()
+        self.assertEqual(sorted(result), ['sda', 'sda1'])
+        self.assertEqual(result['sda'].read_count, 10)
+        self.assertEqual(result['sda'].read_bytes, 30 * 512)
+        self.assertEqual(result['sda'].write_count, 50)
+        self.assertEqual(result['sda'].busy_time, 9)
+        self.assertEqual(result['sda1'].write_bytes, 4 * 512)
+
+    def test_net_io_counters(self):
+        """Testing method / function net_io_counters."""
+        result = self.reader.net_io_counters()
+        self.assertEqual(sorted(result), ['eth0', 'lo'])
+        self.assertEqual(
+            result['eth0'],
+            procfs.NetIO(
+                bytes_sent=2000, bytes_recv=1000, packets_sent=20,
+                packets_recv=10, errin=1, errout=3, dropin=2, dropout=4))
+
+    def test_process_count(self):
+        """Testing method / function process_count."""
+        self.assertEqual(self.reader.process_count(), 2)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_available(self):
+        """Testing method / function available."""
+        directory = _proc()
+        self.assertTrue(procfs.available(proc=directory))
+        os.remove(os.path.join(directory, 'meminfo'))
+        self.assertFalse(procfs.available(proc=directory))
+        shutil.rmtree(directory)
+
+    def test_reader(self):
+        """Testing method / function reader."""
+        result = procfs.reader()
+        self.assertTrue(isinstance(result, procfs.Reader))
+        self.assertIs(procfs.reader(), result)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test the os push module."""
+
+import sys
+import unittest
+import os
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import encoding, push
+from tests.libraries.configuration import UnittestConfig
+
+
+class Session():
+    """Fake requests.Session."""
+
+    def __init__(self, status_code=202):
+        """Initialize the class."""
+        self.status_code = status_code
+        self.posted = []
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        """Post data."""
+        self.posted.append((url, data, headers))
+        return mock.Mock(status_code=self.status_code)
+
+    def close(self):
+        """Close the session."""
+        self.closed = True
+
+
+class TestPusher(unittest.TestCase):
+    """Checks all Pusher methods."""
+
+    def test_push(self):
+        """Testing method / function push."""
+        # Initialize key variables
+        session = Session()
+        intervals = []
+
+        def _function(interval):
+            intervals.append(interval)
+            return encoding.Payload({'a': 1}, b'{"a": 1}')
+
+        item = push.Pusher(
+            'http://hub/push', 30, _function, session=session)
+
+        # Compressed JSON is pushed
+        self.assertEqual(item.push(), True)
+        self.assertEqual(intervals, [30])
+        (url, data, headers) = session.posted[0]
+        self.assertEqual(url, 'http://hub/push')
+        self.assertEqual(encoding.decode(data, coding='gzip'), {'a': 1})
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Type'], encoding.JSON)
+
+        # Errors are logged
+        session.status_code = 503
+        with mock.patch.object(push.log, 'log2warning') as log2warning:
+            self.assertEqual(item.push(), False)
+            self.assertEqual(log2warning.call_args[0][0], 51588)
+        session.post = mock.Mock(side_effect=ConnectionError)
+        with mock.patch.object(push.log, 'log2warning') as log2warning:
+            self.assertEqual(item.push(), False)
+            self.assertEqual(log2warning.call_args[0][0], 51587)
+
+    def test_start(self):
+        """Testing method / function start."""
+        # Initialize key variables
+        session = Session()
+        item = push.Pusher(
+            'http://hub/push', 3600,
+            lambda _: encoding.Payload({}, b'{}'), session=session)
+
+        # Data is pushed when started, then every interval until stopped
+        item.start()
+        item.stop()
+        self.assertEqual(len(session.posted), 1)
+        self.assertEqual(session.closed, True)
+
+    def test_run(self):
+        """Testing method / function run."""
+        # Initialize key variables
+        session = Session()
+
+        def _function(_):
+            item.stopped.set()
+            return encoding.Payload({}, b'{}')
+
+        item = push.Pusher(
+            'http://hub/push', 3600, _function, session=session)
+
+        # Data is pushed in the current thread until stopped
+        item.run()
+        self.assertEqual(len(session.posted), 1)
+        self.assertEqual(session.closed, True)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
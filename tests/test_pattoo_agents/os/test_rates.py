@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test the os rates module."""
+
+import sys
+import unittest
+import os
+import collections
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import rates
+from tests.libraries.configuration import UnittestConfig
+
+# Named tuple of counters for testing
+Counters = collections.namedtuple('Counters', 'bytes packets')
+
+
+class TestRates(unittest.TestCase):
+    """Checks all Rates methods."""
+
+    def test_rates(self):
+        """Testing method / function rates."""
+        item = rates.Rates()
+
+        # No rates the first time counters are seen
+        self.assertEqual(item.rates('nic', 'eth0', Counters(100, 10), 0), {})
+
+        # Rates per second
+        self.assertEqual(
+            item.rates('nic', 'eth0', Counters(300, 30), 10),
+            {'bytes': 20, 'packets': 2})
+
+        # Other names and groups are independent
+        self.assertEqual(item.rates('nic', 'eth1', Counters(0, 0), 10), {})
+        self.assertEqual(item.rates('disk', 'eth0', Counters(0, 0), 10), {})
+        self.assertEqual(len(item), 3)
+
+        # Counters that were reset are skipped
+        self.assertEqual(
+            item.rates('nic', 'eth0', Counters(50, 40), 20),
+            {'packets': 1})
+        self.assertEqual(
+            item.rates('nic', 'eth0', Counters(150, 40), 30),
+            {'bytes': 10, 'packets': 0})
+
+        # No rates when no time has elapsed
+        self.assertEqual(
+            item.rates('nic', 'eth0', Counters(200, 50), 30), {})
+
+    def test_purge(self):
+        """Testing method / function purge."""
+        item = rates.Rates()
+        item.rates('nic', 'eth0', Counters(0, 0), 0)
+        item.rates('nic', 'eth1', Counters(0, 0), 0)
+        item.rates('disk', 'sda', Counters(0, 0), 0)
+        item.purge('nic', ['eth1'])
+        self.assertEqual(len(item), 2)
+        self.assertEqual(item.rates('nic', 'eth0', Counters(1, 1), 1), {})
+        self.assertEqual(
+            item.rates('nic', 'eth1', Counters(1, 1), 1),
+            {'bytes': 1, 'packets': 1})
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_get(self):
+        """Testing method / function get."""
+        result = rates.get()
+        self.assertTrue(isinstance(result, rates.Rates))
+        self.assertIs(rates.get(), result)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Test the os sampler module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_shared.constants import DATA_FLOAT
+from pattoo_agents.metadata import intern
+from pattoo_agents.os import sampler
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Clock():
+    """Fake monotonic clock."""
+
+    def __init__(self):
+        """Initialize the class."""
+        self.now = 1000.0
+
+    def __call__(self):
+        """Get the time."""
+        return self.now
+
+
+class TestSampler(unittest.TestCase):
+    """Checks all Sampler methods."""
+
+    def test_sample(self):
+        """Testing method / function sample."""
+        # The first sample only has values that don't need a previous one
+        clock = _Clock()
+        item = sampler.Sampler(1, 10, clock=clock)
+        item.sample()
+        self.assertEqual(
+            [key for key, _ in item._buffers], ['memory_percent'])
+
+        # The second has all of them
+        clock.now += 1
+        item.sample()
+        keys = set(key for key, _ in item._buffers)
+        for key in ['cpu_times_percent_user', 'cpu_times_percent_system',
+                    'network_io_bytes_recv_per_second']:
+            self.assertIn(key, keys)
+
+        # Old values are forgotten
+        clock.now += 100
+        item._previous = None
+        item.sample()
+        self.assertEqual(
+            [key for key, _ in item._buffers], ['memory_percent'])
+
+    def test_datapoints(self):
+        """Testing method / function datapoints."""
+        # Sample
+        clock = _Clock()
+        metadata = intern([('hostname', 'test')])
+        item = sampler.Sampler(1, 10, metadata=metadata, clock=clock)
+        for _ in range(3):
+            item.sample()
+            clock.now += 1
+
+        # Check
+        result = item.datapoints(10)
+        keys = [_.key for _ in result]
+        for name in sampler.AGGREGATES:
+            self.assertIn('memory_percent_{}'.format(name), keys)
+        for datapoint in result:
+            self.assertEqual(datapoint.data_type, DATA_FLOAT)
+            self.assertEqual(datapoint.metadata['hostname'], 'test')
+            if datapoint.key.startswith('network_io') is True:
+                self.assertIn('network_io_interface', datapoint.metadata)
+
+        # Nothing was sampled in the window
+        clock.now += 100
+        self.assertEqual(item.datapoints(10), [])
+
+    def test_start(self):
+        """Testing method / function start."""
+        item = sampler.Sampler(0.1, 10)
+        item.start()
+        item.stop()
+        self.assertGreaterEqual(len(item._buffers), 1)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_aggregate(self):
+        """Testing method / function aggregate."""
+        self.assertEqual(sampler.aggregate([5]), (5, 5, 5, 5))
+        result = sampler.aggregate(list(range(1, 101)))
+        self.assertEqual(result, (1, 100, 50.5, 95))
+        result = sampler.aggregate([3, 1, 2, 10])
+        self.assertEqual(result, (1, 10, 4, 10))
+
+    def test_get(self):
+        """Testing method / function get."""
+        result = sampler.get(60, 10)
+        self.assertIs(sampler.get(60, 10), result)
+        other = sampler.get(30, 10)
+        self.assertIsNot(other, result)
+        self.assertTrue(result._stop.is_set())
+        other.stop()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Test the os workloads module."""
+
+import sys
+import unittest
+import os
+import tempfile
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = (
+    '{0}pattoo-agents{0}tests{0}test_pattoo_agents{0}os'.format(os.sep))
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.os import workloads
+from tests.libraries.configuration import UnittestConfig
+
+
+def _write(root, path, text):
+    """Create a file in a fake cgroup filesystem."""
+    filepath = os.path.join(root, path)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w') as f_handle:
+        f_handle.write(text)
+
+
+def _usage(cpu_percent, memory, io_bytes_per_second):
+    """Create a Usage object."""
+    result = workloads.Usage()
+    result.cpu_percent = cpu_percent
+    result.memory = memory
+    result.io_bytes_per_second = io_bytes_per_second
+    result.instances = 1
+    return result
+
+
+class TestTracker(unittest.TestCase):
+    """Checks all Tracker methods."""
+
+    def test_processes(self):
+        """Testing method / function processes."""
+        # The first cycle has no rates
+        tracker = workloads.Tracker(5)
+        result = tracker.processes(None)
+        self.assertIn(workloads.psutil.Process().name(), result)
+        self.assertEqual(
+            sum(_.cpu_percent for _ in result.values()), 0)
+        self.assertIn(os.getpid(), tracker._processes)
+
+        # Process objects are reused
+        process = tracker._processes[os.getpid()][0]
+        sum(range(1000000))
+        result = tracker.processes(1)
+        self.assertIs(tracker._processes[os.getpid()][0], process)
+        self.assertGreaterEqual(
+            result[process.name()].instances, 1)
+        self.assertGreater(result[process.name()].memory, 0)
+
+    def test_datapoints(self):
+        """Testing method / function datapoints."""
+        # Initialize key variables
+        processes = {
+            'busy': _usage(90, 1, 1),
+            'large': _usage(1, 900, 1),
+            'disk': _usage(1, 1, 900),
+            'idle': _usage(0, 0, 0)}
+        tracker = workloads.Tracker(1)
+
+        # The top name of each resource is reported with 4 DataPoints each
+        with mock.patch.object(tracker, 'processes', return_value=processes):
+            result = tracker.datapoints()
+        self.assertEqual(len(result), 12)
+        names = set(
+            _.metadata['process_name'] for _ in result)
+        self.assertEqual(names, set(['busy', 'large', 'disk']))
+        self.assertEqual(
+            set(_.key for _ in result), set([
+                'process_cpu_percent', 'process_memory',
+                'process_io_bytes_per_second', 'process_instances']))
+
+        # Only whole names are reported within the limit
+        tracker = workloads.Tracker(4, limit=10)
+        with mock.patch.object(tracker, 'processes', return_value=processes):
+            result = tracker.datapoints()
+        self.assertEqual(len(result), 8)
+        self.assertEqual(
+            [_.metadata['process_name'] for _ in result[::4]],
+            ['busy', 'large'])
+
+    def test_cgroup_usage(self):
+        """Testing method / function cgroup_usage."""
+        with tempfile.TemporaryDirectory() as root:
+            _write(root, 'cgroup.controllers', 'cpu io memory')
+            _write(root, 'app/cpu.stat', 'usage_usec 1000000\n')
+            _write(root, 'app/memory.current', '4096\n')
+            tracker = workloads.Tracker(1, cgroups=True, cgroup=root)
+            result = tracker.cgroup_usage(None)
+            self.assertEqual(result['app'].memory, 4096)
+            self.assertEqual(result['app'].cpu_percent, 0)
+
+            # Rates are calculated from the previous cycle
+            _write(root, 'app/cpu.stat', 'usage_usec 1500000\n')
+            result = tracker.cgroup_usage(2)
+            self.assertEqual(result['app'].cpu_percent, 25)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_read_cgroups_v2(self):
+        """Testing method / function read_cgroups with cgroup v2."""
+        with tempfile.TemporaryDirectory() as root:
+            _write(root, 'cgroup.controllers', 'cpu io memory')
+            _write(root, 'system.slice/cpu.stat', '''\
+usage_usec 2000000
+user_usec 1500000
+''')
+            _write(root, 'system.slice/memory.current', '1024\n')
+            _write(root, 'system.slice/io.stat', '''\
+8:0 rbytes=100 wbytes=200 rios=1 wios=2 dbytes=0 dios=0
+8:16 rbytes=10 wbytes=20 rios=1 wios=2 dbytes=0 dios=0
+''')
+            _write(root, 'system.slice/a.service/cpu.stat', 'usage_usec 1\n')
+
+            # Deeper cgroups are ignored
+            _write(root, 'system.slice/a.service/b/cpu.stat', 'usage_usec 1\n')
+
+            result = workloads.read_cgroups(root)
+            self.assertEqual(
+                result['system.slice'], (2, 1024, 330))
+            self.assertEqual(
+                result[os.path.join('system.slice', 'a.service')],
+                (0.000001, 0, 0))
+            self.assertEqual(len(result), 2)
+
+    def test_read_cgroups_v1(self):
+        """Testing method / function read_cgroups with cgroup v1."""
+        with tempfile.TemporaryDirectory() as root:
+            _write(root, 'cpuacct/docker/cpuacct.usage', '3000000000\n')
+            _write(root, 'memory/docker/memory.usage_in_bytes', '2048\n')
+            _write(root, 'blkio/docker/blkio.throttle.io_service_bytes', '''\
+8:0 Read 100
+8:0 Write 200
+8:0 Total 300
+Total 300
+''')
+            result = workloads.read_cgroups(root)
+            self.assertEqual(result, {'docker': (3, 2048, 300)})
+
+    def test_get(self):
+        """Testing method / function get."""
+        tracker = workloads.get(3, cgroups=True, limit=50)
+        self.assertIs(workloads.get(3, cgroups=True, limit=50), tracker)
+        self.assertIsNot(workloads.get(4), tracker)
+        self.assertEqual(tracker.top, 3)
+        self.assertTrue(tracker.cgroups)
+        self.assertEqual(tracker.limit, 50)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
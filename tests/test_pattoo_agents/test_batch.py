@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test the batch module."""
+
+import pickle
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.batch import DataPointBatch, target_datapoints
+from pattoo_shared.constants import DATA_INT, DATA_FLOAT, DATA_STRING
+from pattoo_shared.variables import (
+    DataPoint, DataPointMetadata, TargetDataPoints)
+from tests.libraries.configuration import UnittestConfig
+
+
+def _batch():
+    """Create a DataPointBatch for testing."""
+    result = DataPointBatch('localhost', timestamp=1000)
+    metadata = (('unit', '001'), ('alias', 'abc', False))
+    result.append('one', 1, data_type=DATA_INT, metadata=metadata)
+    result.append('two', 2.5, data_type=DATA_FLOAT, metadata=metadata)
+    result.append('three', 'x', data_type=DATA_STRING)
+    return result
+
+
+class TestDataPointBatch(unittest.TestCase):
+    """Checks all DataPointBatch methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        result = DataPointBatch('localhost', timestamp=1000)
+        self.assertEqual(result.target, 'localhost')
+        self.assertEqual(result.timestamp, 1000)
+        self.assertEqual(len(result), 0)
+        self.assertFalse(hasattr(result, '__dict__'))
+
+    def test_append(self):
+        """Testing method / function append."""
+        # Metadata is only stored once
+        result = _batch()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(list(result.metadata_ids), [0, 0, 1])
+        self.assertEqual(len(result._metadata), 2)
+
+        # Unsupported data types are ignored
+        result.append('four', 4, data_type=12345)
+        self.assertEqual(len(result), 3)
+
+    def test_pickle(self):
+        """Testing pickling."""
+        batch = _batch()
+        result = pickle.loads(pickle.dumps(batch))
+        self.assertEqual(result.keys, batch.keys)
+        self.assertEqual(result.values, batch.values)
+        self.assertEqual(result.data_types, batch.data_types)
+        self.assertEqual(result.metadata_ids, batch.metadata_ids)
+
+    def test_datapoints(self):
+        """Testing method / function datapoints."""
+        # Create the expected DataPoint
+        expected = DataPoint('one', 1, data_type=DATA_INT, timestamp=1000)
+        expected.add(DataPointMetadata('unit', '001'))
+        expected.add(
+            DataPointMetadata('alias', 'abc', update_checksum=False))
+
+        # Test
+        result = _batch().datapoints()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0].key, expected.key)
+        self.assertEqual(result[0].value, expected.value)
+        self.assertEqual(result[0].data_type, expected.data_type)
+        self.assertEqual(result[0].timestamp, expected.timestamp)
+        self.assertEqual(result[0].metadata, expected.metadata)
+        self.assertEqual(result[0].checksum, expected.checksum)
+        self.assertEqual(result[1].data_type, DATA_FLOAT)
+        self.assertEqual(result[2].metadata, {})
+
+    def test_target_datapoints(self):
+        """Testing method / function target_datapoints."""
+        result = _batch().target_datapoints()
+        self.assertTrue(isinstance(result, TargetDataPoints))
+        self.assertEqual(result.target, 'localhost')
+        self.assertEqual(len(result.data), 3)
+        self.assertTrue(result.valid)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_target_datapoints(self):
+        """Testing method / function target_datapoints."""
+        ddv = TargetDataPoints('remotehost')
+        result = target_datapoints([_batch(), ddv, None])
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0].target, 'localhost')
+        self.assertIs(result[1], ddv)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test the configuration module."""
+
+import sys
+import unittest
+import os
+import tempfile
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents import configuration
+from pattoo_agents.os.configuration import ConfigHubd
+from tests.libraries.configuration import UnittestConfig
+
+
+def _write(filepath, text):
+    """Write text to a file and make sure its signature changes."""
+    time.sleep(0.01)
+    with open(filepath, 'w') as f_handle:
+        f_handle.write(text)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_read_yaml_file(self):
+        """Testing method / function read_yaml_file."""
+        # Create file
+        directory = tempfile.mkdtemp()
+        filepath = '{}{}test.yaml'.format(directory, os.sep)
+        _write(filepath, 'key: 1\n')
+
+        # The same object is returned when the file hasn't changed
+        result = configuration.read_yaml_file(filepath)
+        self.assertEqual(result, {'key': 1})
+        self.assertIs(configuration.read_yaml_file(filepath), result)
+
+        # The file is read again when it changes
+        _write(filepath, 'key: 2\n')
+        result = configuration.read_yaml_file(filepath)
+        self.assertEqual(result, {'key': 2})
+
+        # Cleanup
+        os.remove(filepath)
+        os.rmdir(directory)
+
+    def test_signature(self):
+        """Testing method / function signature."""
+        # Non existent files
+        self.assertIsNone(configuration.signature('/does/not/exist.yaml'))
+
+        # Signatures change with the file
+        (_, filepath) = tempfile.mkstemp()
+        _write(filepath, 'a')
+        before = configuration.signature(filepath)
+        self.assertEqual(before, configuration.signature(filepath))
+        _write(filepath, 'ab')
+        self.assertNotEqual(before, configuration.signature(filepath))
+        os.remove(filepath)
+
+    def test_get_config(self):
+        """Testing method / function get_config."""
+        # The same object is returned when the files haven't changed
+        result = configuration.get_config(ConfigHubd)
+        self.assertTrue(isinstance(result, ConfigHubd))
+        self.assertIs(configuration.get_config(ConfigHubd), result)
+        self.assertEqual(result.polling_interval(), 98)
+
+        # A new object is created when a file changes
+        filepath = result.filenames()[0]
+        with open(filepath, 'r') as f_handle:
+            text = f_handle.read()
+        _write(filepath, text)
+        self.assertIsNot(configuration.get_config(ConfigHubd), result)
+
+
+class TestAgentConfig(unittest.TestCase):
+    """Checks all AgentConfig methods."""
+
+    def test_filenames(self):
+        """Testing method / function filenames."""
+        result = ConfigHubd().filenames()
+        self.assertEqual(len(result), 2)
+        self.assertTrue(result[0].endswith('pattoo_agent_os_hubd.yaml'))
+        self.assertTrue(result[1].endswith('pattoo.yaml'))
+
+    def test_overrun_policy(self):
+        """Testing method / function overrun_policy."""
+        # Defaults to skipping missed cycles
+        config = ConfigHubd()
+        self.assertEqual(config.overrun_policy(), 'skip')
+
+        # Valid policies are used regardless of case
+        config._agent_config['pattoo_agent_os_hubd']['overrun_policy'] = (
+            ' CatchUp')
+        self.assertEqual(config.overrun_policy(), 'catchup')
+        config._agent_config['pattoo_agent_os_hubd']['overrun_policy'] = (
+            'bogus')
+        self.assertEqual(config.overrun_policy(), 'skip')
+
+    def test__cached(self):
+        """Testing method / function _cached."""
+        config = ConfigHubd()
+        result = config._cached('test', lambda: [1])
+        self.assertEqual(result, [1])
+        self.assertIs(config._cached('test', lambda: [2]), result)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
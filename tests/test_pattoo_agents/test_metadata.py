@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Test the metadata module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_shared.variables import DataPoint, DataPointMetadata
+from pattoo_agents import metadata
+from tests.libraries.configuration import UnittestConfig
+
+
+def _metadata():
+    """Create a list of DataPointMetadata objects for testing."""
+    result = [
+        DataPointMetadata('hostname', 'localhost'),
+        DataPointMetadata('release', '5.0', update_checksum=False),
+        DataPointMetadata('cpus', 8)]
+    return result
+
+
+class TestMetadataSet(unittest.TestCase):
+    """Checks all MetadataSet methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Invalid, reserved and duplicate keys are dropped
+        result = metadata.MetadataSet([
+            ('hostname', 'localhost'),
+            ('hostname', 'duplicate'),
+            ('pattoo_key', 'reserved'),
+            ('key', None),
+            'junk'])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result.metadata[0].key, 'hostname')
+        self.assertEqual(result.metadata[0].value, 'localhost')
+
+    def test_add_to(self):
+        """Testing method / function add_to."""
+        # Results must match DataPoint.add()
+        items = _metadata()
+        expected = DataPoint('key', 1, timestamp=1)
+        expected.add(items)
+        metaset = metadata.MetadataSet(items)
+        for _ in range(2):
+            result = DataPoint('key', 1, timestamp=1)
+            self.assertIs(metaset.add_to(result), result)
+            self.assertEqual(result.checksum, expected.checksum)
+            self.assertEqual(result.metadata, expected.metadata)
+            self.assertEqual(
+                result.__dict__['_metakeys'], expected.__dict__['_metakeys'])
+
+        # Sets can be chained
+        expected = DataPoint('key', 1, timestamp=1)
+        expected.add(items)
+        expected.add(DataPointMetadata('interface', 'eth0'))
+        result = DataPoint('key', 1, timestamp=1)
+        metaset.add_to(result)
+        metadata.MetadataSet([('interface', 'eth0')]).add_to(result)
+        self.assertEqual(result.checksum, expected.checksum)
+        self.assertEqual(result.metadata, expected.metadata)
+
+        # Existing keys are handled by DataPoint.add()
+        expected = DataPoint('key', 1, timestamp=1)
+        expected.add(items)
+        expected.add(items)
+        result = DataPoint('key', 1, timestamp=1)
+        metaset.add_to(result)
+        metaset.add_to(result)
+        self.assertEqual(result.checksum, expected.checksum)
+        self.assertEqual(result.metadata, expected.metadata)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_intern(self):
+        """Testing method / function intern."""
+        # Equivalent metadata share the same set
+        result = metadata.intern(_metadata())
+        self.assertTrue(isinstance(result, metadata.MetadataSet))
+        self.assertIs(metadata.intern(_metadata()), result)
+        self.assertIs(
+            metadata.intern([
+                ('hostname', 'localhost'),
+                ('release', '5.0', False),
+                ('cpus', 8, True)]), result)
+
+        # Different metadata don't
+        self.assertIsNot(
+            metadata.intern([('hostname', 'localhost')]), result)
+
+    def test__normalize(self):
+        """Testing method / function _normalize."""
+        self.assertEqual(
+            metadata._normalize(DataPointMetadata('a', 1)), ('a', '1', True))
+        self.assertEqual(metadata._normalize(('a', 1)), ('a', '1', True))
+        self.assertEqual(
+            metadata._normalize(('a', 1, False)), ('a', '1', False))
+        self.assertEqual(metadata._normalize(None), (None, None, None))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
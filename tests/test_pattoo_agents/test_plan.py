@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test the plan module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents import plan
+from pattoo_shared.variables import PollingPoint
+from tests.libraries.configuration import UnittestConfig
+
+
+def _plan(**kwargs):
+    """Create a PollingPlan from lists of addresses keyed by target."""
+    items = [
+        plan.plan_item(target, 'public', [
+            PollingPoint(address=address) for address in addresses])
+        for target, addresses in kwargs.items()]
+    result = plan.PollingPlan(items)
+    return result
+
+
+class TestPollingPlan(unittest.TestCase):
+    """Checks all PollingPlan methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Items are sorted by target and invalid items are ignored
+        polling_plan = plan.PollingPlan([
+            plan.plan_item('b', None, [1]), None,
+            plan.plan_item('a', None, [2])])
+        self.assertEqual(polling_plan.targets(), ('a', 'b'))
+        self.assertEqual(len(polling_plan), 2)
+        self.assertEqual(
+            [item.points for item in polling_plan], [(2,), (1,)])
+
+        # Plans with the same contents have the same checksums
+        self.assertEqual(
+            _plan(a=['.1'], b=['.2']).checksum,
+            _plan(b=['.2'], a=['.1']).checksum)
+        self.assertNotEqual(
+            _plan(a=['.1']).checksum, _plan(a=['.2']).checksum)
+
+    def test_diff(self):
+        """Testing method / function diff."""
+        # Initialize key variables
+        old = _plan(a=['.1'], b=['.2'], c=['.3'])
+        new = _plan(a=['.1'], b=['.2', '.4'], d=['.5'])
+
+        # Test
+        result = new.diff(old)
+        self.assertEqual(result.added, ('d',))
+        self.assertEqual(result.removed, ('c',))
+        self.assertEqual(result.changed, ('b',))
+
+        # Everything is new when there is no older plan
+        result = new.diff(None)
+        self.assertEqual(result.added, ('a', 'b', 'd'))
+        self.assertEqual(result.removed, tuple())
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test_plan_item(self):
+        """Testing method / function plan_item."""
+        # Initialize key variables
+        points = [PollingPoint(address='.1', multiplier=8)]
+
+        # Test
+        result = plan.plan_item('a', 'public', points)
+        self.assertEqual(result.target, 'a')
+        self.assertEqual(result.credentials, 'public')
+        self.assertTrue(isinstance(result.points, tuple))
+        self.assertEqual(
+            result.checksum, plan.plan_item('a', 'public', points).checksum)
+        self.assertNotEqual(
+            result.checksum, plan.plan_item('a', 'private', points).checksum)
+        self.assertNotEqual(
+            result.checksum,
+            plan.plan_item(
+                'a', 'public',
+                [PollingPoint(address='.1', multiplier=1)]).checksum)
+
+    def test_track(self):
+        """Testing method / function track."""
+        # First use
+        polling_plan = _plan(a=['.1'])
+        result = plan.track('unittest_agent', polling_plan)
+        self.assertEqual(result.added, ('a',))
+
+        # Same plan
+        result = plan.track('unittest_agent', polling_plan)
+        self.assertEqual(result, plan.PlanDiff(tuple(), tuple(), tuple()))
+
+        # New plan
+        result = plan.track('unittest_agent', _plan(b=['.1']))
+        self.assertEqual(result.added, ('b',))
+        self.assertEqual(result.removed, ('a',))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test the ringbuffer module."""
+
+import sys
+import unittest
+import os
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.ringbuffer import RingBuffer
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Checks all RingBuffer methods."""
+
+    def test_append(self):
+        """Testing method / function append."""
+        ring = RingBuffer(3)
+        self.assertEqual(len(ring), 0)
+        self.assertIsNone(ring.latest())
+        for value in range(5):
+            ring.append(value, value * 10)
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.latest(), 40)
+
+    def test_values(self):
+        """Testing method / function values."""
+        ring = RingBuffer(3)
+        for value in range(5):
+            ring.append(value, value * 10)
+        self.assertEqual(ring.values(), [2, 3, 4])
+        self.assertEqual(ring.values(since=30), [3, 4])
+        self.assertEqual(ring.values(since=50), [])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
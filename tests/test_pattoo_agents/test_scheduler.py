@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Test the scheduler module."""
+
+import sys
+import unittest
+import os
+from unittest import mock
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo-agents{0}tests{0}test_pattoo_agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case PattooShared has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_agents.scheduler import (
+    Scheduler, OVERRUN_SKIP, OVERRUN_CATCHUP, OVERRUN_STRETCH)
+from pattoo_agents import scheduler as scheduler_module
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Clock():
+    """Fake monotonic clock that advances when slept on."""
+
+    def __init__(self, now=0):
+        """Initialize the class."""
+        self.now = now
+        self.sleeps = []
+
+    def clock(self):
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, duration):
+        """Advance the current time."""
+        self.sleeps.append(duration)
+        self.now += duration
+
+
+def _scheduler(clock, policy=OVERRUN_SKIP, wallclock=1000):
+    """Create a Scheduler with a 10 second interval driven by clock."""
+    result = Scheduler(
+        10, policy=policy, clock=clock.clock,
+        wallclock=lambda: wallclock, sleep=clock.sleep)
+    return result
+
+
+class TestScheduler(unittest.TestCase):
+    """Checks all Scheduler methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Invalid policies use the default
+        clock = _Clock()
+        scheduler = _scheduler(clock, policy='bogus')
+        self.assertEqual(scheduler.policy, OVERRUN_SKIP)
+        self.assertEqual(scheduler.missed, 0)
+
+    def test_wait(self):
+        """Testing method / function wait."""
+        # Ticks are aligned to the wall clock
+        clock = _Clock()
+        scheduler = _scheduler(clock, wallclock=1003)
+        self.assertEqual(scheduler.wait(), 0)
+        self.assertEqual(clock.now, 7)
+
+        # The duration of a cycle doesn't cause drift
+        for _ in range(5):
+            clock.now += 3.5
+            self.assertEqual(scheduler.wait(), 0)
+        self.assertEqual(clock.now, 57)
+        self.assertEqual(scheduler.cycles, 6)
+
+    def test_wait_partial(self):
+        """Testing method / function wait with a short first cycle."""
+        # Starting just before a tick isn't an overrun
+        clock = _Clock()
+        scheduler = Scheduler(
+            300, clock=clock.clock, wallclock=lambda: 299.5,
+            sleep=clock.sleep)
+        clock.now = 5
+        with mock.patch.object(scheduler_module.log, 'log2warning') as log:
+            self.assertEqual(scheduler.wait(), 0)
+            self.assertEqual(log.call_count, 0)
+        self.assertEqual(clock.now, 300.5)
+        self.assertEqual(scheduler.stats()['missed'], 0)
+
+        # Later cycles are charged
+        clock.now += 700
+        with mock.patch.object(scheduler_module.log, 'log2warning'):
+            self.assertEqual(scheduler.wait(), 2)
+        self.assertEqual(scheduler.missed, 2)
+
+    def test_wait_skip(self):
+        """Testing method / function wait with OVERRUN_SKIP."""
+        # Missed ticks are dropped
+        clock = _Clock()
+        scheduler = _scheduler(clock, policy=OVERRUN_SKIP)
+        clock.now = 25
+        self.assertEqual(scheduler.wait(), 2)
+        self.assertEqual(clock.now, 30)
+        self.assertEqual(scheduler.missed, 2)
+
+        # Back on the grid afterwards
+        clock.now += 1
+        self.assertEqual(scheduler.wait(), 0)
+        self.assertEqual(clock.now, 40)
+
+    def test_wait_catchup(self):
+        """Testing method / function wait with OVERRUN_CATCHUP."""
+        # Missed ticks are run back to back
+        clock = _Clock()
+        scheduler = _scheduler(clock, policy=OVERRUN_CATCHUP)
+        clock.now = 25
+        self.assertEqual(scheduler.wait(), 1)
+        self.assertEqual(clock.now, 25)
+        self.assertEqual(scheduler.wait(), 1)
+        self.assertEqual(clock.now, 25)
+        self.assertEqual(scheduler.wait(), 0)
+        self.assertEqual(clock.now, 30)
+        self.assertEqual(scheduler.missed, 2)
+
+    def test_wait_stretch(self):
+        """Testing method / function wait with OVERRUN_STRETCH."""
+        # The grid restarts after an overrun
+        clock = _Clock()
+        scheduler = _scheduler(clock, policy=OVERRUN_STRETCH)
+        clock.now = 25
+        self.assertEqual(scheduler.wait(), 1)
+        self.assertEqual(clock.now, 25)
+        clock.now += 1
+        self.assertEqual(scheduler.wait(), 0)
+        self.assertEqual(clock.now, 35)
+
+    def test_stats(self):
+        """Testing method / function stats."""
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        clock.now = 15
+        scheduler.wait()
+        result = scheduler.stats()
+        self.assertEqual(result['cycles'], 1)
+        self.assertEqual(result['missed'], 1)
+        self.assertEqual(result['interval'], 10)
+        self.assertEqual(result['policy'], OVERRUN_SKIP)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()